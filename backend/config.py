@@ -1,5 +1,7 @@
 """Configuration settings for WordOps Dashboard API."""
 
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 
@@ -20,6 +22,20 @@ class Settings(BaseSettings):
     # Netdata integration
     NETDATA_URL: str = "http://127.0.0.1:19999"
 
+    # Service status backend: "auto" uses D-Bus when dbus-next is installed
+    # and the system bus is reachable, "subprocess" always uses systemctl
+    SERVICE_STATUS_BACKEND: str = "auto"
+
+    # Log streaming: lines buffered per WebSocket client, and what happens
+    # when a slow client fills its buffer: "drop-oldest" discards the oldest
+    # buffered lines, "disconnect" closes the connection
+    LOG_STREAM_QUEUE_LINES: int = 5000
+    LOG_STREAM_OVERFLOW_POLICY: Literal["drop-oldest", "disconnect"] = "drop-oldest"
+    # Lines are batched into frames of at most this many bytes, sent at
+    # most this many seconds after the first line of the frame arrived
+    LOG_STREAM_FRAME_BYTES: int = 64 * 1024
+    LOG_STREAM_FRAME_INTERVAL: float = 0.2
+
     # Single admin user for v1 (no database)
     ADMIN_USERNAME: str = "admin"
     # Default hash is for password "changeme" - MUST be changed in production
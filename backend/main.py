@@ -1,5 +1,7 @@
 """WordOps Dashboard API - Main FastAPI application."""
 
+from contextlib import asynccontextmanager
+
 from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -10,13 +12,53 @@ from backend.auth.dependencies import get_current_user
 from backend.auth.models import User
 from backend.auth.routes import router as auth_router
 from backend.config import settings
+from backend.server.backups import backup_catalogue
+from backend.server.cgroups import cgroup_stats
+from backend.server.errorrates import error_rates
+from backend.server.mysql import mysql_stats
+from backend.server.phpfpm import close_connection_pools
+from backend.server.phpslowlog import php_slowlog
+from backend.server.redis import redis_connection
+from backend.server.redis_footprint import redis_footprint
 from backend.server.routes import router as server_router
+from backend.server.services import ALLOWED_SERVICES, systemd_dbus
+from backend.server.slowlog import slow_queries
+from backend.server.traffic import site_traffic
 from backend.wordops.routes import router as sites_router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop background tasks with the application."""
+    backup_catalogue.start()
+    if settings.SERVICE_STATUS_BACKEND != "subprocess":
+        systemd_dbus.start()
+    await mysql_stats.start()
+    redis_footprint.start()
+    cgroup_stats.start(ALLOWED_SERVICES)
+    site_traffic.start()
+    await slow_queries.start()
+    php_slowlog.start()
+    error_rates.start()
+    yield
+    await error_rates.stop()
+    await php_slowlog.stop()
+    await slow_queries.stop()
+    await site_traffic.stop()
+    await cgroup_stats.stop()
+    await redis_footprint.stop()
+    await mysql_stats.close()
+    await systemd_dbus.stop()
+    await backup_catalogue.stop()
+    close_connection_pools()
+    redis_connection.close()
+
+
 app = FastAPI(
     title="WordOps Dashboard API",
     version="0.1.0",
     description="API for managing WordOps servers through a web interface",
+    lifespan=lifespan,
 )
 
 # Configure CORS middleware
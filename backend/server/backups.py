@@ -0,0 +1,310 @@
+"""Backup catalogue with incremental indexing of backup artifacts.
+
+The catalogue keeps an in-memory index of every backup file (path, size,
+mtime, owning site). Rescans only re-list directories whose mtime changed,
+so lookups are served from the index without touching the filesystem.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import time
+from datetime import datetime
+
+from backend.server.models import BackupArtifact, BackupCatalogueSummary, BackupSiteSummary
+from backend.wordops.sites import list_site_directories
+
+logger = logging.getLogger(__name__)
+
+# Global backup directories checked for WordOps backups
+BACKUP_DIRS = [
+    "/var/backups/wordops",
+    os.path.expanduser("~/backups"),
+    "/opt/wordops/backups",
+]
+
+# WordOps site roots; `wo site backup` writes to /var/www/{domain}/backup
+SITES_ROOT = "/var/www"
+SITE_BACKUP_SUBDIR = "backup"
+
+# Seconds between background rescans
+BACKUP_SCAN_INTERVAL = 60
+
+# Files modified within this many seconds are re-stat'ed on every scan,
+# since writes to an existing file do not change its directory's mtime
+SETTLE_SECONDS = 300
+
+
+class BackupCatalogue:
+    """Incrementally maintained index of backup artifacts."""
+
+    def __init__(self) -> None:
+        self.artifacts: dict[str, BackupArtifact] = {}
+        self.sites: set[str] = set()
+        self.last_scan: float | None = None
+        self._index = _BackupIndex()
+        self._task: asyncio.Task | None = None
+        self._scan_lock = asyncio.Lock()
+
+    async def refresh(self) -> None:
+        """Rescan changed directories and update the index."""
+        async with self._scan_lock:
+            # The worker thread builds a new index; it is only published here,
+            # on the event loop, so readers never see one half-updated
+            index = await asyncio.to_thread(self._index.rescanned)
+            self._index = index
+            self.artifacts = index.artifacts
+            self.sites = index.sites
+            self.last_scan = time.time()
+
+    async def ensure_indexed(self) -> None:
+        """Build the index on first use if no scan has completed yet."""
+        if self.last_scan is None:
+            await self.refresh()
+
+    def start(self) -> None:
+        """Start the background rescan loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background rescan loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        """Rescan periodically until cancelled."""
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Backup catalogue scan failed: {e}")
+            await asyncio.sleep(BACKUP_SCAN_INTERVAL)
+
+    # -------------------------------------------------------------------------
+    # Lookups
+    # -------------------------------------------------------------------------
+
+    def last_backup(self, site: str | None = None) -> float | None:
+        """Return the newest backup mtime, optionally for a single site."""
+        mtimes = [
+            a.mtime for a in self.artifacts.values()
+            if site is None or a.site == site
+        ]
+        return max(mtimes) if mtimes else None
+
+    def total_size(self, site: str | None = None) -> int:
+        """Return the total size of backups, optionally for a single site."""
+        return sum(
+            a.size for a in self.artifacts.values()
+            if site is None or a.site == site
+        )
+
+    def site_summaries(self) -> list[BackupSiteSummary]:
+        """Summarise backups per known site, including sites without backups."""
+        summaries: dict[str, BackupSiteSummary] = {
+            site: BackupSiteSummary(site=site) for site in self.sites
+        }
+        for artifact in self.artifacts.values():
+            if artifact.site is None:
+                continue
+            summary = summaries.setdefault(
+                artifact.site, BackupSiteSummary(site=artifact.site)
+            )
+            summary.backup_count += 1
+            summary.total_size += artifact.size
+            if summary.last_backup is None or artifact.mtime > summary.last_backup:
+                summary.last_backup = artifact.mtime
+        return sorted(summaries.values(), key=lambda s: s.site)
+
+    def stale_sites(self, days: int) -> list[str]:
+        """Return sites with no backup newer than the given number of days."""
+        cutoff = time.time() - days * 86400
+        return [
+            s.site for s in self.site_summaries()
+            if s.last_backup is None or s.last_backup < cutoff
+        ]
+
+    def summary(self, stale_days: int) -> BackupCatalogueSummary:
+        """Build the API summary of the catalogue."""
+        last = self.last_backup()
+        return BackupCatalogueSummary(
+            artifact_count=len(self.artifacts),
+            total_size=self.total_size(),
+            last_backup_date=datetime.fromtimestamp(last).isoformat() if last else None,
+            sites=self.site_summaries(),
+            stale_days=stale_days,
+            stale_sites=self.stale_sites(stale_days),
+            last_scan=int(self.last_scan) if self.last_scan else None,
+        )
+
+
+class _BackupIndex:
+    """Scan state of the catalogue: artifacts plus cached directory listings.
+
+    Rescans run in a worker thread on a copy, so the published index is
+    never modified.
+    """
+
+    def __init__(self) -> None:
+        self.artifacts: dict[str, BackupArtifact] = {}
+        self.sites: set[str] = set()
+        self._dir_mtimes: dict[str, int] = {}
+        self._dir_files: dict[str, set[str]] = {}
+        self._dir_subdirs: dict[str, set[str]] = {}
+        self._site_patterns: dict[str, re.Pattern] = {}
+
+    def rescanned(self) -> "_BackupIndex":
+        """Return a new index with changed directories re-listed."""
+        index = _BackupIndex()
+        index.artifacts = dict(self.artifacts)
+        index._dir_mtimes = dict(self._dir_mtimes)
+        # Listing sets are replaced, never modified, so sharing them is safe
+        index._dir_files = dict(self._dir_files)
+        index._dir_subdirs = dict(self._dir_subdirs)
+        index._scan(previous_sites=self.sites)
+        return index
+
+    def _scan(self, previous_sites: set[str]) -> None:
+        """Walk all backup roots, re-listing only directories that changed."""
+        self.sites = list_site_directories(SITES_ROOT)
+        self._site_patterns = {site: _site_name_pattern(site) for site in self.sites}
+
+        roots: list[tuple[str, str | None]] = [(d, None) for d in BACKUP_DIRS]
+        roots += [
+            (os.path.join(SITES_ROOT, site, SITE_BACKUP_SUBDIR), site)
+            for site in sorted(self.sites)
+        ]
+
+        artifacts = self.artifacts
+        seen_dirs: set[str] = set()
+        for root, site in roots:
+            self._scan_dir(root, site, artifacts, seen_dirs)
+
+        # Forget directories that disappeared along with their files
+        for path in list(self._dir_mtimes):
+            if path not in seen_dirs:
+                for file_path in self._dir_files.pop(path, set()):
+                    artifacts.pop(file_path, None)
+                self._dir_subdirs.pop(path, None)
+                del self._dir_mtimes[path]
+
+        if self.sites != previous_sites:
+            self._reattribute(artifacts)
+        self._resettle(artifacts)
+
+    def _scan_dir(
+        self,
+        path: str,
+        site: str | None,
+        artifacts: dict[str, BackupArtifact],
+        seen_dirs: set[str],
+    ) -> None:
+        """Index one directory and recurse into its subdirectories."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        seen_dirs.add(path)
+
+        if self._dir_mtimes.get(path) == st.st_mtime_ns:
+            # Unchanged listing: only nested directories can hold news
+            for subdir in self._dir_subdirs.get(path, set()):
+                self._scan_dir(subdir, site, artifacts, seen_dirs)
+            return
+
+        files: set[str] = set()
+        subdirs: set[str] = set()
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.add(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            files.add(entry.path)
+                            entry_st = entry.stat(follow_symlinks=False)
+                            artifacts[entry.path] = BackupArtifact(
+                                path=entry.path,
+                                size=entry_st.st_size,
+                                mtime=entry_st.st_mtime,
+                                site=site or self._owning_site(entry.path),
+                            )
+                    except OSError:
+                        continue
+        except OSError:
+            return
+
+        for removed in self._dir_files.get(path, set()) - files:
+            artifacts.pop(removed, None)
+
+        self._dir_mtimes[path] = st.st_mtime_ns
+        self._dir_files[path] = files
+        self._dir_subdirs[path] = subdirs
+
+        for subdir in subdirs:
+            self._scan_dir(subdir, site, artifacts, seen_dirs)
+
+    def _resettle(self, artifacts: dict[str, BackupArtifact]) -> None:
+        """Re-stat recently modified files that may still be growing."""
+        cutoff = time.time() - SETTLE_SECONDS
+        for path, artifact in list(artifacts.items()):
+            if artifact.mtime < cutoff:
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                artifacts.pop(path, None)
+                continue
+            if st.st_size != artifact.size or st.st_mtime != artifact.mtime:
+                artifacts[path] = artifact.model_copy(
+                    update={"size": st.st_size, "mtime": st.st_mtime}
+                )
+
+    def _reattribute(self, artifacts: dict[str, BackupArtifact]) -> None:
+        """Re-match files in global backup dirs after sites were added or removed.
+
+        Unchanged directories are not re-listed, so without this a backup
+        indexed before its site existed would stay unattributed.
+        """
+        for path, artifact in list(artifacts.items()):
+            if not any(path.startswith(d + os.sep) for d in BACKUP_DIRS):
+                continue
+            site = self._owning_site(path)
+            if site != artifact.site:
+                artifacts[path] = artifact.model_copy(update={"site": site})
+
+    def _owning_site(self, path: str) -> str | None:
+        """Match a backup path in a global backup dir to a known site.
+
+        Returns the longest site name that is a whole path component, or
+        the start of one followed by a separator, so
+        "example.com_2026-01-19.tar.gz" maps to "example.com" but
+        "example.com.au" does not.
+        """
+        best = None
+        for part in path.split(os.sep):
+            for site, pattern in self._site_patterns.items():
+                if pattern.match(part) and (best is None or len(site) > len(best)):
+                    best = site
+        return best
+
+
+def _site_name_pattern(site: str) -> re.Pattern:
+    """Match a path component that names a site rather than a longer domain.
+
+    The name must end the component or be followed by a character that
+    cannot continue a domain ("_", " ", ...), by "-" and a digit, as in
+    "example.com-2026-01-19.tar.gz", or by an archive extension.
+    """
+    return re.compile(re.escape(site) + r"(?:$|[^A-Za-z0-9.-]|-\d|\.(?:tar|t?gz|zip|sql|bz2|xz|zst)\b)")
+
+
+# Singleton instance for use across the server module
+backup_catalogue = BackupCatalogue()
@@ -0,0 +1,195 @@
+"""Per-service resource usage read from cgroup v2 files.
+
+systemd places every service in ``/sys/fs/cgroup/system.slice/<unit>``,
+whose ``cpu.stat``, ``memory.current``, ``io.stat`` and ``pids.current``
+files are read directly instead of forking ``systemctl``. CPU and IO
+rates are derived between consecutive samples, and a short history is
+kept per service for the stack services view.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+
+from backend.server.discovery import service_discovery
+from backend.server.models import ServiceResourceSample
+
+logger = logging.getLogger(__name__)
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+SERVICE_SLICE = "system.slice"
+
+# Seconds between background samples
+RESOURCE_SAMPLE_INTERVAL = 5
+
+# Samples kept per service (10 minutes at the default interval)
+RESOURCE_HISTORY_LENGTH = 120
+
+
+def cgroup_v2_available() -> bool:
+    """Check whether the unified cgroup v2 hierarchy is mounted."""
+    return os.path.exists(os.path.join(CGROUP_ROOT, "cgroup.controllers"))
+
+
+def _read_file(path: str) -> str | None:
+    """Read a small cgroup file, returning None if it doesn't exist."""
+    try:
+        with open(path, "r") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _read_int(path: str) -> int | None:
+    """Read a single-integer cgroup file such as memory.current."""
+    content = _read_file(path)
+    try:
+        return int(content) if content is not None else None
+    except ValueError:
+        return None
+
+
+def _read_keyed(path: str) -> dict[str, int]:
+    """Read a flat keyed file like cpu.stat ("usage_usec 1234" per line)."""
+    values = {}
+    for line in (_read_file(path) or "").splitlines():
+        parts = line.split()
+        if len(parts) == 2 and parts[1].isdigit():
+            values[parts[0]] = int(parts[1])
+    return values
+
+
+def _read_io_totals(path: str) -> tuple[int, int] | None:
+    """
+    Sum read and write bytes across devices in io.stat.
+
+    Lines look like "8:0 rbytes=1024 wbytes=2048 rios=1 wios=2 ...".
+
+    Returns:
+        Tuple of (read_bytes, write_bytes), or None if io.stat is missing
+    """
+    content = _read_file(path)
+    if content is None:
+        return None
+
+    read_bytes = write_bytes = 0
+    for line in content.splitlines():
+        for field in line.split()[1:]:
+            key, _, value = field.partition("=")
+            if key == "rbytes" and value.isdigit():
+                read_bytes += int(value)
+            elif key == "wbytes" and value.isdigit():
+                write_bytes += int(value)
+    return read_bytes, write_bytes
+
+
+class CgroupSampler:
+    """Samples cgroup counters per service and keeps a short history."""
+
+    def __init__(self) -> None:
+        # Service name -> (monotonic time, usage_usec, read_bytes, write_bytes)
+        self._previous: dict[str, tuple[float, int | None, int | None, int | None]] = {}
+        self._history: dict[str, deque[ServiceResourceSample]] = {}
+        self._task: asyncio.Task | None = None
+
+    def start(self, allowed: frozenset[str]) -> None:
+        """
+        Start sampling installed services in the background.
+
+        Args:
+            allowed: Static service allowlist passed to service discovery
+        """
+        if self._task is None and cgroup_v2_available():
+            self._task = asyncio.create_task(self._run(allowed))
+
+    async def stop(self) -> None:
+        """Stop the background sampling loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, allowed: frozenset[str]) -> None:
+        """Sample every installed service at a fixed interval."""
+        while True:
+            try:
+                names = await service_discovery.installed_services(allowed)
+                for name in names:
+                    self.sample(name)
+                # Forget services that were removed
+                for name in set(self._history) - set(names):
+                    self._history.pop(name, None)
+                    self._previous.pop(name, None)
+            except Exception as e:
+                logger.error(f"cgroup sampling failed: {e}")
+            await asyncio.sleep(RESOURCE_SAMPLE_INTERVAL)
+
+    def sample(self, name: str) -> ServiceResourceSample | None:
+        """
+        Read a service's cgroup counters and append a history point.
+
+        Args:
+            name: Service name without the ".service" suffix
+
+        Returns:
+            ServiceResourceSample, or None if the service has no cgroup
+            (stopped, or the host doesn't use cgroup v2)
+        """
+        path = os.path.join(CGROUP_ROOT, SERVICE_SLICE, f"{name}.service")
+        if not os.path.isdir(path):
+            # Stopped services have no cgroup; don't report their last usage
+            self._previous.pop(name, None)
+            self._history.pop(name, None)
+            return None
+
+        now = time.monotonic()
+        usage_usec = _read_keyed(os.path.join(path, "cpu.stat")).get("usage_usec")
+        io_totals = _read_io_totals(os.path.join(path, "io.stat"))
+        read_bytes, write_bytes = io_totals if io_totals is not None else (None, None)
+
+        previous = self._previous.get(name)
+        self._previous[name] = (now, usage_usec, read_bytes, write_bytes)
+
+        def rate(current: int | None, index: int, scale: float = 1.0) -> float | None:
+            if previous is None or current is None or previous[index] is None:
+                return None
+            elapsed = now - previous[0]
+            delta = current - previous[index]
+            # Counters restart with the cgroup when the service restarts
+            if elapsed <= 0 or delta < 0:
+                return None
+            return round(delta * scale / elapsed, 2)
+
+        result = ServiceResourceSample(
+            timestamp=int(time.time()),
+            # usage_usec per second of wall time, as a percentage of one CPU
+            cpu_percent=rate(usage_usec, 1, scale=100 / 1_000_000),
+            memory_bytes=_read_int(os.path.join(path, "memory.current")),
+            io_read_bytes_per_second=rate(read_bytes, 2),
+            io_write_bytes_per_second=rate(write_bytes, 3),
+            pids=_read_int(os.path.join(path, "pids.current")),
+        )
+
+        history = self._history.get(name)
+        if history is None:
+            history = self._history[name] = deque(maxlen=RESOURCE_HISTORY_LENGTH)
+        history.append(result)
+        return result
+
+    def latest(self, name: str) -> ServiceResourceSample | None:
+        """Return the most recent sample for a service."""
+        history = self._history.get(name)
+        return history[-1] if history else None
+
+    def history(self, name: str) -> list[ServiceResourceSample]:
+        """Return the sample history for a service, oldest first."""
+        return list(self._history.get(name, ()))
+
+
+# Singleton instance for use across the server module
+cgroup_stats = CgroupSampler()
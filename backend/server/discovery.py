@@ -0,0 +1,198 @@
+"""Discovery of installed PHP versions and systemd service units.
+
+PHP versions are read from ``/etc/php/*/fpm`` and service units from a
+single ``systemctl list-unit-files`` call. Both are cached and only
+re-read when the directories they come from change, so lookups cost a
+handful of ``stat`` calls instead of a fork per candidate unit.
+"""
+
+import asyncio
+import logging
+import os
+import re
+
+from backend.server.phpfpm import PHP_ETC_DIR, PHP_VERSION_PATTERN
+
+logger = logging.getLogger(__name__)
+
+# Unit directories whose mtime changes when packages add or remove units
+SYSTEMD_UNIT_DIRS = ("/etc/systemd/system", "/lib/systemd/system", "/usr/lib/systemd/system")
+
+# Debian alternatives symlink pointing at the default PHP binary
+PHP_ALTERNATIVE = "/etc/alternatives/php"
+
+# Matches PHP-FPM service names like "php8.2-fpm"
+PHP_FPM_SERVICE_PATTERN = re.compile(r"^php(\d+\.\d+)-fpm$")
+
+# Seconds allowed for listing unit files
+LIST_UNITS_TIMEOUT = 5
+
+
+def php_fpm_version(name: str) -> str | None:
+    """
+    Extract the PHP version from a PHP-FPM service name.
+
+    Args:
+        name: Service name like "php8.2-fpm"
+
+    Returns:
+        Version like "8.2", or None if the name isn't a PHP-FPM service
+    """
+    match = PHP_FPM_SERVICE_PATTERN.match(name)
+    return match.group(1) if match else None
+
+
+def _version_key(version: str) -> tuple[int, ...]:
+    """Sort key ordering "8.10" after "8.9"."""
+    return tuple(int(part) for part in version.split("."))
+
+
+def _mtime(path: str) -> int | None:
+    """Return a path's mtime in nanoseconds, or None if it doesn't exist."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class ServiceDiscovery:
+    """Cached index of installed PHP versions and service units."""
+
+    def __init__(self) -> None:
+        self._php_dirs: list[str] = []
+        self._php_key: tuple | None = None
+        self._php_versions: list[str] = []
+        self._units_key: tuple | None = None
+        self._units: set[str] | None = None
+        self._lock = asyncio.Lock()
+
+    # -------------------------------------------------------------------------
+    # PHP versions
+    # -------------------------------------------------------------------------
+
+    def _php_dirs_key(self) -> tuple:
+        """Mtimes of /etc/php and each version directory seen in it."""
+        return (_mtime(PHP_ETC_DIR),) + tuple(_mtime(path) for path in self._php_dirs)
+
+    def php_versions(self) -> list[str]:
+        """
+        List PHP versions with an FPM configuration directory.
+
+        Returns:
+            Versions like ["8.1", "8.2"], oldest first
+        """
+        key = self._php_dirs_key()
+        if key == self._php_key:
+            return self._php_versions
+
+        dirs = []
+        versions = []
+        try:
+            with os.scandir(PHP_ETC_DIR) as it:
+                for entry in it:
+                    if not PHP_VERSION_PATTERN.match(entry.name) or not entry.is_dir():
+                        continue
+                    dirs.append(entry.path)
+                    if os.path.isdir(os.path.join(entry.path, "fpm")):
+                        versions.append(entry.name)
+        except OSError:
+            pass
+
+        self._php_dirs = sorted(dirs)
+        self._php_versions = sorted(versions, key=_version_key)
+        self._php_key = self._php_dirs_key()
+        return self._php_versions
+
+    def default_php_version(self) -> str | None:
+        """
+        Return the default PHP version.
+
+        Uses the version the ``php`` alternative points at when it has FPM
+        installed, otherwise the newest installed version.
+
+        Returns:
+            Version like "8.2", or None if no PHP-FPM is installed
+        """
+        versions = self.php_versions()
+        if not versions:
+            return None
+
+        match = re.search(r"php(\d+\.\d+)$", os.path.realpath(PHP_ALTERNATIVE))
+        if match and match.group(1) in versions:
+            return match.group(1)
+        return versions[-1]
+
+    # -------------------------------------------------------------------------
+    # Service units
+    # -------------------------------------------------------------------------
+
+    async def installed_units(self) -> set[str] | None:
+        """
+        List installed service unit names, without the ".service" suffix.
+
+        Returns:
+            Set of unit names, or None if systemctl is unavailable
+        """
+        key = tuple(_mtime(path) for path in SYSTEMD_UNIT_DIRS)
+        if key == self._units_key:
+            return self._units
+
+        async with self._lock:
+            if key == self._units_key:
+                return self._units
+            self._units = await self._list_unit_files()
+            self._units_key = key if self._units is not None else None
+            return self._units
+
+    async def _list_unit_files(self) -> set[str] | None:
+        """Run systemctl list-unit-files once and parse unit names."""
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "systemctl",
+                "list-unit-files",
+                "--type=service",
+                "--no-legend",
+                "--no-pager",
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            stdout, _ = await asyncio.wait_for(
+                process.communicate(), timeout=LIST_UNITS_TIMEOUT
+            )
+        except (asyncio.TimeoutError, FileNotFoundError) as e:
+            logger.warning(f"Failed to list systemd unit files: {e}")
+            return None
+
+        if process.returncode != 0:
+            return None
+
+        units = set()
+        for line in stdout.decode("utf-8", errors="replace").splitlines():
+            parts = line.split()
+            if parts and parts[0].endswith(".service"):
+                units.add(parts[0][: -len(".service")])
+        return units
+
+    async def installed_services(self, allowed: frozenset[str]) -> list[str]:
+        """
+        List allowed services that are actually installed.
+
+        Args:
+            allowed: Static service allowlist; PHP-FPM services are added
+                for every discovered PHP version
+
+        Returns:
+            Sorted service names. If unit files can't be listed, every
+            candidate is returned so status queries can decide.
+        """
+        candidates = set(allowed)
+        candidates.update(f"php{version}-fpm" for version in self.php_versions())
+
+        units = await self.installed_units()
+        if units is not None:
+            candidates &= units
+        return sorted(candidates)
+
+
+# Singleton instance for use across the server module
+service_discovery = ServiceDiscovery()
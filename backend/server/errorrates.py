@@ -0,0 +1,264 @@
+"""Per-minute error counts from the nginx and PHP-FPM error logs.
+
+The global and per-site nginx error logs and the PHP-FPM log of every
+installed PHP version are followed. Each new warning or error line is
+classified by a short list of substring rules (upstream timeouts, failed
+connects to PHP-FPM, PHP fatal errors, ...) and counted in the minute it
+was logged. Counts are kept for a day in fixed arrays, one per
+(source, severity, category), so they can be charted next to the
+Netdata CPU and RAM series.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from array import array
+
+from backend.server.discovery import service_discovery
+from backend.server.follower import LogFollower
+from backend.server.logs import LOG_PATHS, PHP_FPM_LOG_PATH, SITE_LOG_PATHS, SITES_ROOT, read_recent_lines
+from backend.server.logsearch import parse_log_timestamp
+from backend.server.models import ErrorMetrics, ErrorRateSeries, MetricPoint, TimeRange
+from backend.server.netdata import TIME_RANGE_POINTS, TIME_RANGE_SECONDS
+from backend.wordops.sites import list_site_directories
+
+logger = logging.getLogger(__name__)
+
+# Minutes of counts kept (the longest metrics range)
+ERROR_WINDOW_MINUTES = 24 * 60
+
+# Bytes of existing log parsed per file on startup
+BACKFILL_BYTES = 4 * 1024 * 1024
+
+# Bytes of existing logs parsed across all files found in one refresh
+BACKFILL_TOTAL_BYTES = 64 * 1024 * 1024
+
+# Lower bound on the per-file backfill however many files there are
+BACKFILL_MIN_BYTES = 256 * 1024
+
+# Seconds between checks for added or removed log files
+SOURCE_REFRESH_INTERVAL = 60
+
+# "2026/01/19 10:15:30 [error] 1234#1234: *56 upstream timed out ..."
+NGINX_SEVERITY_PATTERN = re.compile(r"^\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2} \[(\w+)\]")
+
+# "[19-Jan-2026 10:15:30] WARNING: [pool www] child 123 exited on signal 11"
+FPM_SEVERITY_PATTERN = re.compile(r"^\[\d{2}-\w{3}-\d{4} \d{2}:\d{2}:\d{2}\] (\w+):")
+
+# Levels below warnings (nginx "notice"/"info", PHP-FPM "NOTICE" for start,
+# reload and child spawn messages) are not errors and are not counted
+IGNORED_SEVERITIES = frozenset({"debug", "info", "notice"})
+
+# Categories checked in order; the first matching rule wins
+ERROR_CATEGORIES: tuple[tuple[str, re.Pattern], ...] = (
+    ("php-fatal", re.compile(r"PHP Fatal error|PHP Parse error")),
+    ("php-warning", re.compile(r"PHP Warning")),
+    ("upstream-timeout", re.compile(r"upstream timed out")),
+    ("connect-failed", re.compile(r"connect\(\) (?:to \S+ )?failed")),
+    ("upstream-closed", re.compile(r"upstream prematurely closed|recv\(\) failed")),
+    ("no-live-upstreams", re.compile(r"no live upstreams")),
+    ("rate-limited", re.compile(r"limiting (?:requests|connections)")),
+    ("max-children", re.compile(r"max_children")),
+    ("execution-timeout", re.compile(r"execution timed out")),
+    ("child-crashed", re.compile(r"exited on signal|exited with code")),
+    ("slow-request", re.compile(r"executing too slow")),
+    ("not-found", re.compile(r"No such file or directory|is not found")),
+    ("ssl", re.compile(r"SSL_")),
+)
+
+
+def classify_error_line(line: str) -> tuple[str, str, str] | None:
+    """
+    Classify an nginx or PHP-FPM error log line.
+
+    Args:
+        line: Log line
+
+    Returns:
+        Tuple of (source, severity, category), or None for lines without
+        a severity (continuations such as stack traces) and for lines
+        below warning level
+    """
+    match = NGINX_SEVERITY_PATTERN.match(line)
+    if match is not None:
+        source = "nginx"
+    else:
+        match = FPM_SEVERITY_PATTERN.match(line)
+        if match is None:
+            return None
+        source = "php-fpm"
+
+    severity = match.group(1).lower()
+    if severity in IGNORED_SEVERITIES:
+        return None
+    for category, pattern in ERROR_CATEGORIES:
+        if pattern.search(line):
+            return source, severity, category
+    return source, severity, "other"
+
+
+class ErrorRateTracker:
+    """Follows the error logs and keeps per-minute counts for a day."""
+
+    def __init__(self, size: int = ERROR_WINDOW_MINUTES) -> None:
+        self.size = size
+        # Minute each ring slot counts, shared by every series
+        self._minutes = array("q", [-1]) * size
+        self._counts: dict[tuple[str, str, str], array] = {}
+        self._followers: dict[str, LogFollower] = {}
+        self._task: asyncio.Task | None = None
+        # Minute of the last timestamp parsed, keyed by the line prefix it came from
+        self._last_prefix: str | None = None
+        self._last_minute: int | None = None
+
+    def start(self) -> None:
+        """Start following error logs in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the refresh loop and every follower."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        for follower in self._followers.values():
+            await follower.stop()
+        self._followers.clear()
+
+    async def _run(self) -> None:
+        """Track error logs as sites and PHP versions come and go."""
+        while True:
+            try:
+                await self._sync_sources()
+            except Exception as e:
+                logger.error(f"Error rate tracking failed: {e}")
+            await asyncio.sleep(SOURCE_REFRESH_INTERVAL)
+
+    @staticmethod
+    def error_log_paths() -> set[str]:
+        """Collect the nginx and PHP-FPM error logs to follow."""
+        paths = {LOG_PATHS["nginx-error"]}
+        for version in service_discovery.php_versions():
+            paths.add(PHP_FPM_LOG_PATH.format(version=version))
+        for domain in list_site_directories(SITES_ROOT):
+            paths.add(SITE_LOG_PATHS["error"].format(domain=domain))
+        return paths
+
+    async def _sync_sources(self) -> None:
+        """Follow new error logs and stop following removed ones."""
+        paths = await asyncio.to_thread(self.error_log_paths)
+
+        for path in set(self._followers) - paths:
+            await self._followers.pop(path).stop()
+
+        added = paths - set(self._followers)
+        backfill_bytes = max(BACKFILL_MIN_BYTES, min(BACKFILL_BYTES, BACKFILL_TOTAL_BYTES // max(1, len(added))))
+        for path in sorted(added):
+            lines, offset = await asyncio.to_thread(read_recent_lines, path, backfill_bytes)
+            self.add_lines(lines)
+            follower = LogFollower(path, self.add_lines)
+            await follower.start(offset=offset)
+            self._followers[path] = follower
+
+    def _minute(self, line: str) -> int | None:
+        """Unix minute a line was logged in; consecutive lines mostly share one."""
+        # Both formats carry the minute within their first 18 characters
+        prefix = line[:18]
+        if prefix != self._last_prefix:
+            timestamp = parse_log_timestamp(line)
+            self._last_minute = int(timestamp) // 60 if timestamp is not None else None
+            self._last_prefix = prefix
+        return self._last_minute
+
+    def add_lines(self, lines: list[str]) -> None:
+        """Classify new log lines and count them in their minute."""
+        minutes = self._minutes
+        for line in lines:
+            classified = classify_error_line(line)
+            if classified is None:
+                continue
+            minute = self._minute(line)
+            if minute is None:
+                continue
+
+            slot = minute % self.size
+            stamp = minutes[slot]
+            if stamp != minute:
+                if stamp > minute:
+                    # Older than the window
+                    continue
+                minutes[slot] = minute
+                for counts in self._counts.values():
+                    counts[slot] = 0
+
+            counts = self._counts.get(classified)
+            if counts is None:
+                counts = self._counts[classified] = array("L", [0]) * self.size
+            counts[slot] += 1
+
+    def for_range(self, time_range: TimeRange) -> ErrorMetrics:
+        """
+        Bucket error counts like the Netdata series of a metrics range.
+
+        Buckets are as wide as the Netdata points but never narrower than
+        a minute, the resolution counts are kept at.
+        """
+        seconds = -TIME_RANGE_SECONDS[time_range]
+        bucket_seconds = -(-seconds // TIME_RANGE_POINTS[time_range] // 60) * 60
+        return self.series(seconds, bucket_seconds)
+
+    def series(self, seconds: int, bucket_seconds: int) -> ErrorMetrics:
+        """
+        Sum the per-minute counts into buckets over a time range.
+
+        Args:
+            seconds: Length of the range ending now
+            bucket_seconds: Bucket width, a multiple of 60
+
+        Returns:
+            ErrorMetrics with one series per (source, severity, category)
+            that has errors in the range, largest first, plus totals
+        """
+        width = max(1, bucket_seconds // 60)
+        current = int(time.time()) // 60
+        count = max(1, min(seconds // 60, self.size) // width)
+        first = current - count * width + 1
+        timestamps = [(first + index * width) * 60 for index in range(count)]
+
+        totals = [0] * count
+        result = []
+        for (source, severity, category), counts in self._counts.items():
+            buckets = [0] * count
+            for minute in range(first, current + 1):
+                slot = minute % self.size
+                if self._minutes[slot] == minute and counts[slot]:
+                    buckets[(minute - first) // width] += counts[slot]
+            total = sum(buckets)
+            if total == 0:
+                continue
+            for index, value in enumerate(buckets):
+                totals[index] += value
+            result.append(ErrorRateSeries(
+                source=source,
+                severity=severity,
+                category=category,
+                total=total,
+                points=[MetricPoint(timestamp=t, value=v) for t, v in zip(timestamps, buckets)],
+            ))
+
+        result.sort(key=lambda s: s.total, reverse=True)
+        return ErrorMetrics(
+            bucket_seconds=width * 60,
+            series=result,
+            totals=[MetricPoint(timestamp=t, value=v) for t, v in zip(timestamps, totals)],
+        )
+
+
+# Singleton instance for use across routes
+error_rates = ErrorRateTracker()
@@ -0,0 +1,203 @@
+"""Minimal async FastCGI client with pooled keep-alive connections.
+
+Used to query PHP-FPM's status page directly over each pool's socket
+instead of shelling out. Only the responder role with an empty request
+body is supported, which is all the status and ping pages need.
+"""
+
+import asyncio
+import struct
+
+FCGI_VERSION = 1
+
+# Record types
+FCGI_BEGIN_REQUEST = 1
+FCGI_END_REQUEST = 3
+FCGI_PARAMS = 4
+FCGI_STDIN = 5
+FCGI_STDOUT = 6
+FCGI_STDERR = 7
+
+FCGI_RESPONDER = 1
+FCGI_KEEP_CONN = 1
+FCGI_REQUEST_COMPLETE = 0
+
+# version, type, request id, content length, padding length, reserved
+HEADER_FORMAT = "!BBHHBx"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+# Idle connections kept open per address
+MAX_IDLE_CONNECTIONS = 2
+
+# Seconds allowed for connecting and for a full request/response exchange
+CONNECT_TIMEOUT = 2.0
+REQUEST_TIMEOUT = 5.0
+
+
+class FastCGIError(RuntimeError):
+    """Raised when a FastCGI exchange fails."""
+
+
+def _record(record_type: int, request_id: int, content: bytes = b"") -> bytes:
+    """Encode a single FastCGI record, padded to an 8-byte boundary."""
+    padding = -len(content) % 8
+    header = struct.pack(HEADER_FORMAT, FCGI_VERSION, record_type, request_id, len(content), padding)
+    return header + content + b"\x00" * padding
+
+
+def _encode_length(length: int) -> bytes:
+    """Encode a name/value length (1 byte below 128, otherwise 4 bytes)."""
+    if length < 128:
+        return bytes([length])
+    return struct.pack("!I", length | 0x80000000)
+
+
+def _encode_params(params: dict[str, str]) -> bytes:
+    """Encode CGI params as FastCGI name-value pairs."""
+    out = bytearray()
+    for name, value in params.items():
+        name_bytes = name.encode("utf-8")
+        value_bytes = value.encode("utf-8")
+        out += _encode_length(len(name_bytes)) + _encode_length(len(value_bytes))
+        out += name_bytes + value_bytes
+    return bytes(out)
+
+
+def parse_address(listen: str) -> tuple[str, str | int]:
+    """
+    Parse a PHP-FPM ``listen`` value.
+
+    Args:
+        listen: Socket path, "host:port", "[ipv6]:port" or bare port
+
+    Returns:
+        ("unix", path) or ("tcp", "host:port")
+    """
+    listen = listen.strip()
+    if listen.startswith("/"):
+        return "unix", listen
+    if listen.isdigit():
+        return "tcp", f"127.0.0.1:{listen}"
+    if ":" in listen:
+        return "tcp", listen
+    # Relative socket names are resolved against the PHP runtime directory
+    return "unix", f"/run/php/{listen}"
+
+
+class FastCGIConnectionPool:
+    """Keep-alive FastCGI connections to a single address."""
+
+    def __init__(self, address: str) -> None:
+        self.kind, self.target = parse_address(address)
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._next_request_id = 1
+
+    async def _open(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """Open a new connection to the pool's address."""
+        if self.kind == "unix":
+            connect = asyncio.open_unix_connection(self.target)
+        else:
+            host, _, port = self.target.rpartition(":")
+            connect = asyncio.open_connection(host.strip("[]"), int(port))
+        return await asyncio.wait_for(connect, timeout=CONNECT_TIMEOUT)
+
+    async def request(self, params: dict[str, str]) -> tuple[bytes, bytes]:
+        """
+        Send a request with an empty body and collect the response.
+
+        Args:
+            params: CGI params (SCRIPT_FILENAME, QUERY_STRING, ...)
+
+        Returns:
+            Tuple of (stdout, stderr) bytes
+
+        Raises:
+            FastCGIError: If the exchange fails or the app rejects the request
+            OSError: If the socket cannot be reached
+        """
+        reused = bool(self._idle)
+        reader, writer = self._idle.pop() if reused else await self._open()
+
+        try:
+            result = await asyncio.wait_for(
+                self._exchange(reader, writer, params), timeout=REQUEST_TIMEOUT
+            )
+        except (OSError, asyncio.IncompleteReadError, FastCGIError) as e:
+            writer.close()
+            if reused and not isinstance(e, FastCGIError):
+                # The server may have closed an idle connection; retry once fresh
+                return await self.request(params)
+            raise
+        except BaseException:
+            writer.close()
+            raise
+
+        if len(self._idle) < MAX_IDLE_CONNECTIONS:
+            self._idle.append((reader, writer))
+        else:
+            writer.close()
+        return result
+
+    async def _exchange(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        params: dict[str, str],
+    ) -> tuple[bytes, bytes]:
+        """Write one request and read records until END_REQUEST."""
+        request_id = self._next_request_id
+        self._next_request_id = request_id % 0xFFFF + 1
+
+        begin = struct.pack("!HB5x", FCGI_RESPONDER, FCGI_KEEP_CONN)
+        encoded = _encode_params(params)
+        writer.write(
+            _record(FCGI_BEGIN_REQUEST, request_id, begin)
+            + _record(FCGI_PARAMS, request_id, encoded)
+            + _record(FCGI_PARAMS, request_id)
+            + _record(FCGI_STDIN, request_id)
+        )
+        await writer.drain()
+
+        stdout = bytearray()
+        stderr = bytearray()
+        while True:
+            header = await reader.readexactly(HEADER_SIZE)
+            _, record_type, record_id, length, padding = struct.unpack(HEADER_FORMAT, header)
+            content = await reader.readexactly(length + padding)
+            content = content[:length]
+
+            if record_id != request_id:
+                continue
+            if record_type == FCGI_STDOUT:
+                stdout += content
+            elif record_type == FCGI_STDERR:
+                stderr += content
+            elif record_type == FCGI_END_REQUEST:
+                _, protocol_status = struct.unpack("!IB3x", content)
+                if protocol_status != FCGI_REQUEST_COMPLETE:
+                    raise FastCGIError(f"FastCGI request rejected (status {protocol_status})")
+                return bytes(stdout), bytes(stderr)
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        for _, writer in self._idle:
+            writer.close()
+        self._idle.clear()
+
+
+def split_response(stdout: bytes) -> tuple[dict[str, str], bytes]:
+    """
+    Split a CGI response into headers and body.
+
+    Returns:
+        Tuple of (lower-cased header dict, body bytes)
+    """
+    head, sep, body = stdout.partition(b"\r\n\r\n")
+    if not sep:
+        head, sep, body = stdout.partition(b"\n\n")
+    headers = {}
+    for line in head.decode("latin-1").splitlines():
+        if ":" in line:
+            key, value = line.split(":", 1)
+            headers[key.strip().lower()] = value.strip()
+    return headers, body
@@ -0,0 +1,548 @@
+"""Shared log file followers driven by inotify, with a polling fallback.
+
+One follower runs per followed log file, no matter how many clients are
+watching it. It keeps the file open and reads only the bytes appended
+since its stored offset, handing complete lines to a callback.
+
+Rotation is handled for both logrotate modes:
+
+- ``create``: the file is renamed and a new one created. The follower
+  notices the path now names another inode, drains what is left in the
+  old file, then reads the new file from its start. The old file stays
+  open for ROTATED_DRAIN_SECONDS, since the writer keeps appending to it
+  until it is told to reopen the log.
+- ``copytruncate``: the file is copied and cut back to zero. The follower
+  notices the size dropped below its offset, or that the bytes just
+  before its offset changed. Lines written between its last read and the
+  copy are read from the uncompressed copy, identified by those same
+  bytes, before it restarts from the beginning of the live file.
+
+A file cut back to a shorter, non-zero length that still starts with the
+bytes read before is not a rotation: reading resumes at its new end.
+
+inotify is used through ctypes so no extra dependency is needed. All
+followers share one inotify instance with one watch per log directory,
+and events are routed to followers by file name, so the number of
+instances and wakeups doesn't grow with the number of followed files.
+Where inotify is unavailable (non-Linux, exhausted watches) followers
+poll instead.
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+import logging
+import os
+import struct
+import time
+from collections.abc import Callable
+from typing import Any
+
+from backend.server.logs import decode_line
+
+logger = logging.getLogger(__name__)
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# Directory events that may mean new data for, or rotation of, a followed file
+FOLLOW_MASK = IN_MODIFY | IN_CREATE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+
+# struct inotify_event header: wd, mask, cookie, len
+INOTIFY_EVENT = struct.Struct("iIII")
+
+# Seconds between checks when inotify is unavailable
+POLL_INTERVAL = 1.0
+
+# Seconds between safety checks even when inotify is active
+WATCHDOG_INTERVAL = 10.0
+
+# Maximum bytes read per wakeup; larger backlogs are read over several
+MAX_READ_SIZE = 1024 * 1024
+
+# Bytes before the offset compared on each read to detect a file that was
+# truncated and rewritten past the old offset between two reads
+TRUNCATION_CHECK_SIZE = 64
+
+# Seconds a renamed log is still read after switching to its replacement
+ROTATED_DRAIN_SECONDS = 30.0
+
+# Bytes searched back from the end for the start of a partial last line
+# when following from the end of a file
+PARTIAL_LINE_LOOKBACK = 64 * 1024
+
+try:
+    _libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    _libc.inotify_init1  # Raises AttributeError on non-Linux libcs
+except (OSError, AttributeError, TypeError):
+    _libc = None
+
+
+class Inotify:
+    """Minimal non-blocking inotify instance."""
+
+    def __init__(self) -> None:
+        if _libc is None:
+            raise OSError("inotify is not available")
+        self.fd = _libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+    def add_watch(self, path: str, mask: int) -> int:
+        """
+        Watch a path for the given events.
+
+        Returns:
+            Watch descriptor
+
+        Raises:
+            OSError: If the watch cannot be added
+        """
+        wd = _libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        """Remove a watch; errors for watches already gone are ignored."""
+        _libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self) -> list[tuple[int, int, str]]:
+        """Read pending events as (wd, mask, name) tuples."""
+        events = []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return events
+
+        offset = 0
+        while offset + INOTIFY_EVENT.size <= len(data):
+            wd, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self) -> None:
+        """Close the inotify file descriptor."""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def inotify_available() -> bool:
+    """Check whether inotify can be used on this system."""
+    return _libc is not None
+
+
+class DirectoryWatcher:
+    """One inotify instance shared by all followers, one watch per directory.
+
+    The instance is created with the first follower and closed with the
+    last, so it always belongs to the running event loop.
+    """
+
+    def __init__(self) -> None:
+        self._inotify: Inotify | None = None
+        self._watches: dict[str, int] = {}  # directory -> watch descriptor
+        self._followers: dict[int, dict[str, set["LogFollower"]]] = {}  # wd -> file name -> followers
+
+    def add(self, follower: "LogFollower") -> bool:
+        """
+        Route events for a follower's file to it.
+
+        Returns:
+            True if the file is watched, False if the follower must poll
+        """
+        if not inotify_available():
+            return False
+        directory, name = os.path.split(follower.path)
+        try:
+            if self._inotify is None:
+                self._inotify = Inotify()
+                asyncio.get_running_loop().add_reader(self._inotify.fd, self._on_readable)
+            wd = self._watches.get(directory)
+            if wd is None:
+                wd = self._inotify.add_watch(directory, FOLLOW_MASK)
+                self._watches[directory] = wd
+        except OSError as e:
+            logger.info(f"inotify unavailable for {follower.path}, polling instead: {e}")
+            self._close_if_unused()
+            return False
+
+        self._followers.setdefault(wd, {}).setdefault(name, set()).add(follower)
+        return True
+
+    def remove(self, follower: "LogFollower") -> None:
+        """Stop routing events to a follower, dropping watches no longer needed."""
+        directory, name = os.path.split(follower.path)
+        wd = self._watches.get(directory)
+        if wd is None:
+            return
+        names = self._followers.get(wd, {})
+        followers = names.get(name, set())
+        followers.discard(follower)
+        if not followers:
+            names.pop(name, None)
+        if not names:
+            self._followers.pop(wd, None)
+            del self._watches[directory]
+            self._inotify.rm_watch(wd)
+        self._close_if_unused()
+
+    def _close_if_unused(self) -> None:
+        """Close the inotify instance once nothing is watched."""
+        if self._inotify is not None and not self._watches:
+            asyncio.get_running_loop().remove_reader(self._inotify.fd)
+            self._inotify.close()
+            self._inotify = None
+
+    def _on_readable(self) -> None:
+        """Wake the followers whose files an event concerns."""
+        for wd, mask, name in self._inotify.read_events():
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost: every follower checks its file
+                for names in self._followers.values():
+                    for followers in names.values():
+                        for follower in followers:
+                            follower.wake()
+                continue
+            if mask & IN_IGNORED:
+                # The directory itself went away: its followers poll from now on
+                for directory, watched in list(self._watches.items()):
+                    if watched == wd:
+                        del self._watches[directory]
+                for followers in self._followers.pop(wd, {}).values():
+                    for follower in followers:
+                        follower.watched = False
+                        follower.wake()
+                continue
+            for follower in self._followers.get(wd, {}).get(name, ()):
+                follower.wake()
+
+
+# Shared by every follower in the process
+directory_watcher = DirectoryWatcher()
+
+
+class LogFollower:
+    """Follows one log file and emits lines appended to it.
+
+    on_lines is called on the event loop with each batch of new lines. If
+    parse is given, it runs on each batch in the worker thread that read
+    it, and on_lines gets its result instead, so parsing never blocks the
+    event loop.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        on_lines: Callable[[Any], None],
+        parse: Callable[[list[str]], Any] | None = None,
+    ) -> None:
+        self.path = path
+        self.on_lines = on_lines
+        self.parse = parse
+        self.offset = 0
+        # End of the last complete line handed to on_lines; unlike offset it
+        # excludes a held-back partial line and is only updated on the loop
+        self.line_offset = 0
+        self._file = None
+        self._partial = b""
+        self._first_bytes = b""
+        self._last_bytes = b""
+        # Renamed file still drained after a create rotation, with its own
+        # partial line and the monotonic time it is closed at
+        self._rotated_file = None
+        self._rotated_partial = b""
+        self._rotated_until = 0.0
+        self.watched = False
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    async def start(self, offset: int | None = None) -> None:
+        """
+        Open the file and start following it.
+
+        Args:
+            offset: Byte offset to start reading from, e.g. the end of
+                lines already processed (default: the end of the file)
+        """
+        if self._task is not None:
+            return
+
+        self._open(at_end=True, offset=offset)
+        self.line_offset = self.offset
+        self.watched = directory_watcher.add(self)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop following and release the file and watch."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self.watched:
+            directory_watcher.remove(self)
+            self.watched = False
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._rotated_file is not None:
+            self._rotated_file.close()
+            self._rotated_file = None
+
+    def _open(self, at_end: bool, offset: int | None = None) -> None:
+        """Open the log file, starting at its end or its beginning.
+
+        An offset within the file takes precedence over at_end.
+        """
+        self._partial = b""
+        self._first_bytes = b""
+        self._last_bytes = b""
+        try:
+            self._file = open(self.path, "rb")
+        except OSError:
+            self._file = None
+            self.offset = 0
+            return
+
+        size = os.fstat(self._file.fileno()).st_size
+        if offset is not None and offset <= size:
+            self.offset = offset
+        elif at_end:
+            # Start before a partial last line so it is emitted whole
+            self.offset = self._last_line_start(size)
+        else:
+            self.offset = 0
+        if self.offset > 0:
+            check_size = min(TRUNCATION_CHECK_SIZE, self.offset)
+            self._first_bytes = os.pread(self._file.fileno(), check_size, 0)
+            self._last_bytes = os.pread(self._file.fileno(), check_size, self.offset - check_size)
+
+    def _last_line_start(self, size: int) -> int:
+        """Offset just past the last newline within PARTIAL_LINE_LOOKBACK of size."""
+        check_size = min(PARTIAL_LINE_LOOKBACK, size)
+        tail = os.pread(self._file.fileno(), check_size, size - check_size)
+        newline = tail.rfind(b"\n")
+        if newline < 0:
+            return size if check_size < size else 0
+        return size - check_size + newline + 1
+
+    def wake(self) -> None:
+        """Check the file for new data now."""
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        """Read appended data whenever the file may have changed."""
+        while True:
+            interval = WATCHDOG_INTERVAL if self.watched else POLL_INTERVAL
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                lines, line_offset, more = await asyncio.to_thread(self._read_batch)
+            except OSError as e:
+                logger.warning(f"Failed to read {self.path}: {e}")
+                continue
+
+            self.line_offset = line_offset
+            if lines:
+                self.on_lines(lines)
+            if more:
+                self._wakeup.set()
+
+    def _read_batch(self) -> tuple[Any, int, bool]:
+        """Read appended lines and run the parse hook on them, in the worker thread."""
+        lines, line_offset, more = self._read_appended()
+        if lines and self.parse is not None:
+            return self.parse(lines), line_offset, more
+        return lines, line_offset, more
+
+    def _read_appended(self) -> tuple[list[str], int, bool]:
+        """
+        Read bytes appended since the stored offset, following rotation.
+
+        Returns:
+            Tuple of (complete new lines, offset just past the last complete
+            line in the current file, whether more data is pending)
+        """
+        lines = []
+        more = False
+        if self._rotated_file is not None:
+            more = self._drain_rotated(lines)
+
+        if self._file is None:
+            # The file didn't exist yet; anything in it now is new
+            self._open(at_end=False)
+            if self._file is None:
+                return lines, 0, more
+
+        if self._truncated():
+            copied = self._read_rotated_copy()
+            size = os.fstat(self._file.fileno()).st_size
+            if not copied and self._cut_back(size):
+                # Shortened in place: everything before the new end was read
+                line_start = self.offset - len(self._partial)
+                self._partial = self._partial[:max(0, size - line_start)]
+                self.offset = size
+                check_size = min(TRUNCATION_CHECK_SIZE, size)
+                self._last_bytes = os.pread(self._file.fileno(), check_size, size - check_size)
+            else:
+                # copytruncate: finish the old content from the copy, then
+                # restart from zero
+                remainder = (self._partial + copied).split(b"\n")
+                if remainder[-1] == b"":
+                    remainder.pop()
+                lines.extend(decode_line(part) for part in remainder)
+                self.offset = 0
+                self._partial = b""
+                self._first_bytes = b""
+                self._last_bytes = b""
+
+        self._file.seek(self.offset)
+        data = self._file.read(MAX_READ_SIZE)
+        if data:
+            self.offset += len(data)
+            if len(self._first_bytes) < TRUNCATION_CHECK_SIZE:
+                self._first_bytes = (self._first_bytes + data)[:TRUNCATION_CHECK_SIZE]
+            self._last_bytes = (self._last_bytes + data)[-TRUNCATION_CHECK_SIZE:]
+
+            # Hold back a trailing partial line until its newline arrives
+            parts = (self._partial + data).split(b"\n")
+            self._partial = parts.pop()
+            lines.extend(decode_line(part) for part in parts)
+            return lines, self.offset - len(self._partial), more or len(data) == MAX_READ_SIZE
+
+        if not self._rotated():
+            return lines, self.offset - len(self._partial), more
+
+        # Everything in the new file is unread; the writer may still append
+        # to the old one until it reopens the log, so keep draining it
+        if self._rotated_file is not None:
+            self._rotated_until = 0.0
+            self._drain_rotated(lines)
+        self._rotated_file = self._file
+        self._rotated_partial = self._partial
+        self._rotated_until = time.monotonic() + ROTATED_DRAIN_SECONDS
+        self._open(at_end=False)
+        return lines, 0, True
+
+    def _drain_rotated(self, lines: list[str]) -> bool:
+        """
+        Read lines appended to the renamed file since the last read.
+
+        Once ROTATED_DRAIN_SECONDS have passed the file is read to its end
+        and closed; its last line is then taken as complete.
+
+        Args:
+            lines: List the new lines are appended to
+
+        Returns:
+            True if more data is pending in the renamed file
+        """
+        expired = time.monotonic() >= self._rotated_until
+        while True:
+            data = self._rotated_file.read(MAX_READ_SIZE)
+            parts = (self._rotated_partial + data).split(b"\n")
+            self._rotated_partial = parts.pop()
+            lines.extend(decode_line(part) for part in parts)
+            if len(data) < MAX_READ_SIZE:
+                break
+            if not expired:
+                return True
+
+        if expired:
+            if self._rotated_partial:
+                lines.append(decode_line(self._rotated_partial))
+            self._rotated_file.close()
+            self._rotated_file = None
+            self._rotated_partial = b""
+        return False
+
+    def _truncated(self) -> bool:
+        """Check whether the open file was cut back below the offset."""
+        fd = self._file.fileno()
+        if os.fstat(fd).st_size < self.offset:
+            return True
+        if not self._last_bytes:
+            return False
+        # Catches truncation followed by writes that grew the file past the offset
+        check_size = len(self._last_bytes)
+        return os.pread(fd, check_size, self.offset - check_size) != self._last_bytes
+
+    def _cut_back(self, size: int) -> bool:
+        """Check whether the file shrank but still starts with the bytes read before."""
+        if not 0 < size < self.offset or not self._first_bytes:
+            return False
+        return os.pread(self._file.fileno(), len(self._first_bytes), 0) == self._first_bytes
+
+    def _read_rotated_copy(self) -> bytes:
+        """
+        Read the unread tail of the old content from a copytruncate copy.
+
+        Candidates are uncompressed siblings named like the log with a
+        suffix ("access.log.1", "access.log-20260119"), newest first. The
+        copy is accepted only if it holds the bytes last read before the
+        offset, at the same position.
+
+        Returns:
+            Bytes from the offset to the end of the copy, or b"" if no
+            matching copy was found
+        """
+        if not self._last_bytes:
+            return b""
+
+        directory, name = os.path.split(self.path)
+        candidates = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if (
+                        entry.name.startswith((name + ".", name + "-"))
+                        and not entry.name.endswith((".gz", ".bz2", ".xz", ".zst"))
+                        and entry.is_file()
+                    ):
+                        candidates.append((entry.stat().st_mtime, entry.path))
+        except OSError:
+            return b""
+
+        check_size = len(self._last_bytes)
+        for _, path in sorted(candidates, reverse=True)[:3]:
+            try:
+                with open(path, "rb") as f:
+                    if os.pread(f.fileno(), check_size, self.offset - check_size) != self._last_bytes:
+                        continue
+                    f.seek(self.offset)
+                    return f.read()
+            except OSError:
+                continue
+        return b""
+
+    def _rotated(self) -> bool:
+        """Check whether the path now names a different file than the open one."""
+        try:
+            path_st = os.stat(self.path)
+        except OSError:
+            # Renamed away and not recreated yet: keep following the old file
+            return False
+        open_st = os.fstat(self._file.fileno())
+        return (path_st.st_ino, path_st.st_dev) != (open_st.st_ino, open_st.st_dev)
@@ -0,0 +1,176 @@
+"""Ranged and compressed log file downloads.
+
+Files are streamed in fixed-size chunks read with ``os.pread``, so
+memory stays flat for any file size. The descriptor is opened when the
+body starts and held until it ends, so a log rotated mid-transfer is
+still sent whole. The size is fixed when the request arrives; lines
+appended afterwards are left for the next (resumed) request.
+
+Single byte ranges (``Range: bytes=start-end``) are honoured so clients
+such as ``curl -C -`` and ``wget -c`` can resume. Whole-file requests
+from clients that accept gzip are compressed on the fly.
+"""
+
+import asyncio
+import os
+import re
+import zlib
+from collections.abc import AsyncIterator
+from email.utils import formatdate
+
+# Bytes read (and compressed) per chunk
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# zlib level for on-the-fly gzip; higher levels cost CPU for little gain on logs
+GZIP_LEVEL = 6
+
+# "bytes=0-499", "bytes=500-" or "bytes=-500"
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiableError(ValueError):
+    """A Range header that selects no bytes of the file."""
+
+
+def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """
+    Parse a Range header against a file size.
+
+    Multiple ranges and malformed headers are ignored, which RFC 9110
+    allows: the whole file is sent instead.
+
+    Args:
+        header: Range header value, if any
+        size: File size in bytes
+
+    Returns:
+        Inclusive (start, end) byte offsets, or None to send the whole file
+
+    Raises:
+        RangeNotSatisfiableError: If the range starts past the end of the file
+    """
+    if not header:
+        return None
+    match = RANGE_PATTERN.match(header.strip())
+    if match is None:
+        return None
+
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiableError(header)
+        return max(0, size - length), size - 1
+
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiableError(header)
+    end = int(last) if last else size - 1
+    return start, min(end, size - 1)
+
+
+def accepts_gzip(header: str | None) -> bool:
+    """Return whether an Accept-Encoding header allows gzip."""
+    if not header:
+        return False
+    for coding in header.split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() not in ("gzip", "*"):
+            continue
+        quality = params.strip().lower()
+        if quality.startswith("q="):
+            try:
+                return float(quality[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def entity_tag(stat: os.stat_result) -> str:
+    """Strong validator for a file as it was when the download started."""
+    return f'"{stat.st_ino:x}-{stat.st_size:x}-{int(stat.st_mtime):x}"'
+
+
+def last_modified(stat: os.stat_result) -> str:
+    """Last-Modified header value for a file."""
+    return formatdate(stat.st_mtime, usegmt=True)
+
+
+def if_range_matches(header: str | None, stat: os.stat_result) -> bool:
+    """
+    Check an If-Range header against the file being downloaded.
+
+    Args:
+        header: If-Range value (an entity tag or HTTP date), if any
+        stat: Stat of the open file
+
+    Returns:
+        True if the Range header should be honoured
+    """
+    if not header:
+        return True
+    return header.strip() in (entity_tag(stat), last_modified(stat))
+
+
+async def iter_file(
+    path: str,
+    stat: os.stat_result,
+    start: int,
+    end: int,
+    compress: bool = False,
+) -> AsyncIterator[bytes]:
+    """
+    Stream a byte range of a file.
+
+    The file is only opened once the body is iterated, so a response that
+    is never sent holds no descriptor.
+
+    Args:
+        path: File to read
+        stat: Stat taken when the response headers were built; if the path
+            now names another file (rotated in between), nothing is sent
+            and the client sees a short response
+        start: First byte offset
+        end: Last byte offset (inclusive)
+        compress: Gzip the bytes on the fly
+
+    Yields:
+        Chunks of at most DOWNLOAD_CHUNK_SIZE bytes (before compression)
+    """
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31) if compress else None
+
+    # Opened synchronously: a cancelled worker thread could leave the
+    # descriptor open with nobody to close it
+    fd = os.open(path, os.O_RDONLY)
+
+    def read_chunk(offset: int) -> tuple[int, bytes]:
+        data = os.pread(fd, min(DOWNLOAD_CHUNK_SIZE, end + 1 - offset), offset)
+        if compressor is not None:
+            return len(data), compressor.compress(data)
+        return len(data), data
+
+    try:
+        opened = os.fstat(fd)
+        if (opened.st_ino, opened.st_dev) != (stat.st_ino, stat.st_dev):
+            return
+
+        offset = start
+        while offset <= end:
+            # Reads (and compression) run off the event loop
+            read, data = await asyncio.to_thread(read_chunk, offset)
+            if read == 0:
+                # Truncated in place (copytruncate); end the response short
+                break
+            offset += read
+            if data:
+                yield data
+        if compressor is not None:
+            yield compressor.flush()
+    finally:
+        os.close(fd)
@@ -1,26 +1,73 @@
 """Log file reading utilities for WordOps Dashboard.
 
 Security: Log paths are hardcoded - never construct paths from user input.
+Per-site paths are built only from domains found in the site inventory
+that pass validate_domain(); a requested log type is looked up in the
+resulting map, never formatted into a path.
 """
 
+import asyncio
 import logging
-from collections import deque
+import os
+from collections.abc import Iterator
+from typing import BinaryIO
 
-import aiofiles
+from backend.server.discovery import service_discovery
+from backend.wordops.sites import list_site_directories
 
 logger = logging.getLogger(__name__)
 
 # Maximum lines allowed to prevent memory issues
 MAX_LINES = 500
 
+# Bytes read per backwards seek when tailing a file
+TAIL_BLOCK_SIZE = 64 * 1024
+
 # Hardcoded log file paths - NEVER construct from user input
 LOG_PATHS: dict[str, str] = {
     "nginx-access": "/var/log/nginx/access.log",
     "nginx-error": "/var/log/nginx/error.log",
-    "php-fpm": "/var/log/php8.2-fpm.log",
     "mysql": "/var/log/mysql/error.log",
+    "mysql-slow": "/var/log/mysql/mysql-slow.log",
 }
 
+# PHP-FPM log path, formatted with versions discovered under /etc/php
+PHP_FPM_LOG_PATH = "/var/log/php{version}-fpm.log"
+
+# WordOps per-site nginx logs, keyed by log type suffix ("{domain}-access")
+SITE_LOG_PATHS: dict[str, str] = {
+    "access": "/var/log/nginx/{domain}.access.log",
+    "error": "/var/log/nginx/{domain}.error.log",
+}
+
+# WordOps web root holding one directory per site
+SITES_ROOT = "/var/www"
+
+
+def get_log_paths() -> dict[str, str]:
+    """Build the map of available log types to file paths.
+
+    Adds a "php{version}-fpm" type per installed PHP version, plus
+    "php-fpm" for the default version, and "{domain}-access" and
+    "{domain}-error" types per site.
+
+    Returns:
+        Dict of log type to absolute file path
+    """
+    paths = dict(LOG_PATHS)
+    for version in service_discovery.php_versions():
+        paths[f"php{version}-fpm"] = PHP_FPM_LOG_PATH.format(version=version)
+
+    default_version = service_discovery.default_php_version()
+    if default_version is not None:
+        paths["php-fpm"] = PHP_FPM_LOG_PATH.format(version=default_version)
+
+    # Domains are validated by list_site_directories
+    for domain in list_site_directories(SITES_ROOT):
+        for suffix, path in SITE_LOG_PATHS.items():
+            paths[f"{domain}-{suffix}"] = path.format(domain=domain)
+    return paths
+
 
 def validate_log_type(log_type: str) -> bool:
     """Validate log type against allowed paths.
@@ -31,36 +78,150 @@ def validate_log_type(log_type: str) -> bool:
     Returns:
         True if log type is valid, False otherwise
     """
-    return log_type in LOG_PATHS
+    return log_type in get_log_paths()
+
+
+def iter_line_blocks_reversed(
+    f: BinaryIO,
+    end: int | None = None,
+    block_size: int = TAIL_BLOCK_SIZE,
+) -> Iterator[list[bytes]]:
+    """Iterate over a file's lines from the end, one block at a time.
+
+    Blocks are read backwards with fixed-size seeks. Lines are split on raw
+    b"\\n" bytes before any decoding; that byte never occurs inside a
+    multi-byte UTF-8 sequence, so characters cut at a block boundary come
+    out whole. A line spanning several blocks is yielded with the block
+    holding its start.
+
+    Args:
+        f: File opened in binary mode
+        end: Byte offset to treat as the end of the file (default: its size)
+        block_size: Bytes to read per seek
+
+    Yields:
+        Lists of complete raw lines without the newline, in file order
+        within each list, newest list first
+    """
+    position = f.seek(0, os.SEEK_END)
+    if end is not None:
+        position = min(position, end)
+
+    # The newline terminating the last line doesn't start another line
+    if position > 0 and os.pread(f.fileno(), 1, position - 1) == b"\n":
+        position -= 1
+        if position == 0:
+            yield [b""]
+            return
+
+    carry = b""
+    while position > 0:
+        read_size = min(block_size, position)
+        position -= read_size
+        lines = (os.pread(f.fileno(), read_size, position) + carry).split(b"\n")
+        # Until the start of the file, the first piece may be a partial line
+        carry = lines.pop(0) if position > 0 else b""
+        if lines:
+            yield lines
+
+
+def decode_line(line: bytes) -> str:
+    """Decode a raw log line without its line ending."""
+    return line.rstrip(b"\r").decode("utf-8", errors="replace")
+
+
+def read_last_lines(
+    path: str,
+    count: int,
+    block_size: int = TAIL_BLOCK_SIZE,
+    end: int | None = None,
+) -> list[str]:
+    """Read the last lines of a file by seeking backwards in fixed-size blocks.
+
+    Only the blocks holding the requested lines are read, so the cost
+    doesn't depend on the file size.
+
+    Args:
+        path: File to read
+        count: Number of lines to return
+        block_size: Bytes to read per seek
+        end: Byte offset to treat as the end of the file (default: its size)
+
+    Returns:
+        Up to count lines, oldest first, without line endings
+
+    Raises:
+        OSError: If the file cannot be opened or read
+    """
+    if count <= 0:
+        return []
+
+    blocks: list[list[bytes]] = []
+    found = 0
+    with open(path, "rb") as f:
+        for lines in iter_line_blocks_reversed(f, end, block_size):
+            blocks.append(lines)
+            found += len(lines)
+            if found >= count:
+                break
 
+    raw_lines = [line for lines in reversed(blocks) for line in lines]
+    return [decode_line(line) for line in raw_lines[-count:]]
 
-async def tail_log(log_type: str, lines: int = 50) -> list[str]:
+
+def read_recent_lines(path: str, max_bytes: int) -> tuple[list[str], int]:
+    """Read the complete lines within the last max_bytes of a file.
+
+    Used to seed aggregates from a log before following it from the
+    returned offset, so no line is counted twice or missed in between.
+
+    Args:
+        path: File to read
+        max_bytes: Bytes to read from the end of the file
+
+    Returns:
+        Tuple of (lines oldest first, offset just past the last complete
+        line); ([], 0) if the file cannot be read
+    """
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            start = max(0, size - max_bytes)
+            data = os.pread(f.fileno(), size - start, start)
+    except OSError:
+        return [], 0
+
+    end = data.rfind(b"\n") + 1
+    # Skip the partial line at the start of the window
+    first = data.find(b"\n") + 1 if start > 0 else 0
+    if end <= first:
+        return [], start + end
+    return [decode_line(line) for line in data[first:end - 1].split(b"\n")], start + end
+
+
+async def tail_log(log_type: str, lines: int = 50, end: int | None = None) -> list[str]:
     """Read the last N lines from a log file.
 
     Args:
-        log_type: Type of log file (must be in LOG_PATHS)
+        log_type: Type of log file (must be in get_log_paths())
         lines: Number of lines to return (max 500)
+        end: Byte offset to read up to, e.g. a follower's position
 
     Returns:
         List of log lines (empty if file not found or permission denied)
 
     Raises:
-        ValueError: If log_type is not in LOG_PATHS
+        ValueError: If log_type is not in get_log_paths()
     """
-    if not validate_log_type(log_type):
+    log_path = get_log_paths().get(log_type)
+    if log_path is None:
         raise ValueError(f"Invalid log type: {log_type}")
 
     # Clamp lines to maximum
     lines = min(lines, MAX_LINES)
 
-    log_path = LOG_PATHS[log_type]
-
     try:
-        async with aiofiles.open(log_path, mode="r") as f:
-            # Use deque for efficient tail operation
-            content = await f.read()
-            all_lines = content.splitlines()
-            return all_lines[-lines:] if all_lines else []
+        return await asyncio.to_thread(read_last_lines, log_path, lines, end=end)
     except FileNotFoundError:
         logger.warning(f"Log file not found: {log_path}")
         return []
@@ -0,0 +1,447 @@
+"""Search and time-range queries across a log file and its rotated siblings.
+
+Files are searched newest first: the live log, then ``.1``, ``.2.gz`` and
+so on as written by logrotate. Plain files are read backwards in blocks;
+gzip files are decompressed as a stream. All file work runs in worker
+threads, and a search stops as soon as it has enough matches or has
+passed the start of the requested time window.
+
+Log lines are appended in time order, so in plain files the offset of a
+point in time is found by binary search over byte offsets, parsing the
+timestamp of the line found at each probe. Reading a time range from the
+middle of a large log costs a logarithmic number of small reads.
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import re
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterator
+from datetime import datetime
+from typing import BinaryIO
+
+from backend.server.logs import decode_line, iter_line_blocks_reversed
+
+# Maximum matches a single search may return
+MAX_SEARCH_RESULTS = 5000
+
+# Matches are handed to the event loop in batches of this size
+SEARCH_BATCH_SIZE = 100
+
+# Maximum lines a single time-range query may return
+MAX_RANGE_LINES = 10000
+
+# Bytes read per forward read, and the span below which binary search
+# switches to a linear scan
+PROBE_READ_SIZE = 64 * 1024
+
+# Bytes scanned from a probe position looking for a timestamped line
+PROBE_MAX_BYTES = 1024 * 1024
+
+# Timestamp formats found at the start of, or inside, log lines
+TIMESTAMP_PATTERNS = [
+    # nginx access log: [19/Jan/2026:10:15:30 +0000]
+    (re.compile(r"\[(\d{2}/\w{3}/\d{4}:\d{2}:\d{2}:\d{2} [+-]\d{4})\]"), "%d/%b/%Y:%H:%M:%S %z"),
+    # nginx error log: 2026/01/19 10:15:30 [error]
+    (re.compile(r"^(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2})"), "%Y/%m/%d %H:%M:%S"),
+    # PHP-FPM log: [19-Jan-2026 10:15:30] NOTICE:
+    (re.compile(r"^\[(\d{2}-\w{3}-\d{4} \d{2}:\d{2}:\d{2})"), "%d-%b-%Y %H:%M:%S"),
+    # MariaDB slow log: # Time: 260119 10:15:30 (hour may be space-padded)
+    (re.compile(r"^# Time: (\d{6})\s+(\d{1,2}:\d{2}:\d{2})"), "%y%m%d %H:%M:%S"),
+    # MySQL slow log: # Time: 2026-01-19T10:15:30.123456Z
+    (re.compile(r"^# Time: (\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(?:\.\d+)?(Z|[+-]\d{2}:\d{2})"), "%Y-%m-%dT%H:%M:%S %z"),
+    # MariaDB/MySQL error log: 2026-01-19 10:15:30 0 [Note] or 2026-01-19T10:15:30.123Z
+    (re.compile(r"^(\d{4}-\d{2}-\d{2})[ T](\d{2}:\d{2}:\d{2})"), "%Y-%m-%d %H:%M:%S"),
+]
+
+
+def parse_log_timestamp(line: str) -> float | None:
+    """
+    Parse the timestamp of a log line.
+
+    Timestamps without a UTC offset are taken as server local time, which
+    is what nginx, PHP-FPM and MariaDB write.
+
+    Args:
+        line: Decoded log line
+
+    Returns:
+        Unix timestamp, or None if the line has no recognised timestamp
+    """
+    for pattern, fmt in TIMESTAMP_PATTERNS:
+        match = pattern.search(line)
+        if match is None:
+            continue
+        try:
+            parsed = datetime.strptime(" ".join(match.groups()), fmt)
+        except ValueError:
+            continue
+        if parsed.tzinfo is None:
+            return time.mktime(parsed.timetuple())
+        return parsed.timestamp()
+    return None
+
+
+def rotated_log_files(path: str) -> list[str]:
+    """
+    List a log file and its logrotate siblings, newest first.
+
+    Args:
+        path: Path of the live log file
+
+    Returns:
+        Existing paths: the live file, then "path.1", "path.2.gz", ...
+    """
+    directory, name = os.path.split(path)
+    pattern = re.compile(re.escape(name) + r"\.(\d+)(\.gz)?$")
+
+    rotated = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                match = pattern.match(entry.name)
+                if match and entry.is_file():
+                    rotated.append((int(match.group(1)), entry.path))
+    except OSError:
+        pass
+
+    files = [path] if os.path.isfile(path) else []
+    return files + [p for _, p in sorted(rotated)]
+
+
+def _iter_lines_forward(fd: int, start: int, end: int) -> Iterator[tuple[int, bytes]]:
+    """
+    Yield (offset, raw line) for the lines from a line start up to end.
+
+    A final line without a newline is yielded as well.
+    """
+    position = start
+    line_start = start
+    carry = b""
+    while position < end:
+        chunk = os.pread(fd, min(PROBE_READ_SIZE, end - position), position)
+        if not chunk:
+            break
+        position += len(chunk)
+        lines = (carry + chunk).split(b"\n")
+        carry = lines.pop()
+        for line in lines:
+            yield line_start, line
+            line_start += len(line) + 1
+    if carry:
+        yield line_start, carry
+
+
+def _next_line_start(fd: int, position: int, size: int) -> int:
+    """Return the first line start at or after a byte position."""
+    if position <= 0:
+        return 0
+    # The byte before position tells whether a line starts exactly there
+    offset = position - 1
+    while offset < size:
+        chunk = os.pread(fd, min(PROBE_READ_SIZE, size - offset), offset)
+        index = chunk.find(b"\n")
+        if index >= 0:
+            return offset + index + 1
+        offset += len(chunk)
+    return size
+
+
+def _probe(fd: int, position: int, size: int) -> tuple[int, float] | None:
+    """
+    Find the first timestamped line starting at or after a byte position.
+
+    Returns:
+        Tuple of (offset just past that line, its timestamp), or None if
+        no timestamp was found within PROBE_MAX_BYTES
+    """
+    start = _next_line_start(fd, position, size)
+    end = min(size, start + PROBE_MAX_BYTES)
+    for line_start, raw in _iter_lines_forward(fd, start, end):
+        timestamp = parse_log_timestamp(decode_line(raw))
+        if timestamp is not None:
+            return line_start + len(raw) + 1, timestamp
+    return None
+
+
+def find_time_offset(f: BinaryIO, target: float) -> int:
+    """
+    Find the offset of the first line timestamped at or after a time.
+
+    Binary search over byte offsets, then a linear scan of the last
+    PROBE_READ_SIZE span. Lines must be roughly in time order, as they are
+    in nginx, PHP-FPM and MariaDB logs.
+
+    Args:
+        f: Log file opened in binary mode
+        target: Unix timestamp
+
+    Returns:
+        Byte offset of a line start, or the file size if every line is
+        older than target
+    """
+    fd = f.fileno()
+    size = os.fstat(fd).st_size
+
+    low, high = 0, size
+    while high - low > PROBE_READ_SIZE:
+        middle = (low + high) // 2
+        probe = _probe(fd, middle, size)
+        if probe is None or probe[1] >= target:
+            high = middle
+        else:
+            # The probed line is too old, so the answer starts after it
+            low = probe[0]
+
+    for line_start, raw in _iter_lines_forward(fd, low, size):
+        timestamp = parse_log_timestamp(decode_line(raw))
+        if timestamp is not None and timestamp >= target:
+            return line_start
+    return size
+
+
+def read_time_range(
+    path: str,
+    since: float,
+    until: float | None = None,
+    limit: int = 1000,
+) -> tuple[list[str], list[str], bool]:
+    """
+    Read the lines of a log and its rotations between two times.
+
+    Lines without a timestamp (stack traces, continuation lines) are kept
+    with the timestamped line before them.
+
+    Args:
+        path: Path of the live log file (from the log allowlist)
+        since: Start of the window as a Unix timestamp
+        until: End of the window as a Unix timestamp (default: no end)
+        limit: Maximum number of lines
+
+    Returns:
+        Tuple of (lines oldest first, names of the files they came from,
+        whether the limit cut the range short)
+    """
+    lines: list[str] = []
+    sources: list[str] = []
+
+    # Oldest file first; files last written before the window are skipped
+    for file_path in reversed(rotated_log_files(path)):
+        try:
+            if os.path.getmtime(file_path) < since:
+                continue
+            if file_path.endswith(".gz"):
+                opened = gzip.open(file_path, "rb")
+                raw_lines = (raw.rstrip(b"\n") for raw in opened)
+            else:
+                opened = open(file_path, "rb")
+                start = find_time_offset(opened, since)
+                size = os.fstat(opened.fileno()).st_size
+                raw_lines = (raw for _, raw in _iter_lines_forward(opened.fileno(), start, size))
+        except OSError:
+            continue
+
+        with opened:
+            in_window = False
+            found = False
+            for raw in raw_lines:
+                line = decode_line(raw)
+                timestamp = parse_log_timestamp(line)
+                if timestamp is not None:
+                    if until is not None and timestamp > until:
+                        # Everything after this line, and in newer files, is later
+                        if found:
+                            sources.append(os.path.basename(file_path))
+                        return lines, sources, False
+                    in_window = timestamp >= since
+                if not in_window:
+                    continue
+                if len(lines) >= limit:
+                    sources.append(os.path.basename(file_path))
+                    return lines, sources, True
+                lines.append(line)
+                found = True
+        if found:
+            sources.append(os.path.basename(file_path))
+
+    return lines, sources, False
+
+
+def build_matcher(query: str, regex: bool, ignore_case: bool) -> Callable[[str], bool]:
+    """
+    Build a line predicate for a search query.
+
+    Raises:
+        ValueError: If regex is set and the pattern is invalid
+    """
+    if regex:
+        try:
+            compiled = re.compile(query, re.IGNORECASE if ignore_case else 0)
+        except re.error as e:
+            raise ValueError(f"Invalid regular expression: {e}")
+        return lambda line: compiled.search(line) is not None
+
+    if ignore_case:
+        needle = query.casefold()
+        return lambda line: needle in line.casefold()
+    return lambda line: query in line
+
+
+class _Search:
+    """State of one search, advanced batch by batch from worker threads."""
+
+    def __init__(
+        self,
+        files: list[str],
+        matcher: Callable[[str], bool],
+        since: float | None,
+        until: float | None,
+        limit: int,
+    ) -> None:
+        self.files = files
+        self.matcher = matcher
+        self.since = since
+        self.until = until
+        self.remaining = limit
+        self.files_searched = 0
+        self.reached_window_start = False
+
+    def matches(self) -> Iterator[dict]:
+        """Yield matches newest first until the limit or window start."""
+        for path in self.files:
+            if self.remaining <= 0 or self.reached_window_start:
+                return
+            try:
+                # A file last written before the window holds nothing in it,
+                # and every older rotation is older still
+                if self.since is not None and os.path.getmtime(path) < self.since:
+                    return
+                self.files_searched += 1
+                if path.endswith(".gz"):
+                    yield from self._search_gzip(path)
+                else:
+                    yield from self._search_plain(path)
+            except OSError:
+                continue
+
+    def _check(self, line: str, name: str) -> tuple[dict | None, float | None]:
+        """Match one line, returning the result dict and its timestamp."""
+        if not self.matcher(line):
+            return None, None
+        timestamp = None
+        if self.since is not None or self.until is not None:
+            timestamp = parse_log_timestamp(line)
+            if timestamp is None:
+                return None, None
+            if self.since is not None and timestamp < self.since:
+                return None, timestamp
+            if self.until is not None and timestamp > self.until:
+                return None, timestamp
+        result = {"file": name, "line": line}
+        if timestamp is not None:
+            result["timestamp"] = int(timestamp)
+        return result, timestamp
+
+    def _search_plain(self, path: str) -> Iterator[dict]:
+        """Search a plain file backwards, block by block."""
+        name = os.path.basename(path)
+        with open(path, "rb") as f:
+            # Start the backwards scan at the end of the time window
+            end = find_time_offset(f, self.until + 1) if self.until is not None else None
+            for raw_lines in iter_line_blocks_reversed(f, end):
+                for raw in reversed(raw_lines):
+                    result, _ = self._check(decode_line(raw), name)
+                    if result is not None:
+                        yield result
+                        self.remaining -= 1
+                        if self.remaining <= 0:
+                            return
+
+                # Stop once the oldest line of this block is before the window
+                if self.since is not None:
+                    oldest = next(
+                        (t for raw in raw_lines if (t := parse_log_timestamp(decode_line(raw))) is not None),
+                        None,
+                    )
+                    if oldest is not None and oldest < self.since:
+                        self.reached_window_start = True
+                        return
+
+    def _search_gzip(self, path: str) -> Iterator[dict]:
+        """Search a gzip file, keeping only its newest matches."""
+        name = os.path.basename(path)
+        newest: deque[dict] = deque(maxlen=self.remaining)
+        with gzip.open(path, "rb") as f:
+            for raw in f:
+                line = decode_line(raw.rstrip(b"\n"))
+                result, timestamp = self._check(line, name)
+                # Lines are in time order: nothing after this is in the window
+                if timestamp is not None and self.until is not None and timestamp > self.until:
+                    break
+                if result is not None:
+                    newest.append(result)
+
+        for result in reversed(newest):
+            yield result
+            self.remaining -= 1
+
+
+async def search_log(
+    path: str,
+    matcher: Callable[[str], bool],
+    since: float | None = None,
+    until: float | None = None,
+    limit: int = 100,
+) -> AsyncIterator[str]:
+    """
+    Search a log and its rotated siblings, yielding NDJSON lines.
+
+    Each match is a {"type": "match", "file", "line", "timestamp"?} object,
+    newest first; a final {"type": "summary"} object reports the totals.
+
+    Args:
+        path: Path of the live log file (from the log allowlist)
+        matcher: Line predicate from build_matcher
+        since: Only lines at or after this Unix timestamp
+        until: Only lines at or before this Unix timestamp
+        limit: Maximum number of matches
+    """
+    files = await asyncio.to_thread(rotated_log_files, path)
+    search = _Search(files, matcher, since, until, min(limit, MAX_SEARCH_RESULTS))
+    matches = search.matches()
+
+    def next_batch() -> list[dict]:
+        batch = []
+        for result in matches:
+            batch.append(result)
+            if len(batch) >= SEARCH_BATCH_SIZE:
+                break
+        return batch
+
+    count = 0
+    started = time.monotonic()
+    try:
+        while True:
+            batch = await asyncio.to_thread(next_batch)
+            if not batch:
+                break
+            count += len(batch)
+            yield "".join(json.dumps({"type": "match", **r}) + "\n" for r in batch)
+    finally:
+        # Release open files if the client went away mid-search
+        try:
+            await asyncio.to_thread(matches.close)
+        except ValueError:
+            # Still running in a worker thread; it is closed when collected
+            pass
+
+    yield json.dumps({
+        "type": "summary",
+        "matches": count,
+        "limit_reached": search.remaining <= 0,
+        "files_searched": search.files_searched,
+        "elapsed_ms": int((time.monotonic() - started) * 1000),
+    }) + "\n"
@@ -4,6 +4,8 @@ from enum import Enum
 
 from pydantic import BaseModel
 
+from backend.wordops.models import TrafficCount
+
 
 class TimeRange(str, Enum):
     """Time range options for metric queries."""
@@ -30,6 +32,24 @@ class MetricData(BaseModel):
     points: list[MetricPoint]
 
 
+class ErrorRateSeries(BaseModel):
+    """Error counts of one source, severity and category over time."""
+
+    source: str  # "nginx" or "php-fpm"
+    severity: str  # Log level, e.g. "error", "crit", "warning"
+    category: str  # e.g. "upstream-timeout", "connect-failed", "php-fatal", "other"
+    total: int
+    points: list[MetricPoint]  # Errors logged in each bucket
+
+
+class ErrorMetrics(BaseModel):
+    """Error log counts bucketed to line up with the system metrics."""
+
+    bucket_seconds: int
+    series: list[ErrorRateSeries]  # Only series with errors in the range, largest first
+    totals: list[MetricPoint]  # All errors per bucket
+
+
 class SystemMetrics(BaseModel):
     """Complete system metrics snapshot."""
 
@@ -38,6 +58,7 @@ class SystemMetrics(BaseModel):
     disk: MetricData
     network_in: MetricData
     network_out: MetricData
+    errors: ErrorMetrics | None = None
 
 
 class ServiceStatus(BaseModel):
@@ -79,10 +100,41 @@ class LogEntry(BaseModel):
     """Log file content response."""
 
     lines: list[str]
-    log_type: LogType
+    log_type: str  # A LogType value or a per-version type like "php8.1-fpm"
     timestamp: int
 
 
+class LogRange(BaseModel):
+    """Log lines between two points in time."""
+
+    log_type: str
+    since: int  # Unix timestamp
+    until: int | None = None  # Unix timestamp, None for "until now"
+    lines: list[str]  # Oldest first
+    files: list[str] = []  # Files the lines were read from, oldest first
+    truncated: bool = False  # True if the limit was reached before until
+
+
+class LogStreamClientStats(BaseModel):
+    """Outbound buffer counters for one log WebSocket client."""
+
+    queue_depth: int  # Lines buffered and not yet sent
+    sent_lines: int = 0
+    sent_frames: int = 0
+    dropped_lines: int = 0  # Lines discarded because the buffer was full
+
+
+class LogStreamStats(BaseModel):
+    """Streaming counters for one followed log type."""
+
+    log_type: str
+    overflow_policy: str  # "drop-oldest" or "disconnect"
+    queue_limit: int  # Maximum lines buffered per client
+    clients: list[LogStreamClientStats] = []
+    dropped_lines: int = 0  # Total since the follower started, including closed clients
+    overflow_disconnects: int = 0  # Clients closed by the "disconnect" policy
+
+
 class ServerOverviewInfo(BaseModel):
     """Server overview information including OS, kernel, WordOps version, and updates."""
 
@@ -109,6 +161,177 @@ class PackageUpdateResponse(BaseModel):
     status: str  # "running", "completed", "failed"
     message: str
     updated_count: int
+    job_id: str | None = None  # ID of the background upgrade job
+
+
+class PackageUpdateJob(BaseModel):
+    """State of a background package upgrade job."""
+
+    job_id: str
+    update_type: str  # "all" or "security"
+    status: str  # "running", "completed", "failed"
+    phase: str  # "update", "upgrade", "done"
+    progress: float  # Overall progress percentage (0-100)
+    message: str
+    started_at: int  # Unix timestamp
+    finished_at: int | None = None  # Unix timestamp
+    updated_count: int
+    upgraded_packages: list[str]
+
+
+class PhpFpmPoolStatus(BaseModel):
+    """Configuration and live status of a single PHP-FPM pool."""
+
+    pool: str  # Pool name like "www" or "example.com"
+    php_version: str
+    config_file: str
+    listen: str | None = None  # Socket path or host:port
+    status_path: str | None = None  # pm.status_path, if enabled
+    max_children: int | None = None  # pm.max_children from config
+    active_processes: int | None = None
+    idle_processes: int | None = None
+    total_processes: int | None = None
+    listen_queue: int | None = None
+    max_listen_queue: int | None = None
+    max_children_reached: int | None = None
+    slow_requests: int | None = None
+    accepted_conn: int | None = None
+    error: str | None = None  # Why live status is unavailable
+
+
+class MySQLStats(BaseModel):
+    """MySQL/MariaDB global status counters with per-second rates."""
+
+    threads_connected: int | None = None
+    threads_running: int | None = None
+    questions: int | None = None
+    queries_per_second: float | None = None  # Rates are None on the first sample
+    slow_queries: int | None = None
+    slow_queries_per_second: float | None = None
+    aborted_connects: int | None = None
+    aborted_connects_per_second: float | None = None
+    aborted_clients: int | None = None
+    aborted_clients_per_second: float | None = None
+    buffer_pool_hit_rate: float | None = None  # Percentage since the last sample
+    uptime_seconds: int | None = None
+
+
+class SlowQueryFingerprint(BaseModel):
+    """Aggregates for one normalised query from the slow query log."""
+
+    id: str  # Short hash of the fingerprint
+    fingerprint: str  # Query with literals replaced by "?"
+    sample: str | None = None  # The slowest instance, truncated
+    count: int
+    total_time: float  # Seconds
+    mean_time: float
+    p95_time: float | None = None
+    max_time: float
+    lock_time: float  # Total seconds spent waiting for locks
+    rows_sent: int
+    rows_examined: int
+    databases: dict[str, int] = {}  # Database name: count
+    sites: list[str] = []  # Sites owning those databases
+    first_seen: int | None = None  # Unix timestamps
+    last_seen: int | None = None
+
+
+class SlowQueryDatabase(BaseModel):
+    """Slow query totals for one database."""
+
+    name: str
+    site: str | None = None  # Site whose wp-config.php uses this database
+    count: int
+    total_time: float
+    p95_time: float | None = None
+    rows_examined: int
+
+
+class SlowQueryDigest(BaseModel):
+    """Slow query log digest, sorted by total query time."""
+
+    log_path: str
+    available: bool  # Whether the slow log exists (slow_query_log enabled)
+    since: int | None = None  # Unix timestamp of the oldest entry counted
+    entries: int = 0  # Slow log entries counted
+    fingerprints: list[SlowQueryFingerprint] = []
+    databases: list[SlowQueryDatabase] = []
+
+
+class PhpSlowSample(BaseModel):
+    """One PHP-FPM slow log backtrace."""
+
+    timestamp: int | None = None
+    pool: str
+    site: str | None = None
+    script: str | None = None  # script_filename of the request
+    component: str  # "plugin:woocommerce", "theme:astra", "core:wordpress"
+    frames: list[str] = []  # "function() /path/file.php:line", innermost first
+
+
+class PhpSlowComponent(BaseModel):
+    """Slow requests attributed to one plugin, theme or WordPress core."""
+
+    kind: str  # "plugin", "theme", "mu-plugin", "core" or "other"
+    name: str  # Directory name under wp-content, e.g. "woocommerce"
+    count: int
+    last_seen: int | None = None
+    sites: dict[str, int] = {}  # Site: count
+    top_frames: list[TrafficCount] = []  # Frames where requests were caught
+    samples: list[PhpSlowSample] = []  # Most recent last
+
+
+class PhpSlowSite(BaseModel):
+    """Slow requests of one site."""
+
+    site: str
+    count: int
+    last_seen: int | None = None
+    scripts: list[TrafficCount] = []
+    components: dict[str, int] = {}  # "plugin:name": count
+    samples: list[PhpSlowSample] = []  # Most recent last
+
+
+class PhpSlowlogDigest(BaseModel):
+    """PHP-FPM slow log aggregates across all pools."""
+
+    sources: list[str] = []  # Slow log files followed
+    since: int | None = None  # Unix timestamp of the oldest entry counted
+    entries: int = 0
+    plugins: list[PhpSlowComponent] = []  # Slowest plugins first
+    scripts: list[TrafficCount] = []
+    sites: list[PhpSlowSite] = []
+
+
+class RedisStats(BaseModel):
+    """Redis INFO fields with per-second rates."""
+
+    version: str | None = None
+    connected_clients: int | None = None
+    used_memory: int | None = None  # Bytes
+    used_memory_peak: int | None = None  # Bytes
+    maxmemory: int | None = None  # Bytes, 0 if unlimited
+    mem_fragmentation_ratio: float | None = None
+    keyspace_hits: int | None = None
+    keyspace_misses: int | None = None
+    hit_ratio: float | None = None  # Percentage since the last sample
+    evicted_keys: int | None = None
+    evicted_keys_per_second: float | None = None
+    ops_per_second: float | None = None  # Derived from total_commands_processed
+    instantaneous_ops_per_sec: int | None = None  # As reported by Redis
+    keyspace: dict[str, int] = {}  # Key count per database, e.g. {"db0": 1234}
+    uptime_seconds: int | None = None
+
+
+class ServiceResourceSample(BaseModel):
+    """Resource usage of a service read from its cgroup."""
+
+    timestamp: int  # Unix timestamp of the sample
+    cpu_percent: float | None = None  # Percent of one CPU; exceeds 100 on multiple cores
+    memory_bytes: int | None = None
+    io_read_bytes_per_second: float | None = None
+    io_write_bytes_per_second: float | None = None
+    pids: int | None = None  # Processes and threads in the cgroup
 
 
 class StackServiceInfo(BaseModel):
@@ -125,4 +348,41 @@ class StackServiceInfo(BaseModel):
     php_fpm_connections: int | None = None  # For PHP-FPM services only
     php_fpm_max_children: int | None = None  # For PHP-FPM services only
     mysql_connections: int | None = None  # For MySQL only
+    mysql_stats: MySQLStats | None = None  # For MySQL only
     redis_connected_clients: int | None = None  # For Redis only
+    redis_stats: RedisStats | None = None  # For Redis only
+    php_fpm_pools: list[PhpFpmPoolStatus] = []  # For PHP-FPM services only
+    resources: ServiceResourceSample | None = None  # Latest cgroup sample
+    resource_history: list[ServiceResourceSample] = []  # Recent cgroup samples, oldest first
+    stale: bool = False  # True if any probe missed its deadline
+    stale_fields: list[str] = []  # Probes served from the last good result
+
+
+class BackupArtifact(BaseModel):
+    """A single indexed backup file."""
+
+    path: str
+    size: int  # Size in bytes
+    mtime: float  # Unix timestamp of last modification
+    site: str | None = None  # Owning site domain, if it could be determined
+
+
+class BackupSiteSummary(BaseModel):
+    """Backup totals for a single site."""
+
+    site: str
+    backup_count: int = 0
+    total_size: int = 0  # Size in bytes
+    last_backup: float | None = None  # Unix timestamp of newest backup
+
+
+class BackupCatalogueSummary(BaseModel):
+    """Summary of all indexed backups."""
+
+    artifact_count: int
+    total_size: int  # Size in bytes
+    last_backup_date: str | None = None  # ISO date of newest backup
+    sites: list[BackupSiteSummary]
+    stale_days: int
+    stale_sites: list[str]  # Sites with no backup within stale_days
+    last_scan: int | None = None  # Unix timestamp of last index refresh
@@ -0,0 +1,241 @@
+"""Pooled async MySQL/MariaDB connection for server-side database stats.
+
+Uses the credentials WordOps writes to ``~/.my.cnf``. A wide set of
+``SHOW GLOBAL STATUS`` counters is read in one round-trip and per-second
+rates are derived between consecutive samples.
+"""
+
+import configparser
+import logging
+import os
+import time
+
+from backend.server.models import MySQLStats
+
+try:
+    import aiomysql
+except ImportError:  # Optional dependency: fall back to the mysql client
+    aiomysql = None
+
+logger = logging.getLogger(__name__)
+
+MY_CNF_PATH = os.path.expanduser("~/.my.cnf")
+DEFAULT_SOCKET = "/run/mysqld/mysqld.sock"
+
+# Connections kept in the pool; stats polling never needs more
+POOL_MAX_SIZE = 2
+
+# Seconds allowed to connect and to run the status query
+CONNECT_TIMEOUT = 3
+QUERY_TIMEOUT = 5
+
+# Samples closer together than this don't replace the rate baseline
+MIN_RATE_INTERVAL = 1.0
+
+# Seconds before retrying pool creation after a failure, doubling per
+# consecutive failure up to the maximum
+POOL_RETRY_SECONDS = 5
+POOL_RETRY_MAX_SECONDS = 300
+
+# Counters fetched from SHOW GLOBAL STATUS
+STATUS_VARIABLES = (
+    "Threads_connected",
+    "Threads_running",
+    "Questions",
+    "Slow_queries",
+    "Aborted_connects",
+    "Aborted_clients",
+    "Innodb_buffer_pool_read_requests",
+    "Innodb_buffer_pool_reads",
+    "Uptime",
+)
+
+STATUS_QUERY = (
+    "SHOW GLOBAL STATUS WHERE Variable_name IN ("
+    + ", ".join(f"'{name}'" for name in STATUS_VARIABLES)
+    + ")"
+)
+
+
+def read_client_options(path: str = MY_CNF_PATH) -> dict[str, str] | None:
+    """
+    Read connection options from the [client] section of a my.cnf file.
+
+    Args:
+        path: Path to the option file
+
+    Returns:
+        Dict of options, or None if the file is missing or has no [client]
+    """
+    parser = configparser.ConfigParser(allow_no_value=True, strict=False, interpolation=None)
+    try:
+        if not parser.read(path):
+            return None
+    except configparser.Error as e:
+        logger.warning(f"Failed to parse {path}: {e}")
+        return None
+
+    if not parser.has_section("client"):
+        return None
+    return {key: (value or "").strip('"\'') for key, value in parser.items("client")}
+
+
+class MySQLStatsSampler:
+    """Lifespan-managed connection pool sampling global status counters."""
+
+    def __init__(self) -> None:
+        self._pool = None
+        self._previous: tuple[float, dict[str, int]] | None = None
+        self._retry_at = 0.0
+        self._retry_delay = POOL_RETRY_SECONDS
+
+    @staticmethod
+    def available() -> bool:
+        """Check whether the optional aiomysql dependency is installed."""
+        return aiomysql is not None
+
+    @property
+    def connected(self) -> bool:
+        """Whether a connection pool exists to sample through."""
+        return self._pool is not None
+
+    async def start(self) -> None:
+        """
+        Create the connection pool if credentials are available.
+
+        After a failure (no credentials, server down) further attempts are
+        skipped until a backoff delay has passed, so polling does not
+        re-read ~/.my.cnf and reconnect on every request.
+        """
+        if not self.available() or self._pool is not None:
+            return
+        if time.monotonic() < self._retry_at:
+            return
+
+        options = read_client_options()
+        if options is None:
+            logger.info(f"No [client] credentials in {MY_CNF_PATH}, MySQL stats disabled")
+            self._back_off()
+            return
+
+        kwargs = {
+            "user": options.get("user", "root"),
+            "password": options.get("password", ""),
+            "connect_timeout": CONNECT_TIMEOUT,
+            "autocommit": True,
+        }
+        if options.get("host") and options["host"] != "localhost":
+            kwargs["host"] = options["host"]
+            kwargs["port"] = int(options.get("port", 3306))
+        else:
+            kwargs["unix_socket"] = options.get("socket", DEFAULT_SOCKET)
+
+        try:
+            self._pool = await aiomysql.create_pool(minsize=0, maxsize=POOL_MAX_SIZE, **kwargs)
+        except Exception as e:
+            logger.warning(f"Failed to create MySQL connection pool: {e}")
+            self._pool = None
+            self._back_off()
+            return
+
+        self._retry_at = 0.0
+        self._retry_delay = POOL_RETRY_SECONDS
+
+    def _back_off(self) -> None:
+        """Delay the next pool creation attempt, doubling the delay each time."""
+        self._retry_at = time.monotonic() + self._retry_delay
+        self._retry_delay = min(self._retry_delay * 2, POOL_RETRY_MAX_SECONDS)
+
+    async def close(self) -> None:
+        """Close the connection pool."""
+        if self._pool is not None:
+            self._pool.close()
+            await self._pool.wait_closed()
+            self._pool = None
+
+    async def sample(self) -> MySQLStats | None:
+        """
+        Read global status counters and derive rates since the last sample.
+
+        Returns:
+            MySQLStats, or None if no pool is available (see ``connected``)
+            or the query fails
+        """
+        if self._pool is None:
+            await self.start()
+            if self._pool is None:
+                return None
+
+        try:
+            async with self._pool.acquire() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute(STATUS_QUERY)
+                    rows = await cursor.fetchall()
+        except Exception as e:
+            logger.error(f"Failed to read MySQL global status: {e}")
+            return None
+
+        counters: dict[str, int] = {}
+        for name, value in rows:
+            try:
+                counters[name] = int(value)
+            except (TypeError, ValueError):
+                continue
+
+        now = time.monotonic()
+        previous = self._previous
+        if previous is None or now - previous[0] >= MIN_RATE_INTERVAL:
+            self._previous = (now, counters)
+
+        return _build_stats(counters, previous, now)
+
+
+def _build_stats(
+    counters: dict[str, int],
+    previous: tuple[float, dict[str, int]] | None,
+    now: float,
+) -> MySQLStats:
+    """Compute totals and per-second rates from two counter samples."""
+
+    def rate(name: str) -> float | None:
+        if previous is None or name not in counters or name not in previous[1]:
+            return None
+        elapsed = now - previous[0]
+        delta = counters[name] - previous[1][name]
+        # Counters reset when the server restarts
+        if elapsed <= 0 or delta < 0:
+            return None
+        return round(delta / elapsed, 2)
+
+    def hit_rate() -> float | None:
+        requests = counters.get("Innodb_buffer_pool_read_requests")
+        reads = counters.get("Innodb_buffer_pool_reads")
+        if requests is None or reads is None:
+            return None
+        if previous is not None:
+            prev_requests = previous[1].get("Innodb_buffer_pool_read_requests", 0)
+            prev_reads = previous[1].get("Innodb_buffer_pool_reads", 0)
+            if requests - prev_requests > 0 and reads >= prev_reads:
+                requests, reads = requests - prev_requests, reads - prev_reads
+        if requests <= 0:
+            return None
+        return round(100.0 * (1 - reads / requests), 2)
+
+    return MySQLStats(
+        threads_connected=counters.get("Threads_connected"),
+        threads_running=counters.get("Threads_running"),
+        questions=counters.get("Questions"),
+        queries_per_second=rate("Questions"),
+        slow_queries=counters.get("Slow_queries"),
+        slow_queries_per_second=rate("Slow_queries"),
+        aborted_connects=counters.get("Aborted_connects"),
+        aborted_connects_per_second=rate("Aborted_connects"),
+        aborted_clients=counters.get("Aborted_clients"),
+        aborted_clients_per_second=rate("Aborted_clients"),
+        buffer_pool_hit_rate=hit_rate(),
+        uptime_seconds=counters.get("Uptime"),
+    )
+
+
+# Singleton instance for use across the server module
+mysql_stats = MySQLStatsSampler()
@@ -0,0 +1,406 @@
+"""Package upgrade job runner with streamed apt output.
+
+Only one upgrade job may run at a time. Each job runs ``apt-get update`` followed
+by ``apt-get upgrade`` and keeps a bounded history of output lines so that
+WebSocket clients connecting mid-run can catch up before following live output.
+"""
+
+import asyncio
+import glob
+import logging
+import os
+import re
+import shutil
+import signal
+import tempfile
+import time
+import uuid
+from collections import deque
+
+from backend.server.models import PackageUpdateJob
+
+logger = logging.getLogger(__name__)
+
+# Timeouts per apt step
+APT_UPDATE_TIMEOUT = 300  # seconds for apt-get update
+APT_UPGRADE_TIMEOUT = 1800  # seconds for apt-get upgrade
+
+# Number of output lines kept per job for late subscribers
+JOB_HISTORY_LINES = 2000
+
+# Events a subscriber may fall behind by (on top of the replayed history)
+# before it is dropped
+SUBSCRIBER_QUEUE_SIZE = JOB_HISTORY_LINES + 500
+
+# Seconds apt-get gets to exit after SIGTERM before its process group is killed
+TERMINATE_GRACE_SECONDS = 10
+
+# Share of the overall progress bar given to the apt-get update step
+UPDATE_PHASE_WEIGHT = 10.0
+
+# Options applied to every apt-get call: machine-readable progress on stdout,
+# no interactive prompts and keep existing config files on conflicts
+APT_OPTIONS = [
+    "-o", "APT::Status-Fd=1",
+    "-o", "Dpkg::Use-Pty=0",
+    "-o", "Dpkg::Options::=--force-confdef",
+    "-o", "Dpkg::Options::=--force-confold",
+]
+
+APT_SOURCES_LIST = "/etc/apt/sources.list"
+APT_SOURCES_PARTS = "/etc/apt/sources.list.d"
+
+# "pmstatus:libssl3:42.8571:Installing libssl3 (amd64)"
+PMSTATUS_PATTERN = re.compile(r"^pmstatus:([^:]*):([\d.]+):(.*)$")
+# "dlstatus:3:27.5:Retrieving file 3 of 12"
+DLSTATUS_PATTERN = re.compile(r"^dlstatus:([^:]*):([\d.]+):(.*)$")
+# "Unpacking libssl3:amd64 (3.0.2-0ubuntu1.15) over (3.0.2-0ubuntu1.14) ..."
+UNPACK_OVER_PATTERN = re.compile(r"^Unpacking (\S+?)(?::\S+)? \(([^)]+)\) over \(([^)]+)\)")
+# "3 upgraded, 0 newly installed, 0 to remove and 2 not upgraded."
+SUMMARY_PATTERN = re.compile(r"^(\d+) upgraded, (\d+) newly installed")
+
+
+class UpgradeInProgressError(RuntimeError):
+    """Raised when an upgrade is requested while another one is running."""
+
+
+class UpgradeJob:
+    """State and output history of a single package upgrade run."""
+
+    def __init__(self, update_type: str) -> None:
+        self.job_id = uuid.uuid4().hex
+        self.update_type = update_type
+        self.status = "running"
+        self.phase = "update"
+        self.progress = 0.0
+        self.message = "Refreshing package lists"
+        self.started_at = int(time.time())
+        self.finished_at: int | None = None
+        self.upgraded_packages: list[str] = []
+        self.summary_count: int | None = None
+        self.history: deque[dict] = deque(maxlen=JOB_HISTORY_LINES)
+        self.subscribers: set[asyncio.Queue] = set()
+
+    @property
+    def updated_count(self) -> int:
+        """Number of upgraded packages, falling back to apt's summary line."""
+        if self.upgraded_packages:
+            return len(self.upgraded_packages)
+        return self.summary_count or 0
+
+    def to_model(self) -> PackageUpdateJob:
+        """Convert the job state to its API model."""
+        return PackageUpdateJob(
+            job_id=self.job_id,
+            update_type=self.update_type,
+            status=self.status,
+            phase=self.phase,
+            progress=round(self.progress, 1),
+            message=self.message,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            updated_count=self.updated_count,
+            upgraded_packages=list(self.upgraded_packages),
+        )
+
+    def publish(self, event: dict) -> None:
+        """Record an event and fan it out to every subscriber."""
+        self.history.append(event)
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self.drop_subscriber(queue)
+
+    def drop_subscriber(self, queue: asyncio.Queue) -> None:
+        """Stop delivering to a subscriber that fell too far behind.
+
+        Its backlog is discarded and replaced by a "dropped" event and the
+        end marker; the client can reconnect to replay the history.
+        """
+        self.subscribers.discard(queue)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait({"type": "dropped", "job_id": self.job_id})
+        queue.put_nowait(None)
+
+    def close_subscribers(self) -> None:
+        """Signal the end of the job to every subscriber."""
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(None)
+            except asyncio.QueueFull:
+                self.drop_subscriber(queue)
+
+
+class PackageUpgradeRunner:
+    """Runs package upgrades as tracked background jobs, one at a time."""
+
+    def __init__(self) -> None:
+        self.current: UpgradeJob | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(self, update_type: str) -> UpgradeJob:
+        """Start a new upgrade job in the background.
+
+        Args:
+            update_type: "all" for every upgrade or "security" for security-only
+
+        Returns:
+            The newly started job
+
+        Raises:
+            ValueError: If update_type is not recognised
+            UpgradeInProgressError: If another job is still running
+        """
+        if update_type not in ("all", "security"):
+            raise ValueError(f"Invalid update type: {update_type}")
+
+        if self.current is not None and self.current.status == "running":
+            raise UpgradeInProgressError(
+                f"Package upgrade {self.current.job_id} is already running"
+            )
+
+        job = UpgradeJob(update_type)
+        self.current = job
+        self._task = asyncio.create_task(self._run(job))
+        return job
+
+    def get_job(self, job_id: str) -> UpgradeJob | None:
+        """Return the current or most recent job if its ID matches."""
+        if self.current is not None and self.current.job_id == job_id:
+            return self.current
+        return None
+
+    def subscribe(self, job: UpgradeJob) -> asyncio.Queue:
+        """Subscribe to a job's events, starting with its recorded history.
+
+        The queue yields event dicts and a final ``None`` once the job ends.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        for event in job.history:
+            queue.put_nowait(event)
+        if job.status == "running":
+            job.subscribers.add(queue)
+        else:
+            queue.put_nowait(None)
+        return queue
+
+    def unsubscribe(self, job: UpgradeJob, queue: asyncio.Queue) -> None:
+        """Stop delivering a job's events to a queue."""
+        job.subscribers.discard(queue)
+
+    async def _run(self, job: UpgradeJob) -> None:
+        """Run both apt steps for a job and record the outcome."""
+        sources_dir = None
+        try:
+            await self._run_step(job, ["update"], APT_UPDATE_TIMEOUT)
+
+            upgrade_args = ["-y", "upgrade"]
+            if job.update_type == "security":
+                sources_dir = tempfile.mkdtemp(prefix="wo-dashboard-apt-")
+                if _write_security_sources(sources_dir) == 0:
+                    raise RuntimeError("No security package sources found")
+                upgrade_args = [
+                    "-o", "Dir::Etc::SourceList=/dev/null",
+                    "-o", f"Dir::Etc::SourceParts={sources_dir}",
+                ] + upgrade_args
+
+            job.phase = "upgrade"
+            job.progress = UPDATE_PHASE_WEIGHT
+            job.message = "Upgrading packages"
+            self._publish_status(job)
+            await self._run_step(job, upgrade_args, APT_UPGRADE_TIMEOUT)
+
+            job.status = "completed"
+            job.progress = 100.0
+            job.message = f"{job.updated_count} package(s) upgraded"
+        except asyncio.TimeoutError:
+            job.status = "failed"
+            job.message = f"apt-get {job.phase} timed out"
+        except Exception as e:
+            logger.error(f"Package upgrade {job.job_id} failed: {e}")
+            job.status = "failed"
+            job.message = str(e)
+        finally:
+            if sources_dir is not None:
+                shutil.rmtree(sources_dir, ignore_errors=True)
+            job.phase = "done"
+            job.finished_at = int(time.time())
+            self._publish_status(job)
+            job.close_subscribers()
+
+    async def _run_step(self, job: UpgradeJob, args: list[str], timeout: int) -> None:
+        """Run one apt-get invocation, streaming its output into the job.
+
+        Raises:
+            RuntimeError: If apt-get exits with a non-zero status
+            asyncio.TimeoutError: If the step exceeds its timeout
+        """
+        cmd = ["sudo", "apt-get", *APT_OPTIONS, *args]
+        env = {**os.environ, "DEBIAN_FRONTEND": "noninteractive", "LC_ALL": "C"}
+
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            stdin=asyncio.subprocess.DEVNULL,
+            env=env,
+            limit=1024 * 1024,
+            # Own process group, so apt-get and dpkg can be signalled with sudo
+            start_new_session=True,
+        )
+
+        try:
+            await asyncio.wait_for(self._consume_output(job, process), timeout=timeout)
+        finally:
+            # Timed out or cancelled: don't leave apt/dpkg holding the lock
+            if process.returncode is None:
+                await _terminate_process_group(process)
+
+        if process.returncode != 0:
+            raise RuntimeError(
+                f"apt-get {job.phase} failed with exit code {process.returncode}"
+            )
+
+    async def _consume_output(self, job: UpgradeJob, process: asyncio.subprocess.Process) -> None:
+        """Parse apt output line by line until the process exits."""
+        assert process.stdout is not None
+        while True:
+            raw = await process.stdout.readline()
+            if not raw:
+                break
+            line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+            if line:
+                self._handle_line(job, line)
+        await process.wait()
+
+    def _handle_line(self, job: UpgradeJob, line: str) -> None:
+        """Update job state from a single line of apt output."""
+        match = PMSTATUS_PATTERN.match(line)
+        if match:
+            package, percent, description = match.groups()
+            job.progress = UPDATE_PHASE_WEIGHT + float(percent) * (100.0 - UPDATE_PHASE_WEIGHT) / 100.0
+            job.message = description
+            job.publish({
+                "type": "progress",
+                "phase": job.phase,
+                "package": package,
+                "percent": round(job.progress, 1),
+                "message": description,
+            })
+            return
+
+        match = DLSTATUS_PATTERN.match(line)
+        if match:
+            _, percent, description = match.groups()
+            if job.phase == "update":
+                job.progress = float(percent) * UPDATE_PHASE_WEIGHT / 100.0
+            job.message = description
+            job.publish({
+                "type": "progress",
+                "phase": job.phase,
+                "package": None,
+                "percent": round(job.progress, 1),
+                "message": description,
+            })
+            return
+
+        match = UNPACK_OVER_PATTERN.match(line)
+        if match and match.group(1) not in job.upgraded_packages:
+            job.upgraded_packages.append(match.group(1))
+
+        match = SUMMARY_PATTERN.match(line)
+        if match and job.phase == "upgrade":
+            job.summary_count = int(match.group(1))
+
+        job.publish({"type": "line", "phase": job.phase, "line": line})
+
+    def _publish_status(self, job: UpgradeJob) -> None:
+        """Publish the job's current state as a status event."""
+        job.publish({"type": "status", "job": job.to_model().model_dump()})
+
+
+async def _terminate_process_group(process: asyncio.subprocess.Process) -> None:
+    """Stop a step's whole process group: SIGTERM, then SIGKILL after a grace period.
+
+    sudo relays SIGTERM to apt-get; root-owned members that can't be
+    signalled directly are skipped.
+    """
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        try:
+            os.killpg(process.pid, sig)
+        except (ProcessLookupError, PermissionError):
+            pass
+        try:
+            await asyncio.wait_for(process.wait(), timeout=TERMINATE_GRACE_SECONDS)
+            return
+        except asyncio.TimeoutError:
+            continue
+
+
+def _write_security_sources(target_dir: str) -> int:
+    """Write the security-only subset of the APT sources into a directory.
+
+    Handles both one-line ``.list`` entries and deb822 ``.sources`` stanzas.
+
+    Args:
+        target_dir: Directory to receive ``security.list`` and ``security.sources``
+
+    Returns:
+        Number of security source entries written
+    """
+    list_entries: list[str] = []
+    stanzas: list[str] = []
+
+    list_files = [APT_SOURCES_LIST] + sorted(glob.glob(os.path.join(APT_SOURCES_PARTS, "*.list")))
+    for path in list_files:
+        try:
+            with open(path, "r") as f:
+                for line in f:
+                    entry = line.strip()
+                    if entry.startswith("deb") and "security" in entry:
+                        list_entries.append(entry)
+        except OSError:
+            continue
+
+    for path in sorted(glob.glob(os.path.join(APT_SOURCES_PARTS, "*.sources"))):
+        try:
+            with open(path, "r") as f:
+                content = f.read()
+        except OSError:
+            continue
+        for stanza in re.split(r"\n\s*\n", content):
+            stanza = _filter_security_stanza(stanza)
+            if stanza:
+                stanzas.append(stanza)
+
+    if list_entries:
+        with open(os.path.join(target_dir, "security.list"), "w") as f:
+            f.write("\n".join(list_entries) + "\n")
+    if stanzas:
+        with open(os.path.join(target_dir, "security.sources"), "w") as f:
+            f.write("\n\n".join(stanzas) + "\n")
+
+    return len(list_entries) + len(stanzas)
+
+
+def _filter_security_stanza(stanza: str) -> str | None:
+    """Reduce a deb822 stanza to its security suites.
+
+    Returns:
+        The stanza with only security suites listed, or None if it has none
+    """
+    lines = stanza.strip().splitlines()
+    for i, line in enumerate(lines):
+        if line.lower().startswith("suites:"):
+            suites = [s for s in line.split(":", 1)[1].split() if "security" in s]
+            if not suites:
+                return None
+            lines[i] = "Suites: " + " ".join(suites)
+            return "\n".join(lines)
+    return None
+
+
+# Singleton instance for use across routes
+upgrade_runner = PackageUpgradeRunner()
@@ -0,0 +1,187 @@
+"""PHP-FPM pool discovery and per-pool status via FastCGI.
+
+Pools are read from every ``/etc/php/{version}/fpm/pool.d/*.conf`` file,
+including WordOps' per-site pools. Each pool's ``pm.status_path`` is
+queried directly over its listen socket with pooled FastCGI connections.
+"""
+
+import asyncio
+import glob
+import json
+import logging
+import os
+import re
+
+from backend.server.fastcgi import FastCGIConnectionPool, FastCGIError, split_response
+from backend.server.models import PhpFpmPoolStatus
+
+logger = logging.getLogger(__name__)
+
+PHP_ETC_DIR = "/etc/php"
+
+# Matches "8.2" style version directories under /etc/php
+PHP_VERSION_PATTERN = re.compile(r"^\d+\.\d+$")
+
+# Cached pool definitions keyed by config path: (mtime_ns, pools)
+_pool_config_cache: dict[str, tuple[int, list[dict[str, str]]]] = {}
+
+# FastCGI connection pools keyed by listen address
+_connection_pools: dict[str, FastCGIConnectionPool] = {}
+
+
+def parse_pool_config(path: str) -> list[dict[str, str]]:
+    """
+    Parse a PHP-FPM pool config file into one dict per pool section.
+
+    ``$pool`` in values is replaced with the section name, as PHP-FPM does.
+    Parsed files are cached until their mtime changes.
+
+    Args:
+        path: Path to a pool .conf file
+
+    Returns:
+        List of dicts with directive values plus "pool" and "config_file" keys
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return []
+
+    cached = _pool_config_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    pools: list[dict[str, str]] = []
+    current: dict[str, str] | None = None
+    try:
+        with open(path, "r", errors="replace") as f:
+            for raw in f:
+                line = raw.strip()
+                if not line or line.startswith((";", "#")):
+                    continue
+                if line.startswith("[") and line.endswith("]"):
+                    name = line[1:-1].strip()
+                    current = {"pool": name, "config_file": path}
+                    if name.lower() != "global":
+                        pools.append(current)
+                    continue
+                if current is None or "=" not in line:
+                    continue
+                key, value = line.split("=", 1)
+                value = value.split(";", 1)[0].strip().strip('"\'')
+                current[key.strip()] = value.replace("$pool", current["pool"])
+    except OSError as e:
+        logger.warning(f"Failed to read PHP-FPM pool config {path}: {e}")
+        return []
+
+    _pool_config_cache[path] = (mtime, pools)
+    return pools
+
+
+def list_pool_configs(php_version: str) -> list[dict[str, str]]:
+    """
+    List every pool defined for a PHP version.
+
+    Args:
+        php_version: PHP version like "8.2"
+
+    Returns:
+        Pool definitions from all files in pool.d, sorted by pool name
+    """
+    if not PHP_VERSION_PATTERN.match(php_version):
+        return []
+
+    pools = []
+    for path in sorted(glob.glob(os.path.join(PHP_ETC_DIR, php_version, "fpm", "pool.d", "*.conf"))):
+        pools.extend(parse_pool_config(path))
+    return sorted(pools, key=lambda p: p["pool"])
+
+
+def _int_or_none(value: str | None) -> int | None:
+    """Parse an integer directive value."""
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+async def query_pool_status(pool: dict[str, str], php_version: str) -> PhpFpmPoolStatus:
+    """
+    Query a pool's status page over FastCGI.
+
+    Args:
+        pool: Pool definition from parse_pool_config
+        php_version: PHP version the pool belongs to
+
+    Returns:
+        PhpFpmPoolStatus; runtime fields are None and error is set when the
+        pool has no status path or cannot be reached
+    """
+    listen = pool.get("listen")
+    status_path = pool.get("pm.status_path")
+    result = PhpFpmPoolStatus(
+        pool=pool["pool"],
+        php_version=php_version,
+        config_file=pool["config_file"],
+        listen=listen,
+        status_path=status_path,
+        max_children=_int_or_none(pool.get("pm.max_children")),
+    )
+
+    if not listen:
+        result.error = "Pool has no listen address"
+        return result
+    if not status_path:
+        result.error = "pm.status_path is not enabled for this pool"
+        return result
+
+    connection_pool = _connection_pools.get(listen)
+    if connection_pool is None:
+        connection_pool = _connection_pools[listen] = FastCGIConnectionPool(listen)
+
+    try:
+        stdout, _ = await connection_pool.request({
+            "GATEWAY_INTERFACE": "FastCGI/1.0",
+            "REQUEST_METHOD": "GET",
+            "SCRIPT_NAME": status_path,
+            "SCRIPT_FILENAME": status_path,
+            "REQUEST_URI": f"{status_path}?json",
+            "QUERY_STRING": "json",
+            "SERVER_SOFTWARE": "wo-dashboard",
+        })
+        _, body = split_response(stdout)
+        data = json.loads(body)
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, FastCGIError, ValueError) as e:
+        result.error = f"Status query failed: {e}"
+        return result
+
+    result.active_processes = data.get("active processes")
+    result.idle_processes = data.get("idle processes")
+    result.total_processes = data.get("total processes")
+    result.listen_queue = data.get("listen queue")
+    result.max_listen_queue = data.get("max listen queue")
+    result.max_children_reached = data.get("max children reached")
+    result.slow_requests = data.get("slow requests")
+    result.accepted_conn = data.get("accepted conn")
+    return result
+
+
+async def get_pool_statuses(php_version: str) -> list[PhpFpmPoolStatus]:
+    """
+    Query the status of every pool of a PHP version concurrently.
+
+    Args:
+        php_version: PHP version like "8.2"
+
+    Returns:
+        List of PhpFpmPoolStatus, one per configured pool
+    """
+    pools = list_pool_configs(php_version)
+    return list(await asyncio.gather(*(query_pool_status(p, php_version) for p in pools)))
+
+
+def close_connection_pools() -> None:
+    """Close all pooled FastCGI connections."""
+    for connection_pool in _connection_pools.values():
+        connection_pool.close()
+    _connection_pools.clear()
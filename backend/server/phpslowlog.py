@@ -0,0 +1,377 @@
+"""PHP-FPM slow log aggregation by script, site and plugin.
+
+Every pool with a ``slowlog`` directive, across all discovered PHP
+versions, has its slow log followed. Each entry is a backtrace written
+when a request ran longer than ``request_slowlog_timeout``::
+
+    [19-Jan-2026 10:15:30]  [pool example.com] pid 12345
+    script_filename = /var/www/example.com/htdocs/index.php
+    [0x00007f3c1e0150a0] curl_exec() /var/www/example.com/htdocs/wp-content/plugins/foo/http.php:120
+    [0x00007f3c1e014f10] request() /var/www/example.com/htdocs/wp-content/plugins/foo/foo.php:55
+
+Entries are attributed to the innermost frame inside a plugin or theme,
+so time spent in WordPress core on a plugin's behalf is charged to that
+plugin. Counts and recent samples are kept per plugin, script and site.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import time
+from collections import deque
+from datetime import datetime
+
+from backend.server.discovery import service_discovery
+from backend.server.follower import LogFollower
+from backend.server.logs import read_recent_lines
+from backend.server.models import (
+    PhpSlowComponent,
+    PhpSlowlogDigest,
+    PhpSlowSample,
+    PhpSlowSite,
+)
+from backend.server.phpfpm import list_pool_configs
+from backend.server.traffic import SpaceSaving
+from backend.wordops.models import TrafficCount
+from backend.wordops.sites import validate_domain
+
+logger = logging.getLogger(__name__)
+
+# "[19-Jan-2026 10:15:30]  [pool www] pid 12345"
+ENTRY_HEADER_PATTERN = re.compile(r"^\[(\d{2}-\w{3}-\d{4} \d{2}:\d{2}:\d{2})\]\s+\[pool ([^\]]+)\] pid (\d+)")
+
+# "[0x00007f3c1e0150a0] curl_exec() /path/to/file.php:120"
+FRAME_PATTERN = re.compile(r"^\[0x[0-9a-f]+\] (.+?) (\S+):(\d+)$")
+
+# Plugin, theme and must-use plugin directories in a frame's file path
+COMPONENT_PATTERN = re.compile(r"/wp-content/(plugins|themes|mu-plugins)/([^/]+)")
+
+# WordPress core directories
+CORE_PATTERN = re.compile(r"/wp-(?:includes|admin)/")
+
+# Site domain from a script or frame path under the WordOps web root
+SITE_PATH_PATTERN = re.compile(r"^/var/www/([^/]+)/")
+
+COMPONENT_KINDS = {"plugins": "plugin", "themes": "theme", "mu-plugins": "mu-plugin"}
+
+# Frames kept per sample
+SAMPLE_FRAMES = 20
+
+# Recent samples kept per component and per site
+RECENT_SAMPLES = 5
+
+# Seconds between checks for added or removed pools
+POOL_REFRESH_INTERVAL = 60
+
+# Bytes of existing slow log parsed per file on startup
+BACKFILL_BYTES = 4 * 1024 * 1024
+
+
+def classify_frames(frames: list[tuple[str, str, int]]) -> tuple[str, str, tuple[str, str, int] | None]:
+    """
+    Attribute a backtrace to a plugin, theme or WordPress core.
+
+    Args:
+        frames: (function, file, line) tuples, innermost first
+
+    Returns:
+        Tuple of (kind, name, attributing frame); kind is "plugin",
+        "theme", "mu-plugin", "core" or "other"
+    """
+    for frame in frames:
+        match = COMPONENT_PATTERN.search(frame[1])
+        if match is not None:
+            name = match.group(2)
+            if name.endswith(".php"):
+                name = name[:-4]
+            return COMPONENT_KINDS[match.group(1)], name, frame
+    for frame in frames:
+        if CORE_PATTERN.search(frame[1]):
+            return "core", "wordpress", frame
+    return "other", "other", frames[0] if frames else None
+
+
+def site_from_path(path: str | None) -> str | None:
+    """Return the site domain a path under /var/www belongs to."""
+    if not path:
+        return None
+    match = SITE_PATH_PATTERN.match(path)
+    if match is None or not validate_domain(match.group(1)):
+        return None
+    return match.group(1)
+
+
+class PhpSlowlogParser:
+    """Incremental parser for PHP-FPM slow log entries.
+
+    An entry is complete at the blank line that follows it, or when the
+    next entry's header arrives.
+    """
+
+    def __init__(self) -> None:
+        self._entry: dict | None = None
+
+    def feed(self, lines: list[str]) -> list[dict]:
+        """
+        Parse lines and return the entries they complete.
+
+        Returns:
+            List of dicts with "timestamp", "pool", "pid", "script" and
+            "frames" ((function, file, line) tuples, innermost first)
+        """
+        entries = []
+        for line in lines:
+            match = ENTRY_HEADER_PATTERN.match(line)
+            if match is not None:
+                if self._entry is not None:
+                    entries.append(self._entry)
+                self._entry = {
+                    "timestamp": _parse_time(match.group(1)),
+                    "pool": match.group(2),
+                    "pid": int(match.group(3)),
+                    "script": None,
+                    "frames": [],
+                }
+                continue
+
+            entry = self._entry
+            if entry is None:
+                continue
+            if not line.strip():
+                entries.append(entry)
+                self._entry = None
+            elif line.startswith("script_filename = "):
+                entry["script"] = line[len("script_filename = "):].strip()
+            else:
+                frame = FRAME_PATTERN.match(line)
+                if frame is not None:
+                    entry["frames"].append((frame.group(1), frame.group(2), int(frame.group(3))))
+        return entries
+
+
+def _parse_time(value: str) -> int | None:
+    """Parse a slow log header time, written in server local time."""
+    try:
+        return int(time.mktime(datetime.strptime(value, "%d-%b-%Y %H:%M:%S").timetuple()))
+    except ValueError:
+        return None
+
+
+def _backfill(parser: PhpSlowlogParser, path: str) -> tuple[list[dict], int]:
+    """
+    Parse the last BACKFILL_BYTES of a slow log.
+
+    Returns:
+        Tuple of (completed entries, offset where following should continue)
+    """
+    lines, offset = read_recent_lines(path, BACKFILL_BYTES)
+    return parser.feed(lines), offset
+
+
+def _sample(entry: dict, site: str | None, kind: str, name: str) -> PhpSlowSample:
+    """Build a sample from a parsed entry."""
+    return PhpSlowSample(
+        timestamp=entry["timestamp"],
+        pool=entry["pool"],
+        site=site,
+        script=entry["script"],
+        component=f"{kind}:{name}",
+        frames=[f"{function} {path}:{line}" for function, path, line in entry["frames"][:SAMPLE_FRAMES]],
+    )
+
+
+class _ComponentStats:
+    """Counts for one plugin, theme or core."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.last_seen: int | None = None
+        self.sites: dict[str, int] = {}
+        self.frames = SpaceSaving()
+        self.samples: deque[PhpSlowSample] = deque(maxlen=RECENT_SAMPLES)
+
+
+class _SiteStats:
+    """Counts for one site."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.last_seen: int | None = None
+        self.scripts = SpaceSaving()
+        self.components: dict[str, int] = {}
+        self.samples: deque[PhpSlowSample] = deque(maxlen=RECENT_SAMPLES)
+
+
+class PhpSlowlogTracker:
+    """Follows every pool's slow log and keeps the aggregates current."""
+
+    def __init__(self) -> None:
+        self._followers: dict[str, LogFollower] = {}
+        self._parsers: dict[str, PhpSlowlogParser] = {}
+        self._components: dict[tuple[str, str], _ComponentStats] = {}
+        self._sites: dict[str, _SiteStats] = {}
+        self._scripts = SpaceSaving()
+        self._entries = 0
+        self._since: int | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start following slow logs in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the refresh loop and every follower."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        for follower in self._followers.values():
+            await follower.stop()
+        self._followers.clear()
+
+    async def _run(self) -> None:
+        """Track slow logs as pools are added and removed."""
+        while True:
+            try:
+                await self._sync_pools()
+            except Exception as e:
+                logger.error(f"PHP-FPM slow log tracking failed: {e}")
+            await asyncio.sleep(POOL_REFRESH_INTERVAL)
+
+    @staticmethod
+    def slowlog_paths() -> set[str]:
+        """Collect the slowlog paths of every pool of every PHP version."""
+        paths = set()
+        for version in service_discovery.php_versions():
+            for pool in list_pool_configs(version):
+                path = pool.get("slowlog")
+                if path and os.path.isabs(path):
+                    paths.add(path)
+        return paths
+
+    async def _sync_pools(self) -> None:
+        """Follow new slow logs and stop following removed ones."""
+        paths = await asyncio.to_thread(self.slowlog_paths)
+
+        for path in set(self._followers) - paths:
+            await self._followers.pop(path).stop()
+            self._parsers.pop(path, None)
+
+        for path in paths - set(self._followers):
+            # Pools often share one slow log; each file is followed once
+            parser = self._parsers[path] = PhpSlowlogParser()
+            entries, offset = await asyncio.to_thread(_backfill, parser, path)
+            self.add_entries(entries)
+            follower = LogFollower(path, lambda lines, parser=parser: self.add_entries(parser.feed(lines)))
+            await follower.start(offset=offset)
+            self._followers[path] = follower
+
+    def add_entries(self, entries: list[dict]) -> None:
+        """Fold parsed slow log entries into the aggregates."""
+        for entry in entries:
+            frames = entry["frames"]
+            kind, name, frame = classify_frames(frames)
+            site = site_from_path(entry["script"]) or (site_from_path(frames[0][1]) if frames else None)
+            timestamp = entry["timestamp"]
+            sample = _sample(entry, site, kind, name)
+
+            component = self._components.get((kind, name))
+            if component is None:
+                component = self._components[(kind, name)] = _ComponentStats()
+            component.count += 1
+            component.last_seen = timestamp
+            if site is not None:
+                component.sites[site] = component.sites.get(site, 0) + 1
+            if frame is not None:
+                component.frames.add(f"{frame[0]} {frame[1]}:{frame[2]}")
+            component.samples.append(sample)
+
+            if site is not None:
+                stats = self._sites.get(site)
+                if stats is None:
+                    stats = self._sites[site] = _SiteStats()
+                stats.count += 1
+                stats.last_seen = timestamp
+                if entry["script"]:
+                    stats.scripts.add(entry["script"])
+                key = f"{kind}:{name}"
+                stats.components[key] = stats.components.get(key, 0) + 1
+                stats.samples.append(sample)
+
+            if entry["script"]:
+                self._scripts.add(entry["script"])
+            self._entries += 1
+            if self._since is None:
+                self._since = timestamp
+
+    def plugins(self, site: str | None = None, limit: int = 20) -> list[PhpSlowComponent]:
+        """
+        List plugins, themes and core by slow request count, highest first.
+
+        Args:
+            site: Only count slow requests of this site
+            limit: Maximum entries
+        """
+        components = []
+        for (kind, name), stats in self._components.items():
+            count = stats.count if site is None else stats.sites.get(site, 0)
+            if count == 0:
+                continue
+            components.append(PhpSlowComponent(
+                kind=kind,
+                name=name,
+                count=count,
+                last_seen=stats.last_seen,
+                sites=dict(sorted(stats.sites.items(), key=lambda item: -item[1])),
+                top_frames=stats.frames.top(5),
+                samples=[s for s in stats.samples if site is None or s.site == site],
+            ))
+        components.sort(key=lambda c: c.count, reverse=True)
+        return components[:limit]
+
+    def digest(self, site: str | None = None, limit: int = 20) -> PhpSlowlogDigest:
+        """
+        Build the slow log digest.
+
+        Args:
+            site: Only include this site
+            limit: Maximum entries per list
+        """
+        sites = [
+            PhpSlowSite(
+                site=name,
+                count=stats.count,
+                last_seen=stats.last_seen,
+                scripts=stats.scripts.top(limit),
+                components=dict(sorted(stats.components.items(), key=lambda item: -item[1])[:limit]),
+                samples=list(stats.samples),
+            )
+            for name, stats in self._sites.items()
+            if site is None or name == site
+        ]
+        sites.sort(key=lambda s: s.count, reverse=True)
+
+        scripts: list[TrafficCount]
+        if site is None:
+            scripts = self._scripts.top(limit)
+        else:
+            scripts = sites[0].scripts if sites else []
+
+        return PhpSlowlogDigest(
+            sources=sorted(self._followers),
+            since=self._since,
+            entries=self._entries if site is None else sum(s.count for s in sites),
+            plugins=self.plugins(site, limit),
+            scripts=scripts,
+            sites=sites[:limit],
+        )
+
+
+# Singleton instance for use across routes
+php_slowlog = PhpSlowlogTracker()
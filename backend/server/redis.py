@@ -0,0 +1,297 @@
+"""Native async RESP client for Redis stats.
+
+Keeps one persistent connection, authenticated with the ``requirepass``
+read once from ``redis.conf``, instead of forking ``redis-cli`` with the
+password on its command line. The full ``INFO`` output is fetched in a
+single call and rates are derived between consecutive samples.
+"""
+
+import asyncio
+import logging
+import time
+
+from backend.server.models import RedisStats
+
+logger = logging.getLogger(__name__)
+
+REDIS_CONF_PATH = "/etc/redis/redis.conf"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 6379
+
+# Seconds allowed to connect and for a single command round-trip
+CONNECT_TIMEOUT = 2.0
+COMMAND_TIMEOUT = 5.0
+
+# Samples closer together than this don't replace the rate baseline
+MIN_RATE_INTERVAL = 1.0
+
+
+class RedisError(RuntimeError):
+    """Raised for Redis error replies and protocol failures."""
+
+
+def read_redis_config(path: str = REDIS_CONF_PATH) -> dict[str, str]:
+    """
+    Read connection settings from redis.conf.
+
+    Args:
+        path: Path to redis.conf
+
+    Returns:
+        Dict with any of "requirepass", "port", "bind" and "unixsocket"
+    """
+    config: dict[str, str] = {}
+    try:
+        with open(path, "r") as f:
+            for line in f:
+                parts = line.strip().split(None, 1)
+                if len(parts) == 2 and parts[0] in ("requirepass", "port", "bind", "unixsocket"):
+                    config[parts[0]] = parts[1].strip().strip('"\'')
+    except OSError:
+        pass
+    return config
+
+
+def _encode_command(args: tuple) -> bytes:
+    """Encode a command as a RESP array of bulk strings."""
+    out = bytearray(b"*%d\r\n" % len(args))
+    for arg in args:
+        if not isinstance(arg, bytes):
+            arg = str(arg).encode("utf-8")
+        out += b"$%d\r\n%s\r\n" % (len(arg), arg)
+    return bytes(out)
+
+
+async def _read_reply(reader: asyncio.StreamReader):
+    """Read one RESP reply from the stream."""
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Redis closed the connection")
+    prefix, payload = line[:1], line[1:-2]
+
+    if prefix == b"+":
+        return payload.decode("utf-8", errors="replace")
+    if prefix == b"-":
+        return RedisError(payload.decode("utf-8", errors="replace"))
+    if prefix == b":":
+        return int(payload)
+    if prefix == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if prefix == b"*":
+        count = int(payload)
+        if count < 0:
+            return None
+        return [await _read_reply(reader) for _ in range(count)]
+    raise RedisError(f"Unexpected RESP reply: {line[:32]!r}")
+
+
+class RedisConnection:
+    """A single persistent, lazily (re)connected Redis connection."""
+
+    def __init__(self) -> None:
+        self._config: dict[str, str] | None = None
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._lock = asyncio.Lock()
+
+    async def _connect(self) -> None:
+        """Open the connection and authenticate if a password is set."""
+        if self._config is None:
+            self._config = read_redis_config()
+
+        socket_path = self._config.get("unixsocket")
+        if socket_path:
+            connect = asyncio.open_unix_connection(socket_path)
+        else:
+            host = self._config.get("bind", DEFAULT_HOST).split()[0]
+            if host in ("0.0.0.0", "*", "::", "-::*"):
+                host = DEFAULT_HOST
+            port = int(self._config.get("port", DEFAULT_PORT))
+            connect = asyncio.open_connection(host.lstrip("-"), port)
+        self._reader, self._writer = await asyncio.wait_for(connect, timeout=CONNECT_TIMEOUT)
+
+        password = self._config.get("requirepass")
+        if password:
+            reply = await asyncio.wait_for(
+                self._roundtrip([("AUTH", password)]), timeout=COMMAND_TIMEOUT
+            )
+            if isinstance(reply[0], RedisError):
+                self.close()
+                raise reply[0]
+
+    async def _roundtrip(self, commands: list[tuple]) -> list:
+        """Write commands in one batch and read one reply per command."""
+        self._writer.write(b"".join(_encode_command(c) for c in commands))
+        await self._writer.drain()
+        return [await _read_reply(self._reader) for _ in commands]
+
+    async def pipeline(self, commands: list[tuple]) -> list:
+        """
+        Send several commands in one round-trip.
+
+        Error replies are returned in place as RedisError instances rather
+        than raised, so one failing command doesn't hide the others.
+
+        Args:
+            commands: Tuples of command name and arguments
+
+        Returns:
+            One decoded reply per command
+
+        Raises:
+            RedisError: If the connection cannot be established
+        """
+        async with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._writer is None:
+                        await self._connect()
+                    return await asyncio.wait_for(
+                        self._roundtrip(commands), timeout=COMMAND_TIMEOUT
+                    )
+                except (OSError, ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError) as e:
+                    # Reconnect once: the server may have dropped an idle connection
+                    self.close()
+                    if attempt == 1:
+                        raise RedisError(f"Redis connection failed: {e}")
+                except BaseException:
+                    # Cancelled mid-reply (e.g. by a caller's deadline): unread
+                    # replies would be taken as answers to the next command
+                    self.close()
+                    raise
+            raise RedisError("Redis connection failed")
+
+    async def execute(self, *args):
+        """
+        Run a single command.
+
+        Raises:
+            RedisError: On connection failure or an error reply
+        """
+        reply = (await self.pipeline([args]))[0]
+        if isinstance(reply, RedisError):
+            raise reply
+        return reply
+
+    def close(self) -> None:
+        """Close the connection; the next command reconnects."""
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = None
+        self._writer = None
+
+
+def parse_info(text: str) -> dict[str, str]:
+    """Parse INFO output into a flat dict of field values."""
+    info: dict[str, str] = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#") or ":" not in line:
+            continue
+        key, value = line.split(":", 1)
+        info[key] = value.strip()
+    return info
+
+
+def _parse_keyspace(info: dict[str, str]) -> dict[str, int]:
+    """Extract key counts per database from "db0:keys=12,expires=3,..." fields."""
+    keyspace = {}
+    for key, value in info.items():
+        if key.startswith("db") and key[2:].isdigit():
+            fields = dict(part.split("=", 1) for part in value.split(",") if "=" in part)
+            keyspace[key] = int(fields.get("keys", 0))
+    return keyspace
+
+
+class RedisStatsSampler:
+    """Samples INFO over the shared connection and derives rates."""
+
+    def __init__(self, connection: RedisConnection) -> None:
+        self.connection = connection
+        self._previous: tuple[float, dict[str, int]] | None = None
+
+    async def sample(self) -> RedisStats | None:
+        """
+        Fetch INFO and compute stats since the previous sample.
+
+        Returns:
+            RedisStats, or None if Redis is unreachable
+        """
+        try:
+            raw = await self.connection.execute("INFO")
+        except RedisError as e:
+            logger.error(f"Failed to get Redis status: {e}")
+            return None
+
+        info = parse_info(raw.decode("utf-8", errors="replace"))
+
+        def integer(name: str) -> int | None:
+            try:
+                return int(info[name])
+            except (KeyError, ValueError):
+                return None
+
+        def number(name: str) -> float | None:
+            try:
+                return float(info[name])
+            except (KeyError, ValueError):
+                return None
+
+        counters = {
+            name: value for name in (
+                "total_commands_processed", "keyspace_hits", "keyspace_misses", "evicted_keys",
+            )
+            if (value := integer(name)) is not None
+        }
+
+        now = time.monotonic()
+        previous = self._previous
+        if previous is None or now - previous[0] >= MIN_RATE_INTERVAL:
+            self._previous = (now, counters)
+
+        def delta(name: str) -> int | None:
+            if previous is None or name not in counters or name not in previous[1]:
+                return None
+            change = counters[name] - previous[1][name]
+            # Counters reset on restart or CONFIG RESETSTAT
+            return change if change >= 0 else None
+
+        def rate(name: str) -> float | None:
+            change = delta(name)
+            elapsed = now - previous[0] if previous else 0
+            if change is None or elapsed <= 0:
+                return None
+            return round(change / elapsed, 2)
+
+        hits, misses = delta("keyspace_hits"), delta("keyspace_misses")
+        if hits is None or misses is None:
+            hits, misses = counters.get("keyspace_hits"), counters.get("keyspace_misses")
+        hit_ratio = None
+        if hits is not None and misses is not None and hits + misses > 0:
+            hit_ratio = round(100.0 * hits / (hits + misses), 2)
+
+        return RedisStats(
+            version=info.get("redis_version"),
+            connected_clients=integer("connected_clients"),
+            used_memory=integer("used_memory"),
+            used_memory_peak=integer("used_memory_peak"),
+            maxmemory=integer("maxmemory"),
+            mem_fragmentation_ratio=number("mem_fragmentation_ratio"),
+            keyspace_hits=counters.get("keyspace_hits"),
+            keyspace_misses=counters.get("keyspace_misses"),
+            hit_ratio=hit_ratio,
+            evicted_keys=counters.get("evicted_keys"),
+            evicted_keys_per_second=rate("evicted_keys"),
+            ops_per_second=rate("total_commands_processed"),
+            instantaneous_ops_per_sec=integer("instantaneous_ops_per_sec"),
+            keyspace=_parse_keyspace(info),
+            uptime_seconds=integer("uptime_in_seconds"),
+        )
+
+
+# Singleton instances for use across the server module
+redis_connection = RedisConnection()
+redis_stats = RedisStatsSampler(redis_connection)
@@ -0,0 +1,174 @@
+"""Per-site Redis footprint from an incremental, self-throttling keyspace scan.
+
+Sites using ``wpredis`` share one Redis instance. This background job walks
+the keyspace with ``SCAN`` and ``MEMORY USAGE`` in small pipelined batches
+and attributes keys to sites by their cache key prefix:
+
+- Object cache keys start with the site's ``WP_CACHE_KEY_SALT`` (WordOps
+  sets it to ``"{domain}:"``) or ``WP_REDIS_PREFIX`` from wp-config.php.
+- Nginx page cache keys look like ``nginx-cache:httpsGET{host}/{uri}``.
+
+The job sleeps between batches in proportion to the time Redis spent
+answering, so it never holds more than a small share of Redis' time.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import time
+
+from backend.server.redis import RedisConnection, RedisError
+from backend.wordops.models import SiteRedisFootprint
+from backend.wordops.sites import list_site_directories
+
+logger = logging.getLogger(__name__)
+
+SITES_ROOT = "/var/www"
+
+# Keys requested per SCAN call
+SCAN_BATCH_SIZE = 100
+
+# Maximum share of wall time spent waiting on Redis during a pass
+MAX_DUTY_CYCLE = 0.05
+
+# Minimum pause between batches, in seconds
+MIN_BATCH_PAUSE = 0.01
+
+# Seconds between full passes over the keyspace
+FOOTPRINT_INTERVAL = 900
+
+# Prefix-defining constants in wp-config.php
+WP_PREFIX_PATTERN = re.compile(
+    r"define\(\s*['\"](WP_CACHE_KEY_SALT|WP_REDIS_PREFIX)['\"]\s*,\s*['\"]([^'\"]+)['\"]"
+)
+
+# "nginx-cache:httpsGETexample.com/path" -> "example.com"
+NGINX_CACHE_KEY_PATTERN = re.compile(rb"^nginx-cache:https?[A-Z]+([^/]+)")
+
+
+def _read_site_prefixes(site: str) -> list[str]:
+    """Read the object cache key prefixes configured for a site."""
+    prefixes = []
+    for config_path in (
+        os.path.join(SITES_ROOT, site, "wp-config.php"),
+        os.path.join(SITES_ROOT, site, "htdocs", "wp-config.php"),
+    ):
+        try:
+            with open(config_path, "r", errors="replace") as f:
+                content = f.read()
+        except OSError:
+            continue
+        prefixes.extend(match.group(2) for match in WP_PREFIX_PATTERN.finditer(content))
+    return prefixes
+
+
+class RedisFootprintScanner:
+    """Background job attributing Redis keys and memory to sites."""
+
+    def __init__(self) -> None:
+        # A dedicated connection keeps the scan out of the stats connection's way
+        self.connection = RedisConnection()
+        self.footprints: dict[str, SiteRedisFootprint] = {}
+        self.unattributed: SiteRedisFootprint | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start the background scan loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the scan loop and close its connection."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.connection.close()
+
+    def get(self, site: str) -> SiteRedisFootprint | None:
+        """Return the last completed footprint for a site."""
+        return self.footprints.get(site)
+
+    async def _run(self) -> None:
+        """Run a full pass, then wait for the next interval."""
+        while True:
+            try:
+                await self.scan()
+            except RedisError as e:
+                logger.info(f"Redis footprint scan skipped: {e}")
+            except Exception as e:
+                logger.error(f"Redis footprint scan failed: {e}")
+            await asyncio.sleep(FOOTPRINT_INTERVAL)
+
+    async def scan(self) -> None:
+        """Walk the whole keyspace once and publish per-site totals."""
+        sites = list_site_directories(SITES_ROOT)
+        prefixes: dict[bytes, str] = {}
+        for site in sites:
+            site_prefixes = await asyncio.to_thread(_read_site_prefixes, site)
+            for prefix in site_prefixes or [f"{site}:"]:
+                prefixes[prefix.encode("utf-8")] = site
+
+        totals: dict[str | None, list[int]] = {}
+        cursor = b"0"
+        while True:
+            started = time.monotonic()
+            cursor, keys = await self.connection.execute("SCAN", cursor, "COUNT", SCAN_BATCH_SIZE)
+            sizes = []
+            if keys:
+                sizes = await self.connection.pipeline(
+                    [("MEMORY", "USAGE", key) for key in keys]
+                )
+            busy = time.monotonic() - started
+
+            for key, size in zip(keys, sizes):
+                if not isinstance(size, int):
+                    # Key expired between SCAN and MEMORY USAGE
+                    continue
+                site = _attribute_key(key, prefixes, sites)
+                entry = totals.setdefault(site, [0, 0])
+                entry[0] += 1
+                entry[1] += size
+
+            if cursor == b"0":
+                break
+            # Sleep long enough that Redis work stays under MAX_DUTY_CYCLE
+            await asyncio.sleep(max(MIN_BATCH_PAUSE, busy * (1 / MAX_DUTY_CYCLE - 1)))
+
+        scanned_at = int(time.time())
+        self.footprints = {
+            site: SiteRedisFootprint(keys=count, memory_bytes=size, scanned_at=scanned_at)
+            for site, (count, size) in totals.items()
+            if site is not None
+        }
+        count, size = totals.get(None, [0, 0])
+        self.unattributed = SiteRedisFootprint(keys=count, memory_bytes=size, scanned_at=scanned_at)
+
+
+def _attribute_key(key: bytes, prefixes: dict[bytes, str], sites: set[str]) -> str | None:
+    """Map a Redis key to the site owning it, or None if unknown."""
+    match = NGINX_CACHE_KEY_PATTERN.match(key)
+    if match:
+        host = match.group(1).decode("utf-8", errors="replace").split(":", 1)[0]
+        if host in sites:
+            return host
+        if host.startswith("www.") and host[4:] in sites:
+            return host[4:]
+        return None
+
+    # Most prefixes end at the first ":", so try that before a full search
+    head, sep, _ = key.partition(b":")
+    if sep and head + sep in prefixes:
+        return prefixes[head + sep]
+    for prefix, site in prefixes.items():
+        if key.startswith(prefix):
+            return site
+    return None
+
+
+# Singleton instance for use across the application
+redis_footprint = RedisFootprintScanner()
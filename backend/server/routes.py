@@ -1,34 +1,78 @@
 """Server metrics, service status, and log streaming API routes for WordOps Dashboard."""
 
 import asyncio
+import os
 import time
+from datetime import datetime
 
 import httpx
-from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
 
 from backend.auth.dependencies import get_current_user
 from backend.auth.models import User
 from backend.auth.utils import decode_token
-from backend.server.logs import tail_log, validate_log_type
+from backend.server.backups import backup_catalogue
+from backend.server.errorrates import error_rates
+from backend.server.logdownload import (
+    RangeNotSatisfiableError,
+    accepts_gzip,
+    entity_tag,
+    if_range_matches,
+    iter_file,
+    last_modified,
+    parse_range,
+)
+from backend.server.logs import get_log_paths, tail_log, validate_log_type
+from backend.server.logsearch import (
+    MAX_RANGE_LINES,
+    MAX_SEARCH_RESULTS,
+    build_matcher,
+    read_time_range,
+    rotated_log_files,
+    search_log,
+)
 from backend.server.models import (
+    BackupCatalogueSummary,
+    ErrorMetrics,
     LogEntry,
-    LogType,
+    LogRange,
+    LogStreamStats,
+    PackageUpdateJob,
     PackageUpdateRequest,
     PackageUpdateResponse,
+    PhpSlowComponent,
+    PhpSlowlogDigest,
     ServerOverviewInfo,
     ServiceStatus,
     StackServiceInfo,
     SystemInfo,
+    SlowQueryDigest,
     SystemMetrics,
     TimeRange,
 )
 from backend.server.netdata import get_system_metrics
-from backend.server.services import get_all_services, get_service_status, restart_service, get_stack_service_details, validate_service
+from backend.server.packages import UpgradeInProgressError, upgrade_runner
+from backend.server.services import (
+    get_all_services,
+    get_service_status,
+    get_stack_services,
+    restart_service,
+    systemd_dbus,
+    use_dbus_backend,
+    validate_service,
+)
+from backend.server.phpslowlog import php_slowlog
+from backend.server.slowlog import slow_queries
 from backend.server.system import get_server_overview, get_system_info
 from backend.server.websocket import log_manager
+from backend.wordops.sites import validate_domain
 
 router = APIRouter(prefix="/api/v1/server", tags=["server"])
 
+# Seconds between status polls for service WebSocket clients without D-Bus
+SERVICE_POLL_INTERVAL = 5
+
 
 @router.get("/metrics", response_model=SystemMetrics)
 async def get_metrics(
@@ -37,18 +81,22 @@ async def get_metrics(
 ) -> SystemMetrics:
     """Get system metrics from Netdata.
 
+    Error log counts for the same range are included so error spikes
+    can be charted against CPU and RAM.
+
     Args:
         current_user: Authenticated user (injected via dependency)
         range: Time range for historical data (5m, 1h, 24h)
 
     Returns:
-        SystemMetrics with CPU, RAM, disk, and network data
+        SystemMetrics with CPU, RAM, disk, network and error data
 
     Raises:
         HTTPException: 503 if Netdata is unreachable or returns error
     """
     try:
         metrics = await get_system_metrics(range)
+        metrics.errors = error_rates.for_range(range)
         return metrics
     except httpx.ConnectError:
         raise HTTPException(
@@ -67,6 +115,28 @@ async def get_metrics(
         )
 
 
+@router.get("/metrics/errors", response_model=ErrorMetrics)
+async def get_error_metrics(
+    current_user: User = Depends(get_current_user),
+    range: TimeRange = Query(TimeRange.FIVE_MIN, alias="range"),
+) -> ErrorMetrics:
+    """Get nginx and PHP-FPM error counts over time.
+
+    New error log lines are classified by severity and category
+    (upstream timeouts, failed connects to PHP-FPM, PHP fatal errors, ...)
+    and counted per minute. Buckets line up with GET /metrics for the same
+    range; this endpoint also works while Netdata is down.
+
+    Args:
+        current_user: Authenticated user (injected via dependency)
+        range: Time range (5m, 10m, 1h, 24h)
+
+    Returns:
+        ErrorMetrics with per-category series and totals
+    """
+    return error_rates.for_range(range)
+
+
 @router.get("/info", response_model=SystemInfo)
 async def get_info(
     current_user: User = Depends(get_current_user),
@@ -106,96 +176,215 @@ async def get_overview(
         )
 
 
+@router.get("/backups", response_model=BackupCatalogueSummary)
+async def get_backups(
+    current_user: User = Depends(get_current_user),
+    stale_days: int = Query(7, ge=1, le=3650),
+) -> BackupCatalogueSummary:
+    """Get a summary of indexed backups per site.
+
+    Args:
+        current_user: Authenticated user (injected via dependency)
+        stale_days: Report sites with no backup within this many days
+
+    Returns:
+        BackupCatalogueSummary with totals, per-site backups, and stale sites
+    """
+    await backup_catalogue.ensure_indexed()
+    return backup_catalogue.summary(stale_days)
+
+
+@router.get("/mysql/slow-queries", response_model=SlowQueryDigest)
+async def get_slow_queries(
+    current_user: User = Depends(get_current_user),
+    limit: int = Query(50, ge=1, le=500),
+    database: str | None = Query(None, max_length=64),
+) -> SlowQueryDigest:
+    """Get a digest of the MariaDB slow query log.
+
+    Queries are grouped by fingerprint (the query with its literals
+    replaced) and totalled per fingerprint and per database, with
+    databases mapped to sites. Both lists are sorted by total query time.
+
+    Args:
+        current_user: Authenticated user (injected via dependency)
+        limit: Maximum fingerprints returned (1-500, default 50)
+        database: Only fingerprints seen in this database
+
+    Returns:
+        SlowQueryDigest with fingerprints and per-database totals
+    """
+    return await slow_queries.digest(limit, database)
+
+
+@router.get("/php-fpm/slowlog", response_model=PhpSlowlogDigest)
+async def get_php_slowlog(
+    current_user: User = Depends(get_current_user),
+    site: str | None = Query(None),
+    limit: int = Query(20, ge=1, le=200),
+) -> PhpSlowlogDigest:
+    """Get PHP-FPM slow log aggregates by plugin, script and site.
+
+    Args:
+        current_user: Authenticated user (injected via dependency)
+        site: Only include slow requests of this site
+        limit: Maximum entries per list (1-200, default 20)
+
+    Returns:
+        PhpSlowlogDigest with plugins, scripts and sites by slow request count
+
+    Raises:
+        HTTPException: 400 if site is not a valid domain
+    """
+    if site is not None and not validate_domain(site):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid domain format: {site}",
+        )
+    return php_slowlog.digest(site, limit)
+
+
+@router.get("/php-fpm/slowlog/plugins", response_model=list[PhpSlowComponent])
+async def get_slowest_plugins(
+    current_user: User = Depends(get_current_user),
+    site: str | None = Query(None),
+    limit: int = Query(20, ge=1, le=200),
+) -> list[PhpSlowComponent]:
+    """Get the plugins and themes behind the most slow PHP requests.
+
+    Args:
+        current_user: Authenticated user (injected via dependency)
+        site: Only count slow requests of this site
+        limit: Maximum entries (1-200, default 20)
+
+    Returns:
+        List of PhpSlowComponent, most slow requests first
+
+    Raises:
+        HTTPException: 400 if site is not a valid domain
+    """
+    if site is not None and not validate_domain(site):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid domain format: {site}",
+        )
+    return php_slowlog.plugins(site, limit)
+
+
 @router.post("/packages/update", response_model=PackageUpdateResponse)
 async def update_packages(
     request: PackageUpdateRequest,
     current_user: User = Depends(get_current_user),
 ) -> PackageUpdateResponse:
-    """Update system packages.
+    """Start a background package upgrade job.
+
+    Progress can be followed via GET /packages/update/{job_id} or streamed
+    over the /packages/update/ws WebSocket.
 
     Args:
         request: Package update request with update_type ('all' or 'security')
         current_user: Authenticated user (injected via dependency)
 
     Returns:
-        PackageUpdateResponse with status, message, and updated count
+        PackageUpdateResponse with status "running" and the job ID
 
     Raises:
-        HTTPException: 503 if package update fails
+        HTTPException: 400 if update type is invalid, 409 if an upgrade is already running
     """
     try:
-        update_type = request.update_type
-
-        # Build the apt command based on update type
-        if update_type == "security":
-            # Security-only updates (using apt's security filters)
-            cmd = [
-                "sudo",
-                "apt-get",
-                "update",
-                "&&",
-                "sudo",
-                "apt-get",
-                "-y",
-                "upgrade",
-                "-o",
-                "APT::Get::Show-Upgraded=true",
-            ]
-        else:
-            # All updates
-            cmd = [
-                "sudo",
-                "apt-get",
-                "update",
-                "&&",
-                "sudo",
-                "apt-get",
-                "-y",
-                "upgrade",
-                "-o",
-                "APT::Get::Show-Upgraded=true",
-            ]
-
-        # Run the update command
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+        job = upgrade_runner.start(request.update_type)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except UpgradeInProgressError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
         )
 
-        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=300)
+    return PackageUpdateResponse(
+        status=job.status,
+        message=job.message,
+        updated_count=0,
+        job_id=job.job_id,
+    )
 
-        stdout_str = stdout.decode("utf-8", errors="replace")
-        stderr_str = stderr.decode("utf-8", errors="replace")
 
-        if process.returncode == 0:
-            # Parse output to count updated packages
-            # Look for lines like "The following packages will be upgraded:"
-            # and count the packages listed
-            updated_count = stdout_str.count(" upgraded")
+@router.get("/packages/update/{job_id}", response_model=PackageUpdateJob)
+async def get_package_update_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+) -> PackageUpdateJob:
+    """Get the state of a package upgrade job.
 
-            return PackageUpdateResponse(
-                status="completed",
-                message=f"System packages updated successfully",
-                updated_count=updated_count,
-            )
-        else:
-            return PackageUpdateResponse(
-                status="failed",
-                message=f"Package update failed: {stderr_str or stdout_str}",
-                updated_count=0,
-            )
+    Args:
+        job_id: ID returned when the upgrade was started
+        current_user: Authenticated user (injected via dependency)
 
-    except asyncio.TimeoutError:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Package update timed out after 5 minutes",
-        )
-    except Exception as e:
+    Returns:
+        PackageUpdateJob with status, progress, and upgraded packages
+
+    Raises:
+        HTTPException: 404 if the job is unknown
+    """
+    job = upgrade_runner.get_job(job_id)
+    if job is None:
         raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"Failed to update packages: {str(e)}",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Package update job not found: {job_id}",
         )
+    return job.to_model()
+
+
+@router.websocket("/packages/update/ws")
+async def package_update_stream(
+    websocket: WebSocket,
+    token: str = Query(...),
+) -> None:
+    """WebSocket endpoint streaming output of the current package upgrade job.
+
+    Sends the job's recorded output first, then live events until the job ends.
+
+    Args:
+        websocket: The WebSocket connection
+        token: JWT authentication token (query parameter)
+
+    Closes with:
+        4001: Invalid or expired token
+        4004: No upgrade job has been started
+    """
+    try:
+        token_data = decode_token(token)
+        if token_data is None:
+            await websocket.close(code=4001)
+            return
+    except Exception:
+        await websocket.close(code=4001)
+        return
+
+    job = upgrade_runner.current
+    if job is None:
+        await websocket.close(code=4004)
+        return
+
+    await websocket.accept()
+    queue = upgrade_runner.subscribe(job)
+    try:
+        await websocket.send_json({"type": "status", "job": job.to_model().model_dump()})
+        while True:
+            event = await queue.get()
+            if event is None:
+                break
+            await websocket.send_json(event)
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    except Exception:
+        pass
+    finally:
+        upgrade_runner.unsubscribe(job, queue)
 
 
 @router.get("/services", response_model=list[ServiceStatus])
@@ -228,8 +417,96 @@ async def list_services(
         )
 
 
+@router.websocket("/services/ws")
+async def service_status_stream(
+    websocket: WebSocket,
+    token: str = Query(...),
+) -> None:
+    """WebSocket endpoint pushing service state changes.
+
+    Sends a snapshot of all installed services on connect, then one
+    "change" message per service whose state changed. Changes are pushed
+    as systemd reports them when the D-Bus backend is connected, and
+    detected by polling otherwise.
+
+    Args:
+        websocket: The WebSocket connection
+        token: JWT authentication token (query parameter)
+
+    Closes with:
+        4001: Invalid or expired token
+    """
+    try:
+        token_data = decode_token(token)
+        if token_data is None:
+            await websocket.close(code=4001)
+            return
+    except Exception:
+        await websocket.close(code=4001)
+        return
+
+    await websocket.accept()
+    queue = systemd_dbus.subscribe()
+    try:
+        services = await get_all_services()
+        await websocket.send_json({
+            "type": "snapshot",
+            "services": [s.model_dump() for s in services],
+        })
+        known = {s.name: s for s in services}
+
+        while True:
+            if use_dbus_backend():
+                try:
+                    change = await asyncio.wait_for(queue.get(), timeout=SERVICE_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    continue
+                if change is None:
+                    # Fell behind and changes were dropped: resend everything
+                    services = await get_all_services()
+                    await websocket.send_json({
+                        "type": "snapshot",
+                        "services": [s.model_dump() for s in services],
+                    })
+                    known = {s.name: s for s in services}
+                    continue
+                changes = [change]
+            else:
+                await asyncio.sleep(SERVICE_POLL_INTERVAL)
+                current = {s.name: s for s in await get_all_services()}
+                changes = [
+                    (name, current.get(name))
+                    for name in sorted(set(known) | set(current))
+                    if _service_state(known.get(name)) != _service_state(current.get(name))
+                ]
+
+            for name, service in changes:
+                if service is None:
+                    known.pop(name, None)
+                else:
+                    known[name] = service
+                await websocket.send_json({
+                    "type": "change",
+                    "name": name,
+                    "service": service.model_dump() if service is not None else None,
+                })
+    except WebSocketDisconnect:
+        pass
+    except Exception:
+        pass
+    finally:
+        systemd_dbus.unsubscribe(queue)
+
+
+def _service_state(service: ServiceStatus | None) -> tuple | None:
+    """State fields compared when detecting service changes by polling."""
+    if service is None:
+        return None
+    return (service.active, service.sub_state, service.main_pid)
+
+
 @router.get("/stack-services", response_model=list[StackServiceInfo])
-async def get_stack_services(
+async def list_stack_services(
     current_user: User = Depends(get_current_user),
 ) -> list[StackServiceInfo]:
     """Get detailed information about all installed stack services.
@@ -244,19 +521,7 @@ async def get_stack_services(
         HTTPException: 503 if service queries fail
     """
     try:
-        from backend.server.services import ALLOWED_SERVICES
-
-        services = []
-        for service_name in sorted(ALLOWED_SERVICES):
-            try:
-                service_details = await get_stack_service_details(service_name)
-                if service_details is not None:
-                    services.append(service_details)
-            except (ValueError, RuntimeError):
-                # Skip services that error or aren't installed
-                continue
-
-        return services
+        return await get_stack_services()
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -465,6 +730,24 @@ async def stop_service_endpoint(
         )
 
 
+@router.get("/logs/streams", response_model=list[LogStreamStats])
+async def get_log_stream_stats(
+    current_user: User = Depends(get_current_user),
+) -> list[LogStreamStats]:
+    """Get buffer counters for log WebSocket streams.
+
+    Reports each client's queue depth and sent/dropped line counts, per
+    followed log type, to spot viewers that can't keep up.
+
+    Args:
+        current_user: Authenticated user (injected via dependency)
+
+    Returns:
+        List of LogStreamStats, one per log type that has been streamed
+    """
+    return log_manager.stats()
+
+
 @router.get("/logs/{log_type}", response_model=LogEntry)
 async def get_logs(
     log_type: str,
@@ -474,7 +757,8 @@ async def get_logs(
     """Get recent lines from a log file.
 
     Args:
-        log_type: Type of log (nginx-access, nginx-error, php-fpm, mysql)
+        log_type: Type of log (nginx-access, nginx-error, php-fpm, php{version}-fpm, mysql,
+            {domain}-access, {domain}-error)
         current_user: Authenticated user (injected via dependency)
         lines: Number of lines to return (1-500, default 50)
 
@@ -487,17 +771,260 @@ async def get_logs(
     if not validate_log_type(log_type):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid log type: {log_type}. Valid types: {', '.join(LogType._value2member_map_.keys())}",
+            detail=f"Invalid log type: {log_type}. Valid types: {', '.join(sorted(get_log_paths()))}",
         )
 
     log_lines = await tail_log(log_type, lines)
     return LogEntry(
         lines=log_lines,
-        log_type=LogType(log_type),
+        log_type=log_type,
         timestamp=int(time.time()),
     )
 
 
+@router.get("/logs/{log_type}/search")
+async def search_logs(
+    log_type: str,
+    current_user: User = Depends(get_current_user),
+    q: str = Query(..., min_length=1, max_length=500),
+    regex: bool = Query(False),
+    ignore_case: bool = Query(False),
+    since: datetime | None = Query(None),
+    until: datetime | None = Query(None),
+    limit: int = Query(100, ge=1, le=MAX_SEARCH_RESULTS),
+) -> StreamingResponse:
+    """Search a log and its rotated siblings, streaming matches as NDJSON.
+
+    The live file is searched first, then ".1", ".2.gz" and older
+    rotations, newest lines first. The search stops at the limit or once
+    it passes the start of the time window.
+
+    Args:
+        log_type: Type of log to search
+        current_user: Authenticated user (injected via dependency)
+        q: Substring, or regular expression if regex is set
+        regex: Treat q as a regular expression
+        ignore_case: Match case-insensitively
+        since: Only lines at or after this time (ISO 8601; server local
+            time if no offset is given)
+        until: Only lines at or before this time
+        limit: Maximum number of matches (1-5000, default 100)
+
+    Returns:
+        application/x-ndjson stream of match objects and a final summary
+
+    Raises:
+        HTTPException: 400 if log type, query or time window is invalid
+    """
+    log_path = get_log_paths().get(log_type)
+    if log_path is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid log type: {log_type}. Valid types: {', '.join(sorted(get_log_paths()))}",
+        )
+    since_ts = since.timestamp() if since else None
+    until_ts = until.timestamp() if until else None
+    # Compared as timestamps: one bound may carry an offset and the other not
+    if since_ts is not None and until_ts is not None and since_ts > until_ts:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="since must not be later than until",
+        )
+
+    try:
+        matcher = build_matcher(q, regex, ignore_case)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    return StreamingResponse(
+        search_log(
+            log_path,
+            matcher,
+            since=since_ts,
+            until=until_ts,
+            limit=limit,
+        ),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.get("/logs/{log_type}/range", response_model=LogRange)
+async def get_log_range(
+    log_type: str,
+    current_user: User = Depends(get_current_user),
+    since: datetime = Query(...),
+    until: datetime | None = Query(None),
+    limit: int = Query(1000, ge=1, le=MAX_RANGE_LINES),
+) -> LogRange:
+    """Get the lines of a log written between two times.
+
+    The start of the window is found by binary search over file offsets,
+    so the cost grows with the log of the file size plus the lines
+    returned. Older rotations are read when the window reaches into them.
+
+    Args:
+        log_type: Type of log to read
+        current_user: Authenticated user (injected via dependency)
+        since: Start of the window (ISO 8601; server local time if no
+            offset is given)
+        until: End of the window (default: now)
+        limit: Maximum number of lines (1-10000, default 1000)
+
+    Returns:
+        LogRange with the lines oldest first
+
+    Raises:
+        HTTPException: 400 if log type or time window is invalid
+    """
+    log_path = get_log_paths().get(log_type)
+    if log_path is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid log type: {log_type}. Valid types: {', '.join(sorted(get_log_paths()))}",
+        )
+
+    since_ts = since.timestamp()
+    until_ts = until.timestamp() if until else None
+    if until_ts is not None and since_ts > until_ts:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="since must not be later than until",
+        )
+
+    lines, files, truncated = await asyncio.to_thread(
+        read_time_range, log_path, since_ts, until_ts, limit
+    )
+    return LogRange(
+        log_type=log_type,
+        since=int(since_ts),
+        until=int(until_ts) if until_ts is not None else None,
+        lines=lines,
+        files=files,
+        truncated=truncated,
+    )
+
+
+@router.get("/logs/{log_type}/download")
+async def download_log(
+    log_type: str,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    file: str | None = Query(None, max_length=255),
+) -> StreamingResponse:
+    """Download a log file, with resumable byte ranges and optional gzip.
+
+    The file is streamed in chunks from a descriptor held for the whole
+    transfer, so memory use does not grow with the file and a rotation
+    during the transfer does not cut it short. Its size is fixed when the
+    request arrives.
+
+    A single "Range: bytes=start-end" is answered with 206 Partial
+    Content; an If-Range that no longer matches the file gets the whole
+    file instead. Whole-file downloads of uncompressed logs are gzipped
+    on the fly when Accept-Encoding allows it; ranges are always served
+    uncompressed so offsets refer to the file on disk.
+
+    Args:
+        log_type: Type of log to download
+        request: Incoming request (for Range, If-Range, Accept-Encoding)
+        current_user: Authenticated user (injected via dependency)
+        file: Name of a rotated file to download instead of the live log,
+            e.g. "error.log.1" or "error.log.2.gz"
+
+    Returns:
+        File contents as an attachment
+
+    Raises:
+        HTTPException: 400 if log type is invalid, 404 if the file does
+            not exist, 416 if the range starts past the end of the file
+    """
+    log_path = get_log_paths().get(log_type)
+    if log_path is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid log type: {log_type}. Valid types: {', '.join(sorted(get_log_paths()))}",
+        )
+
+    file_path = log_path
+    if file is not None:
+        # Only the log's own rotations can be picked
+        rotations = {os.path.basename(p): p for p in await asyncio.to_thread(rotated_log_files, log_path)}
+        file_path = rotations.get(file)
+        if file_path is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Log file not found: {file}. Available: {', '.join(rotations)}",
+            )
+
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Log file not found: {os.path.basename(file_path)}",
+        )
+    except OSError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to read log file: {e.strerror}",
+        )
+    if not os.access(file_path, os.R_OK):
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Permission denied reading log file: {os.path.basename(file_path)}",
+        )
+
+    size = stat.st_size
+    is_gzip = file_path.endswith(".gz")
+    media_type = "application/gzip" if is_gzip else "text/plain"
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="{os.path.basename(file_path)}"',
+        "ETag": entity_tag(stat),
+        "Last-Modified": last_modified(stat),
+        "Vary": "Accept-Encoding",
+    }
+
+    byte_range = None
+    if if_range_matches(request.headers.get("if-range"), stat):
+        try:
+            byte_range = parse_range(request.headers.get("range"), size)
+        except RangeNotSatisfiableError:
+            # Numeric: the constant's name differs across Starlette versions
+            raise HTTPException(
+                status_code=416,
+                detail=f"Range not satisfiable for a file of {size} bytes",
+                headers={"Content-Range": f"bytes */{size}"},
+            )
+
+    if byte_range is not None:
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(
+            iter_file(file_path, stat, start, end),
+            status_code=status.HTTP_206_PARTIAL_CONTENT,
+            media_type=media_type,
+            headers=headers,
+        )
+
+    compress = not is_gzip and accepts_gzip(request.headers.get("accept-encoding"))
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+        # A different representation needs its own tag
+        headers["ETag"] = headers["ETag"][:-1] + '-gzip"'
+    else:
+        headers["Content-Length"] = str(size)
+    return StreamingResponse(
+        iter_file(file_path, stat, 0, size - 1, compress=compress),
+        media_type=media_type,
+        headers=headers,
+    )
+
+
 @router.websocket("/logs/{log_type}/ws")
 async def log_stream(
     websocket: WebSocket,
@@ -508,12 +1035,13 @@ async def log_stream(
 
     Args:
         websocket: The WebSocket connection
-        log_type: Type of log to stream (nginx-access, nginx-error, php-fpm, mysql)
+        log_type: Type of log to stream (nginx-access, nginx-error, php-fpm, php{version}-fpm, mysql)
         token: JWT authentication token (query parameter)
 
     Closes with:
         4000: Invalid log type
         4001: Invalid or expired token
+        4002: Client fell behind under the "disconnect" overflow policy
     """
     # Validate token
     try:
@@ -532,16 +1060,11 @@ async def log_stream(
 
     await log_manager.connect(websocket, log_type)
     try:
-        # Send initial lines
-        lines = await tail_log(log_type, 50)
-        await log_manager.send_lines(websocket, lines)
-
-        # Poll for updates every 2 seconds
-        while True:
-            await asyncio.sleep(2)
-            lines = await tail_log(log_type, 50)
-            await log_manager.send_lines(websocket, lines)
+        # Send the last 50 lines, then only lines appended after them
+        await log_manager.stream(websocket, log_type, 50)
     except WebSocketDisconnect:
-        log_manager.disconnect(websocket, log_type)
+        pass
     except Exception:
+        pass
+    finally:
         log_manager.disconnect(websocket, log_type)
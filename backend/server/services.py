@@ -2,20 +2,34 @@
 
 import asyncio
 import logging
+import os
 import re
+import shutil
+import time
 from datetime import datetime, timezone
 
+from backend.config import settings
+
+from .cgroups import cgroup_stats
+from .discovery import php_fpm_version, service_discovery
 from .models import ServiceStatus, StackServiceInfo
+from .mysql import mysql_stats
+from .phpfpm import PHP_ETC_DIR, get_pool_statuses
+from .redis import redis_stats
+
+try:
+    from dbus_next import BusType, Message, MessageType
+    from dbus_next.aio import MessageBus
+except ImportError:  # Optional dependency: fall back to systemctl subprocesses
+    MessageBus = None
 
-# Strict allowlist of services that can be queried or managed
+logger = logging.getLogger(__name__)
+
+# Strict allowlist of services that can be queried or managed. PHP-FPM
+# services ("php{version}-fpm") are allowed for each PHP version that
+# has an /etc/php/{version}/fpm directory.
 ALLOWED_SERVICES = frozenset({
     "nginx",
-    "php7.4-fpm",
-    "php8.0-fpm",
-    "php8.1-fpm",
-    "php8.2-fpm",
-    "php8.3-fpm",
-    "php8.4-fpm",
     "mariadb",
     "mysql",
     "redis-server",
@@ -40,31 +54,38 @@ def validate_service(name: str) -> bool:
     Returns:
         True if service is allowed, False otherwise
     """
-    return name in ALLOWED_SERVICES
+    if name in ALLOWED_SERVICES:
+        return True
+    version = php_fpm_version(name)
+    return version is not None and version in service_discovery.php_versions()
 
 
-async def get_service_status(name: str) -> ServiceStatus | None:
+# Properties requested from systemctl show for status queries
+STATUS_PROPERTIES = "LoadState,ActiveState,SubState,MainPID,MemoryCurrent,ActiveEnterTimestamp"
+
+
+async def _show_units(names: list[str]) -> list[dict[str, str]]:
     """
-    Get status information for a system service.
+    Query properties for several units with a single systemctl invocation.
+
+    systemctl prints one block of key=value lines per unit, in argument order,
+    separated by blank lines.
 
     Args:
-        name: Service name (must be in ALLOWED_SERVICES)
+        names: Service names to query
 
     Returns:
-        ServiceStatus if service exists, None if not installed
+        One property dict per requested name, in the same order
 
     Raises:
-        ValueError: If service name is not in allowlist
+        RuntimeError: If systemctl is missing, times out, or output is malformed
     """
-    if not validate_service(name):
-        raise ValueError(f"Service '{name}' is not in the allowed services list")
-
     try:
         process = await asyncio.create_subprocess_exec(
             "systemctl",
             "show",
-            name,
-            "--property=ActiveState,SubState,MainPID,MemoryCurrent,ActiveEnterTimestamp",
+            *names,
+            f"--property={STATUS_PROPERTIES}",
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
         )
@@ -72,88 +93,422 @@ async def get_service_status(name: str) -> ServiceStatus | None:
         stdout, _ = await asyncio.wait_for(
             process.communicate(), timeout=STATUS_TIMEOUT
         )
+    except asyncio.TimeoutError:
+        raise RuntimeError(f"Timeout querying services: {', '.join(names)}")
+    except FileNotFoundError:
+        raise RuntimeError("systemctl command not found")
 
-        output = stdout.decode("utf-8", errors="replace").strip()
+    output = stdout.decode("utf-8", errors="replace").strip()
 
+    blocks: list[dict[str, str]] = []
+    for block in output.split("\n\n"):
         # Parse key=value pairs
         props = {}
-        for line in output.split("\n"):
+        for line in block.split("\n"):
             if "=" in line:
                 key, value = line.split("=", 1)
                 props[key.strip()] = value.strip()
+        blocks.append(props)
+
+    if len(blocks) != len(names):
+        raise RuntimeError(
+            f"Unexpected systemctl output: {len(blocks)} blocks for {len(names)} units"
+        )
+
+    return blocks
+
+
+def _status_from_properties(name: str, props: dict[str, str]) -> ServiceStatus | None:
+    """
+    Build a ServiceStatus from systemctl show properties.
+
+    Args:
+        name: Service name the properties belong to
+        props: Parsed key=value properties for the unit
 
-        active_state = props.get("ActiveState", "unknown")
-        sub_state = props.get("SubState", "unknown")
-        main_pid_str = props.get("MainPID", "0")
-        memory_current = props.get("MemoryCurrent", "")
-        active_enter_timestamp = props.get("ActiveEnterTimestamp", "")
+    Returns:
+        ServiceStatus, or None if the unit is not installed
+    """
+    # LoadState=not-found means the unit file doesn't exist
+    if props.get("LoadState", "not-found") == "not-found":
+        return None
+
+    active_state = props.get("ActiveState", "unknown")
+    sub_state = props.get("SubState", "unknown")
+    main_pid_str = props.get("MainPID", "0")
+    memory_current = props.get("MemoryCurrent", "")
+    active_enter_timestamp = props.get("ActiveEnterTimestamp", "")
 
-        # Parse MainPID
+    # Parse MainPID
+    try:
+        main_pid = int(main_pid_str)
+    except ValueError:
+        main_pid = 0
+
+    # Parse memory (may be empty or "[not set]")
+    memory_bytes = None
+    if memory_current and memory_current not in ("[not set]", ""):
         try:
-            main_pid = int(main_pid_str)
+            memory_bytes = int(memory_current)
         except ValueError:
-            main_pid = 0
-
-        # If inactive with no PID, service is not installed or not running
-        if active_state == "inactive" and main_pid == 0:
-            # Check if service unit exists at all
-            unit_check = await asyncio.create_subprocess_exec(
-                "systemctl",
-                "cat",
-                name,
-                stdout=asyncio.subprocess.DEVNULL,
-                stderr=asyncio.subprocess.DEVNULL,
-            )
-            await asyncio.wait_for(unit_check.wait(), timeout=STATUS_TIMEOUT)
-            if unit_check.returncode != 0:
-                # Service unit file doesn't exist
-                return None
-
-        # Parse memory (may be empty or "[not set]")
-        memory_bytes = None
-        if memory_current and memory_current not in ("[not set]", ""):
+            memory_bytes = None
+
+    # Parse uptime from ActiveEnterTimestamp
+    uptime_seconds = None
+    if active_enter_timestamp and active_state == "active":
+        uptime_seconds = _parse_uptime(active_enter_timestamp)
+
+    return ServiceStatus(
+        name=name,
+        active=active_state == "active",
+        sub_state=sub_state,
+        memory_bytes=memory_bytes,
+        uptime_seconds=uptime_seconds,
+        main_pid=main_pid if main_pid > 0 else None,
+    )
+
+
+# =============================================================================
+# D-Bus backend
+# =============================================================================
+
+SYSTEMD_BUS_NAME = "org.freedesktop.systemd1"
+SYSTEMD_PATH = "/org/freedesktop/systemd1"
+SYSTEMD_MANAGER_INTERFACE = "org.freedesktop.systemd1.Manager"
+SYSTEMD_UNIT_INTERFACE = "org.freedesktop.systemd1.Unit"
+SYSTEMD_SERVICE_INTERFACE = "org.freedesktop.systemd1.Service"
+DBUS_PROPERTIES_INTERFACE = "org.freedesktop.DBus.Properties"
+
+# systemd reports unset uint64 properties (e.g. MemoryCurrent) as UINT64_MAX
+DBUS_UINT64_NOT_SET = 2**64 - 1
+
+# Seconds to wait before reconnecting after the bus connection drops
+DBUS_RECONNECT_DELAY = 5
+
+# Changes a subscriber may fall behind by before its backlog is replaced
+# with a resync marker
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class SystemdDBusClient:
+    """Persistent D-Bus connection to systemd with cached unit state.
+
+    Unit properties are read once per unit and refreshed whenever systemd
+    emits PropertiesChanged for it. Subscribers receive a ServiceStatus
+    (or None for units that disappeared) the moment a unit changes state,
+    or a single None in place of the changes they fell too far behind on.
+    """
+
+    def __init__(self) -> None:
+        self.connected = False
+        self._bus = None
+        self._task: asyncio.Task | None = None
+        self._unit_paths: dict[str, str] = {}  # object path -> service name
+        self._properties: dict[str, dict] = {}  # service name -> properties
+        self._subscribers: set[asyncio.Queue] = set()
+        self._refresh_tasks: set[asyncio.Task] = set()
+
+    @staticmethod
+    def available() -> bool:
+        """Check whether the optional dbus-next dependency is installed."""
+        return MessageBus is not None
+
+    def start(self) -> None:
+        """Start the connection supervisor in the background."""
+        if self._task is None and self.available():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Disconnect from the bus and stop the supervisor."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._disconnect()
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a queue receiving (name, ServiceStatus | None) on changes.
+
+        A subscriber that falls SUBSCRIBER_QUEUE_SIZE changes behind has its
+        backlog replaced by None and should re-read every service.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Stop delivering change notifications to a queue."""
+        self._subscribers.discard(queue)
+
+    def get_status(self, name: str) -> ServiceStatus | None:
+        """Build a ServiceStatus from cached properties."""
+        props = self._properties.get(name)
+        if props is None:
+            return None
+        return _status_from_dbus(name, props)
+
+    async def _run(self) -> None:
+        """Keep a connection open, reconnecting after failures."""
+        while True:
             try:
-                memory_bytes = int(memory_current)
-            except ValueError:
-                memory_bytes = None
-
-        # Parse uptime from ActiveEnterTimestamp
-        uptime_seconds = None
-        if active_enter_timestamp and active_state == "active":
-            uptime_seconds = _parse_uptime(active_enter_timestamp)
-
-        return ServiceStatus(
-            name=name,
-            active=active_state == "active",
-            sub_state=sub_state,
-            memory_bytes=memory_bytes,
-            uptime_seconds=uptime_seconds,
-            main_pid=main_pid if main_pid > 0 else None,
+                await self._connect()
+                logger.info("Connected to systemd over D-Bus")
+                await self._bus.wait_for_disconnect()
+                logger.warning("systemd D-Bus connection lost")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"systemd D-Bus unavailable, using systemctl: {e}")
+            self._disconnect()
+            await asyncio.sleep(DBUS_RECONNECT_DELAY)
+
+    async def _connect(self) -> None:
+        """Connect, subscribe to signals, and load every installed unit."""
+        self._bus = await MessageBus(bus_type=BusType.SYSTEM).connect()
+        self._bus.add_message_handler(self._on_message)
+
+        await self._call(
+            "org.freedesktop.DBus", "/org/freedesktop/DBus", "org.freedesktop.DBus",
+            "AddMatch", "s",
+            [
+                f"type='signal',sender='{SYSTEMD_BUS_NAME}',"
+                f"interface='{DBUS_PROPERTIES_INTERFACE}',member='PropertiesChanged'"
+            ],
         )
+        # systemd only emits unit signals to clients that subscribed
+        await self._call(SYSTEMD_BUS_NAME, SYSTEMD_PATH, SYSTEMD_MANAGER_INTERFACE, "Subscribe")
+
+        await self.ensure_units(await service_discovery.installed_services(ALLOWED_SERVICES))
+        self.connected = True
+
+    async def ensure_units(self, names: list[str]) -> None:
+        """Load and start tracking units that aren't tracked yet.
+
+        Services installed after connecting are picked up the first time
+        they are queried.
+        """
+        bus = self._bus
+        for name in names:
+            if name in self._unit_paths.values():
+                continue
+            path = (await self._call(
+                SYSTEMD_BUS_NAME, SYSTEMD_PATH, SYSTEMD_MANAGER_INTERFACE,
+                "LoadUnit", "s", [f"{name}.service"],
+            ))[0]
+            if self._bus is not bus:
+                # Disconnected while waiting; the next connection reloads units
+                return
+            self._unit_paths[path] = name
+            await self._refresh_unit(path)
+
+    def _disconnect(self) -> None:
+        """Drop the bus connection and cached state."""
+        self.connected = False
+        for task in self._refresh_tasks:
+            task.cancel()
+        self._refresh_tasks.clear()
+        if self._bus is not None:
+            self._bus.disconnect()
+            self._bus = None
+        self._unit_paths.clear()
+        self._properties.clear()
+
+    async def _call(
+        self,
+        destination: str,
+        path: str,
+        interface: str,
+        member: str,
+        signature: str = "",
+        body: list | None = None,
+    ) -> list:
+        """Send a method call and return the reply body.
+
+        Raises:
+            RuntimeError: If the call returns a D-Bus error
+        """
+        reply = await self._bus.call(Message(
+            destination=destination,
+            path=path,
+            interface=interface,
+            member=member,
+            signature=signature,
+            body=body or [],
+        ))
+        if reply.message_type == MessageType.ERROR:
+            raise RuntimeError(f"D-Bus {member} failed: {reply.error_name} {reply.body}")
+        return reply.body
+
+    async def _refresh_unit(self, path: str) -> None:
+        """Re-read a unit's properties and notify subscribers on changes."""
+        name = self._unit_paths.get(path)
+        if name is None:
+            return
+
+        bus = self._bus
+        props = {}
+        for interface in (SYSTEMD_UNIT_INTERFACE, SYSTEMD_SERVICE_INTERFACE):
+            try:
+                values = (await self._call(
+                    SYSTEMD_BUS_NAME, path, DBUS_PROPERTIES_INTERFACE,
+                    "GetAll", "s", [interface],
+                ))[0]
+            except RuntimeError:
+                # Service interface is missing for units that aren't loaded
+                continue
+            props.update({key: variant.value for key, variant in values.items()})
+        if self._bus is not bus:
+            # Disconnected while waiting; don't repopulate the cleared cache
+            return
+
+        previous = self._properties.get(name)
+        self._properties[name] = props
+        if previous is not None and _state_key(previous) == _state_key(props):
+            return
+
+        status = _status_from_dbus(name, props)
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait((name, status))
+            except asyncio.QueueFull:
+                # Coalesce the backlog into one resync marker
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    def _on_message(self, message) -> None:
+        """Schedule a refresh when a tracked unit emits PropertiesChanged."""
+        if (
+            message.message_type == MessageType.SIGNAL
+            and message.member == "PropertiesChanged"
+            and message.path in self._unit_paths
+        ):
+            task = asyncio.create_task(self._refresh_unit(message.path))
+            self._refresh_tasks.add(task)
+            task.add_done_callback(self._refresh_done)
+
+    def _refresh_done(self, task: asyncio.Task) -> None:
+        """Forget a finished refresh task and log its failure, if any."""
+        self._refresh_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Failed to refresh systemd unit: {task.exception()}")
+
+
+def _state_key(props: dict) -> tuple:
+    """Properties whose change is worth pushing to subscribers."""
+    return (
+        props.get("LoadState"),
+        props.get("ActiveState"),
+        props.get("SubState"),
+        props.get("MainPID"),
+    )
 
-    except asyncio.TimeoutError:
-        raise RuntimeError(f"Timeout querying service {name}")
-    except FileNotFoundError:
-        raise RuntimeError("systemctl command not found")
+
+def _status_from_dbus(name: str, props: dict) -> ServiceStatus | None:
+    """
+    Build a ServiceStatus from D-Bus unit properties.
+
+    Args:
+        name: Service name the properties belong to
+        props: Unit and Service interface properties
+
+    Returns:
+        ServiceStatus, or None if the unit is not installed
+    """
+    if props.get("LoadState", "not-found") == "not-found":
+        return None
+
+    active = props.get("ActiveState") == "active"
+
+    memory_bytes = props.get("MemoryCurrent")
+    if memory_bytes is None or memory_bytes == DBUS_UINT64_NOT_SET:
+        memory_bytes = None
+
+    # ActiveEnterTimestamp is in microseconds since the epoch
+    uptime_seconds = None
+    entered_usec = props.get("ActiveEnterTimestamp") or 0
+    if active and entered_usec > 0:
+        uptime_seconds = max(0, int(time.time() - entered_usec / 1_000_000))
+
+    main_pid = props.get("MainPID") or 0
+
+    return ServiceStatus(
+        name=name,
+        active=active,
+        sub_state=props.get("SubState", "unknown"),
+        memory_bytes=memory_bytes,
+        uptime_seconds=uptime_seconds,
+        main_pid=main_pid if main_pid > 0 else None,
+    )
+
+
+def use_dbus_backend() -> bool:
+    """Check whether status queries should be served from the D-Bus cache."""
+    return settings.SERVICE_STATUS_BACKEND != "subprocess" and systemd_dbus.connected
+
+
+# Singleton instance for use across the server module
+systemd_dbus = SystemdDBusClient()
+
+
+async def get_service_status(name: str) -> ServiceStatus | None:
+    """
+    Get status information for a system service.
+
+    Args:
+        name: Service name (must be in ALLOWED_SERVICES)
+
+    Returns:
+        ServiceStatus if service exists, None if not installed
+
+    Raises:
+        ValueError: If service name is not in allowlist
+        RuntimeError: If systemctl fails or times out
+    """
+    if not validate_service(name):
+        raise ValueError(f"Service '{name}' is not in the allowed services list")
+
+    if use_dbus_backend():
+        await systemd_dbus.ensure_units([name])
+        return systemd_dbus.get_status(name)
+
+    props = (await _show_units([name]))[0]
+    return _status_from_properties(name, props)
 
 
 async def get_all_services() -> list[ServiceStatus]:
     """
     Get status for all allowed services that are installed.
 
+    Only services found by discovery are queried. Statuses are served from
+    the D-Bus cache when connected, otherwise all units are queried with a
+    single systemctl invocation.
+
     Returns:
         List of ServiceStatus for installed services
+
+    Raises:
+        RuntimeError: If systemctl fails or times out
     """
-    results = []
+    names = await service_discovery.installed_services(ALLOWED_SERVICES)
+    if not names:
+        return []
 
-    for service_name in sorted(ALLOWED_SERVICES):
-        try:
-            status = await get_service_status(service_name)
-            if status is not None:
-                results.append(status)
-        except (ValueError, RuntimeError):
-            # Skip services that error
-            continue
+    if use_dbus_backend():
+        await systemd_dbus.ensure_units(names)
+        statuses = [systemd_dbus.get_status(name) for name in names]
+        return [status for status in statuses if status is not None]
+
+    blocks = await _show_units(names)
+
+    results = []
+    for name, props in zip(names, blocks):
+        status = _status_from_properties(name, props)
+        if status is not None:
+            results.append(status)
 
     return results
 
@@ -241,12 +596,6 @@ def _parse_uptime(timestamp_str: str) -> int | None:
 # Service version detection and configuration paths
 SERVICE_CONFIG_PATHS = {
     "nginx": "/etc/nginx/nginx.conf",
-    "php7.4-fpm": "/etc/php/7.4/fpm/pool.d/www.conf",
-    "php8.0-fpm": "/etc/php/8.0/fpm/pool.d/www.conf",
-    "php8.1-fpm": "/etc/php/8.1/fpm/pool.d/www.conf",
-    "php8.2-fpm": "/etc/php/8.2/fpm/pool.d/www.conf",
-    "php8.3-fpm": "/etc/php/8.3/fpm/pool.d/www.conf",
-    "php8.4-fpm": "/etc/php/8.4/fpm/pool.d/www.conf",
     "mariadb": "/etc/mysql/my.cnf",
     "mysql": "/etc/mysql/my.cnf",
     "redis-server": "/etc/redis/redis.conf",
@@ -254,61 +603,136 @@ SERVICE_CONFIG_PATHS = {
 
 SERVICE_DISPLAY_NAMES = {
     "nginx": "Nginx",
-    "php7.4-fpm": "PHP 7.4-FPM",
-    "php8.0-fpm": "PHP 8.0-FPM",
-    "php8.1-fpm": "PHP 8.1-FPM",
-    "php8.2-fpm": "PHP 8.2-FPM",
-    "php8.3-fpm": "PHP 8.3-FPM",
-    "php8.4-fpm": "PHP 8.4-FPM",
     "mariadb": "MariaDB",
     "mysql": "MySQL",
     "redis-server": "Redis",
 }
 
 
+def _config_path(name: str) -> str:
+    """Return the main configuration file shown for a service."""
+    version = php_fpm_version(name)
+    if version is not None:
+        return os.path.join(PHP_ETC_DIR, version, "fpm", "pool.d", "www.conf")
+    return SERVICE_CONFIG_PATHS.get(name, "/etc/unknown.conf")
+
+
+def _display_name(name: str) -> str:
+    """Return the human-readable name of a service."""
+    version = php_fpm_version(name)
+    if version is not None:
+        return f"PHP {version}-FPM"
+    return SERVICE_DISPLAY_NAMES.get(name, name.capitalize())
+
+
+# Binary executed to read each service's version
+VERSION_BINARIES = {
+    "nginx": "nginx",
+    "mariadb": "mysql",
+    "mysql": "mysql",
+    "redis-server": "redis-cli",
+}
+
+# Extra directories searched for service binaries (nginx lives in /usr/sbin)
+VERSION_SEARCH_PATH = os.pathsep.join([os.environ.get("PATH", ""), "/usr/sbin", "/sbin"])
+
+# Cached version strings keyed by binary path: ((st_ino, st_mtime_ns), version)
+_version_cache: dict[str, tuple[tuple[int, int], str]] = {}
+
+
+async def _exec_capture(cmd: list[str], timeout: float = STATUS_TIMEOUT) -> tuple[bytes, bytes, int]:
+    """
+    Run a command and capture its output, killing it if it doesn't finish.
+
+    Args:
+        cmd: Command and arguments
+        timeout: Seconds to wait before killing the process
+
+    Returns:
+        Tuple of (stdout, stderr, returncode)
+
+    Raises:
+        asyncio.TimeoutError: If the command exceeds the timeout
+        FileNotFoundError: If the command doesn't exist
+    """
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except BaseException:
+        # Includes cancellation by a caller's deadline
+        if process.returncode is None:
+            process.kill()
+        raise
+    return stdout, stderr, process.returncode
+
+
+def _version_binary(name: str) -> str | None:
+    """Resolve the binary whose version output describes a service."""
+    version = php_fpm_version(name)
+    if version is not None:
+        binary = f"php{version}"
+    else:
+        binary = VERSION_BINARIES.get(name)
+    if binary is None:
+        return None
+    return shutil.which(binary, path=VERSION_SEARCH_PATH)
+
+
 async def get_service_version(name: str) -> str | None:
     """
     Get version string for a service.
 
+    Versions are cached per binary and keyed on its inode and mtime, so the
+    binary is only executed again after a package upgrade replaces it.
+
     Args:
         name: Service name (must be in ALLOWED_SERVICES)
 
     Returns:
         Version string or None if unable to determine
     """
+    binary_path = _version_binary(name)
+    if binary_path is None:
+        return None
+
+    try:
+        st = os.stat(binary_path)
+    except OSError:
+        return None
+    key = (st.st_ino, st.st_mtime_ns)
+
+    cached = _version_cache.get(binary_path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    version = await _read_service_version(name, binary_path)
+    if version is not None:
+        _version_cache[binary_path] = (key, version)
+    return version
+
+
+async def _read_service_version(name: str, binary_path: str) -> str | None:
+    """Execute a service binary and parse its version output."""
     try:
         if name == "nginx":
-            process = await asyncio.create_subprocess_exec(
-                "nginx", "-v",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            _, stderr = await asyncio.wait_for(process.communicate(), timeout=STATUS_TIMEOUT)
+            _, stderr, _ = await _exec_capture([binary_path, "-v"])
             # nginx outputs version to stderr
             output = stderr.decode("utf-8", errors="replace")
             match = re.search(r"nginx/([\d.]+)", output)
             return match.group(1) if match else None
 
-        elif name.startswith("php") and "-fpm" in name:
-            # Extract PHP version from service name (e.g., "php8.1-fpm" -> "8.1")
-            php_version = name.replace("php", "").replace("-fpm", "")
-            process = await asyncio.create_subprocess_exec(
-                f"php{php_version}", "--version",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, _ = await asyncio.wait_for(process.communicate(), timeout=STATUS_TIMEOUT)
+        elif (php_version := php_fpm_version(name)) is not None:
+            stdout, _, _ = await _exec_capture([binary_path, "--version"])
             output = stdout.decode("utf-8", errors="replace")
             match = re.search(r"PHP ([\d.]+)", output)
             return match.group(1) if match else php_version
 
         elif name in ("mysql", "mariadb"):
-            process = await asyncio.create_subprocess_exec(
-                "mysql", "--version",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, _ = await asyncio.wait_for(process.communicate(), timeout=STATUS_TIMEOUT)
+            stdout, _, _ = await _exec_capture([binary_path, "--version"])
             output = stdout.decode("utf-8", errors="replace")
             # MariaDB outputs like: mysql  Ver 15.1 Distrib 10.6.12-MariaDB
             # MySQL outputs like: mysql  Ver 8.0.35
@@ -316,12 +740,7 @@ async def get_service_version(name: str) -> str | None:
             return match.group(1) if match else None
 
         elif name == "redis-server":
-            process = await asyncio.create_subprocess_exec(
-                "redis-cli", "--version",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, _ = await asyncio.wait_for(process.communicate(), timeout=STATUS_TIMEOUT)
+            stdout, _, _ = await _exec_capture([binary_path, "--version"])
             output = stdout.decode("utf-8", errors="replace")
             match = re.search(r"redis-cli\s+([\d.]+)", output)
             return match.group(1) if match else None
@@ -352,67 +771,53 @@ def format_memory_bytes(bytes: int | None) -> str | None:
 
 async def get_php_fpm_status(name: str) -> dict | None:
     """
-    Get PHP-FPM specific status (connections and max children).
+    Get PHP-FPM specific status from every pool of one PHP version.
+
+    Each pool's status page is queried over FastCGI on its own socket, so
+    only this version's workers are counted.
 
     Args:
         name: PHP-FPM service name (e.g., "php8.1-fpm")
 
     Returns:
-        Dict with "connections" and "max_children" or None
+        Dict with "connections" (active processes), "max_children" and
+        "pools", or None if no pool could be read
     """
-    try:
-        # Extract PHP version from service name
-        php_version = name.replace("php", "").replace("-fpm", "")
-
-        # Try to get max_children from pool config
-        process = await asyncio.create_subprocess_exec(
-            "bash", "-c",
-            f"grep -E '^pm\\.max_children' /etc/php/{php_version}/fpm/pool.d/www.conf 2>/dev/null || echo 'not found'",
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=STATUS_TIMEOUT)
-        output = stdout.decode("utf-8", errors="replace").strip()
-
-        max_children = None
-        if output and "not found" not in output.lower():
-            match = re.search(r"pm\.max_children\s*=\s*(\d+)", output)
-            if match:
-                max_children = int(match.group(1))
-
-        # For active connections, count PHP-FPM worker processes
-        # Use broader pattern to match various PHP-FPM process name formats
-        process = await asyncio.create_subprocess_exec(
-            "bash", "-c",
-            f"pgrep -f 'php.*fpm.*pool' 2>/dev/null | wc -l || echo 0",
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=STATUS_TIMEOUT)
-        connections_str = stdout.decode("utf-8", errors="replace").strip()
-
-        # Log for debugging
-        logging.debug(f"PHP-FPM {php_version}: pgrep result='{connections_str}'")
+    php_version = php_fpm_version(name)
+    if php_version is None:
+        return None
+    pools = await get_pool_statuses(php_version)
+    if not pools:
+        return None
 
-        connections = int(connections_str) if connections_str.isdigit() and int(connections_str) > 0 else None
+    active = [p.active_processes for p in pools if p.active_processes is not None]
+    max_children = [p.max_children for p in pools if p.max_children is not None]
 
-        return {
-            "connections": connections,
-            "max_children": max_children,
-        }
-    except (asyncio.TimeoutError, ValueError, Exception) as e:
-        logging.error(f"Failed to get PHP-FPM status for {name}: {e}")
-        return None
+    return {
+        "connections": sum(active) if active else None,
+        "max_children": sum(max_children) if max_children else None,
+        "pools": pools,
+    }
 
 
 async def get_mysql_status() -> dict | None:
     """
-    Get MySQL/MariaDB specific status (connection count).
+    Get MySQL/MariaDB specific status.
+
+    Uses the pooled connection from backend.server.mysql when aiomysql is
+    installed and a pool could be created, falling back to the mysql
+    command-line client otherwise.
 
     Returns:
-        Dict with "connections" or None
+        Dict with "connections" (and "stats" when pooled) or None
     """
-    import os
+    if mysql_stats.available():
+        stats = await mysql_stats.sample()
+        if stats is not None:
+            return {"connections": stats.threads_connected, "stats": stats}
+        if mysql_stats.connected:
+            # The pool exists but the query failed; the client would fail too
+            return None
 
     try:
         # Try ~/.my.cnf first (standard for WordOps MySQL setups)
@@ -441,13 +846,12 @@ async def get_mysql_status() -> dict | None:
 
         output = stdout.decode("utf-8", errors="replace")
 
-        # Parse output: "Threads_connected\t15"
+        # Parse output: "Variable_name\tValue" header, then "Threads_connected\t15"
         for line in output.split("\n"):
-            if "\t" in line and "Threads_connected" not in line:
-                parts = line.split("\t")
-                if len(parts) >= 2:
-                    connections = int(parts[1].strip())
-                    return {"connections": connections}
+            parts = line.split("\t")
+            if len(parts) >= 2 and parts[0].strip() == "Threads_connected":
+                connections = int(parts[1].strip())
+                return {"connections": connections}
 
         return None
     except (asyncio.TimeoutError, ValueError, Exception) as e:
@@ -457,56 +861,131 @@ async def get_mysql_status() -> dict | None:
 
 async def get_redis_status() -> dict | None:
     """
-    Get Redis specific status (connected clients).
+    Get Redis specific status over the persistent RESP connection.
+
+    Returns:
+        Dict with "connected_clients" and "stats" or None
+    """
+    stats = await redis_stats.sample()
+    if stats is None:
+        return None
+    return {"connected_clients": stats.connected_clients, "stats": stats}
+
+
+# Deadline for each enrichment probe; slower probes are reported stale
+PROBE_DEADLINE = 3.0
+
+# Last successful probe results keyed by (service name, probe name)
+_last_probe_results: dict[tuple[str, str], object] = {}
+
+
+async def _run_probe(name: str, probe: str, coro) -> tuple[object, bool]:
+    """
+    Run one enrichment probe under the probe deadline.
+
+    Args:
+        name: Service name the probe belongs to
+        probe: Probe name used as cache key and in stale_fields
+        coro: Coroutine producing the probe result (None when there is
+            nothing to report, e.g. a stopped service)
 
     Returns:
-        Dict with "connected_clients" or None
+        Tuple of (value, stale). On timeout or an exception, the last
+        successful value is returned with stale=True; a None result is
+        current and not stale.
     """
+    key = (name, probe)
     try:
-        # Try to read Redis password from config
-        redis_conf_path = "/etc/redis/redis.conf"
-        redis_password = None
+        value = await asyncio.wait_for(coro, timeout=PROBE_DEADLINE)
+    except Exception:
+        return _last_probe_results.get(key), True
 
-        try:
-            with open(redis_conf_path, "r") as f:
-                for line in f:
-                    if line.startswith("requirepass"):
-                        parts = line.split(None, 1)
-                        if len(parts) >= 2:
-                            redis_password = parts[1].strip()
-                            break
-        except (OSError, IOError):
-            pass
-
-        # Build redis-cli command with or without auth
-        cmd = ["redis-cli", "INFO", "clients"]
-        if redis_password:
-            cmd.insert(1, "-a")
-            cmd.insert(2, redis_password)
+    if value is not None:
+        _last_probe_results[key] = value
+    return value, False
 
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=STATUS_TIMEOUT)
 
-        if process.returncode != 0:
-            stderr_str = stderr.decode("utf-8", errors="replace").strip()
-            logging.error(f"Redis status command failed: {stderr_str}")
-            return None
+def _stats_probe(name: str):
+    """Return the service-specific stats coroutine for a service, if any."""
+    if php_fpm_version(name) is not None:
+        return get_php_fpm_status(name)
+    if name in ("mysql", "mariadb"):
+        return get_mysql_status()
+    if name == "redis-server":
+        return get_redis_status()
+    return None
 
-        output = stdout.decode("utf-8", errors="replace")
 
-        # Parse output: "connected_clients:10"
-        match = re.search(r"connected_clients:(\d+)", output)
-        if match:
-            return {"connected_clients": int(match.group(1))}
+async def _enrich_service(base_status: ServiceStatus) -> StackServiceInfo:
+    """
+    Build StackServiceInfo for an installed service, running probes concurrently.
 
-        return None
-    except (asyncio.TimeoutError, ValueError, Exception) as e:
-        logging.error(f"Failed to get Redis status: {e}")
-        return None
+    Args:
+        base_status: Current systemd status of the service
+
+    Returns:
+        StackServiceInfo with version and service-specific stats
+    """
+    name = base_status.name
+
+    # Determine status string
+    if base_status.active:
+        status = "running"
+    elif base_status.sub_state in ("restarting", "auto-restart"):
+        status = "restarting"
+    else:
+        status = "stopped"
+
+    probes = {}
+    # Services without a version binary (postfix, ufw, ...) have nothing to probe
+    if _version_binary(name) is not None:
+        probes["version"] = get_service_version(name)
+    stats_coro = _stats_probe(name)
+    if stats_coro is not None:
+        probes["stats"] = stats_coro
+
+    results = await asyncio.gather(
+        *(_run_probe(name, probe, coro) for probe, coro in probes.items())
+    )
+    values = dict(zip(probes, results))
+
+    version, version_stale = values.get("version", (None, False))
+    stats, stats_stale = values.get("stats", (None, False))
+    stats = stats or {}
+
+    # The background sampler keeps history; sample now if it hasn't run yet
+    resources = cgroup_stats.latest(name) or cgroup_stats.sample(name)
+    memory_bytes = base_status.memory_bytes
+    if resources is not None and resources.memory_bytes is not None:
+        memory_bytes = resources.memory_bytes
+
+    stale_fields = []
+    if version_stale:
+        stale_fields.append("version")
+    if stats_stale:
+        stale_fields.append("stats")
+
+    return StackServiceInfo(
+        name=name,
+        display_name=_display_name(name),
+        status=status,
+        version=version,
+        memory_usage=memory_bytes,
+        memory_display=format_memory_bytes(memory_bytes),
+        uptime_seconds=base_status.uptime_seconds,
+        config_file=_config_path(name),
+        php_fpm_connections=stats.get("connections") if name.startswith("php") else None,
+        php_fpm_max_children=stats.get("max_children"),
+        mysql_connections=stats.get("connections") if name in ("mysql", "mariadb") else None,
+        mysql_stats=stats.get("stats") if name in ("mysql", "mariadb") else None,
+        redis_connected_clients=stats.get("connected_clients"),
+        redis_stats=stats.get("stats") if name == "redis-server" else None,
+        php_fpm_pools=stats.get("pools", []),
+        resources=resources,
+        resource_history=cgroup_stats.history(name),
+        stale=bool(stale_fields),
+        stale_fields=stale_fields,
+    )
 
 
 async def get_stack_service_details(name: str) -> StackServiceInfo | None:
@@ -525,62 +1004,23 @@ async def get_stack_service_details(name: str) -> StackServiceInfo | None:
     if not validate_service(name):
         raise ValueError(f"Service '{name}' is not in the allowed services list")
 
-    # Get base service status
     base_status = await get_service_status(name)
     if base_status is None:
         return None
 
-    # Determine status string
-    if base_status.active:
-        status = "running"
-    elif base_status.sub_state in ("restarting", "auto-restart"):
-        status = "restarting"
-    else:
-        status = "stopped"
+    return await _enrich_service(base_status)
 
-    # Get version
-    version = await get_service_version(name)
-
-    # Format memory
-    memory_display = format_memory_bytes(base_status.memory_bytes)
-
-    # Get config file path
-    config_file = SERVICE_CONFIG_PATHS.get(name, "/etc/unknown.conf")
-
-    # Get display name
-    display_name = SERVICE_DISPLAY_NAMES.get(name, name.capitalize())
-
-    # Service-specific stats
-    php_fpm_connections = None
-    php_fpm_max_children = None
-    mysql_connections = None
-    redis_connected_clients = None
-
-    if name.startswith("php") and "-fpm" in name:
-        fpm_status = await get_php_fpm_status(name)
-        if fpm_status:
-            php_fpm_connections = fpm_status.get("connections")
-            php_fpm_max_children = fpm_status.get("max_children")
-    elif name in ("mysql", "mariadb"):
-        mysql_status = await get_mysql_status()
-        if mysql_status:
-            mysql_connections = mysql_status.get("connections")
-    elif name == "redis-server":
-        redis_status = await get_redis_status()
-        if redis_status:
-            redis_connected_clients = redis_status.get("connected_clients")
 
-    return StackServiceInfo(
-        name=base_status.name,
-        display_name=display_name,
-        status=status,
-        version=version,
-        memory_usage=base_status.memory_bytes,
-        memory_display=memory_display,
-        uptime_seconds=base_status.uptime_seconds,
-        config_file=config_file,
-        php_fpm_connections=php_fpm_connections,
-        php_fpm_max_children=php_fpm_max_children,
-        mysql_connections=mysql_connections,
-        redis_connected_clients=redis_connected_clients,
-    )
+async def get_stack_services() -> list[StackServiceInfo]:
+    """
+    Get detailed information about all installed stack services.
+
+    Statuses come from a single batched query; version and stats probes for
+    every service then run concurrently, each under PROBE_DEADLINE, so one
+    slow service can't hold up the others.
+
+    Returns:
+        List of StackServiceInfo for installed services
+    """
+    statuses = await get_all_services()
+    return list(await asyncio.gather(*(_enrich_service(s) for s in statuses)))
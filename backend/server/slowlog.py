@@ -0,0 +1,381 @@
+"""Slow query digest built from the MariaDB/MySQL slow query log.
+
+The slow log is followed as it grows. Each entry is parsed from its
+header lines (``# Query_time: ... Rows_examined: ...``), its query text
+is normalised into a fingerprint, and per-fingerprint and per-database
+aggregates are updated in place, so a digest is ready without re-reading
+the log. Databases are mapped to sites by the ``DB_NAME`` in each site's
+wp-config.php, the value WordOps reports as the site's database name.
+
+Both slow log dialects are understood: MariaDB writes the schema in a
+``# Thread_id: ... Schema: ...`` header, MySQL writes ``use db;`` when a
+connection's database changes.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import time
+
+from backend.server.follower import LogFollower
+from backend.server.logs import LOG_PATHS, SITES_ROOT, read_recent_lines
+from backend.server.models import SlowQueryDatabase, SlowQueryDigest, SlowQueryFingerprint
+from backend.server.traffic import LatencyHistogram
+from backend.wordops.sites import list_site_directories
+
+logger = logging.getLogger(__name__)
+
+# Fingerprints tracked; beyond this the one with the least total time is dropped
+MAX_FINGERPRINTS = 1000
+
+# Characters of the slowest sample query kept per fingerprint
+SAMPLE_QUERY_LENGTH = 2000
+
+# Bytes of existing slow log parsed on startup
+BACKFILL_BYTES = 16 * 1024 * 1024
+
+# Seconds the database-to-site map is reused before wp-config.php is re-read
+SITE_MAP_TTL = 300
+
+# Histogram precision for query times: coarser than the traffic histogram
+# (under 7% relative error) since one is kept per fingerprint
+QUERY_TIME_SUB_BITS = 5
+
+# "# Query_time: 2.000193  Lock_time: 0.000040  Rows_sent: 1  Rows_examined: 123456"
+HEADER_FIELD_PATTERN = re.compile(r"(\w+): (\S+)")
+
+# "# User@Host: root[root] @ localhost []  Id:     8" (MySQL)
+THREAD_ID_PATTERN = re.compile(r"\bId:\s+(\d+)")
+
+# "use wp_db;" (MySQL)
+USE_PATTERN = re.compile(r"^use `?([^`;\s]+)`?;\s*$", re.IGNORECASE)
+
+# "SET timestamp=1768817730;"
+SET_TIMESTAMP_PATTERN = re.compile(r"^SET timestamp=(\d+);\s*$", re.IGNORECASE)
+
+# DB_NAME in wp-config.php
+WP_DB_NAME_PATTERN = re.compile(r"define\(\s*['\"]DB_NAME['\"]\s*,\s*['\"]([^'\"]+)['\"]")
+
+# Fingerprint normalisation, applied in order
+STRING_PATTERN = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.|\"\")*\"")
+COMMENT_PATTERN = re.compile(r"/\*.*?\*/|(?:--\s|#)[^\n]*", re.DOTALL)
+NUMBER_PATTERN = re.compile(r"\b0x[0-9a-f]+\b|(?<![\w.])-?\d+(?:\.\d+)?(?:e[+-]?\d+)?\b")
+VALUES_PATTERN = re.compile(r"\bvalues\s*\(.*", re.DOTALL)
+IN_LIST_PATTERN = re.compile(r"\bin\s*\(\s*\?(?:\s*,\s*\?)*\s*\)")
+SPACE_PATTERN = re.compile(r"\s+")
+
+
+def fingerprint_query(query: str) -> str:
+    """
+    Normalise a query so that queries differing only in literals match.
+
+    Literals become "?", IN lists and VALUES rows collapse to "(?+)",
+    comments are dropped, and case and whitespace are normalised.
+
+    Args:
+        query: SQL text from the slow log
+
+    Returns:
+        Fingerprint string
+    """
+    text = STRING_PATTERN.sub("?", query)
+    text = COMMENT_PATTERN.sub(" ", text).lower()
+    text = NUMBER_PATTERN.sub("?", text)
+    text = VALUES_PATTERN.sub("values (?+)", text)
+    text = IN_LIST_PATTERN.sub("in (?+)", text)
+    return SPACE_PATTERN.sub(" ", text).strip().rstrip(";").rstrip()
+
+
+def _fingerprint_id(fingerprint: str) -> str:
+    """Short stable identifier for a fingerprint."""
+    return hashlib.md5(fingerprint.encode()).hexdigest()[:16]
+
+
+def read_site_databases(root: str = SITES_ROOT) -> dict[str, str]:
+    """
+    Map database names to site domains using each site's wp-config.php.
+
+    Returns:
+        Dict of database name to domain
+    """
+    databases = {}
+    for site in list_site_directories(root):
+        for config_path in (
+            os.path.join(root, site, "wp-config.php"),
+            os.path.join(root, site, "htdocs", "wp-config.php"),
+        ):
+            try:
+                with open(config_path, "r", errors="replace") as f:
+                    match = WP_DB_NAME_PATTERN.search(f.read())
+            except OSError:
+                continue
+            if match is not None:
+                databases[match.group(1)] = site
+                break
+    return databases
+
+
+class SlowLogParser:
+    """Incremental parser for slow log entries.
+
+    Lines may be fed in arbitrary batches; an entry is complete once its
+    query text ends with ";".
+    """
+
+    def __init__(self) -> None:
+        self._thread_databases: dict[str, str] = {}
+        self._reset()
+
+    def _reset(self) -> None:
+        """Start a new entry."""
+        self._thread: str | None = None
+        self._database: str | None = None
+        self._timestamp: int | None = None
+        self._fields: dict[str, str] | None = None
+        self._query: list[str] = []
+
+    def feed(self, lines: list[str]) -> list[tuple]:
+        """
+        Parse lines and return the entries they complete.
+
+        Returns:
+            List of (timestamp, database, query_time, lock_time, rows_sent,
+            rows_examined, query) tuples; timestamp and database may be None
+        """
+        entries = []
+        for line in lines:
+            if line.startswith("#"):
+                self._header(line)
+                continue
+
+            if self._fields is None:
+                # Server startup banner, or a line from a partial entry
+                continue
+
+            if not self._query:
+                match = USE_PATTERN.match(line)
+                if match is not None:
+                    self._database = match.group(1)
+                    if self._thread is not None:
+                        self._thread_databases[self._thread] = self._database
+                    continue
+                match = SET_TIMESTAMP_PATTERN.match(line)
+                if match is not None:
+                    self._timestamp = int(match.group(1))
+                    continue
+
+            self._query.append(line)
+            if line.rstrip().endswith(";"):
+                entry = self._complete()
+                if entry is not None:
+                    entries.append(entry)
+                self._reset()
+        return entries
+
+    def _header(self, line: str) -> None:
+        """Handle a "# ..." header line."""
+        if line.startswith(("# Time:", "# User@Host:")):
+            if self._query or self._fields is not None:
+                self._reset()
+            match = THREAD_ID_PATTERN.search(line)
+            if match is not None:
+                self._thread = match.group(1)
+        elif line.startswith("# Thread_id:"):
+            fields = dict(HEADER_FIELD_PATTERN.findall(line))
+            self._thread = fields.get("Thread_id")
+            if fields.get("Schema"):
+                self._database = fields["Schema"]
+        elif line.startswith("# Query_time:"):
+            self._fields = dict(HEADER_FIELD_PATTERN.findall(line))
+
+    def _complete(self) -> tuple | None:
+        """Build the entry tuple for the current query."""
+        fields = self._fields
+        query = "\n".join(self._query).strip()
+        if not query:
+            return None
+        try:
+            query_time = float(fields.get("Query_time", 0))
+            lock_time = float(fields.get("Lock_time", 0))
+            rows_sent = int(fields.get("Rows_sent", 0))
+            rows_examined = int(fields.get("Rows_examined", 0))
+        except ValueError:
+            return None
+
+        database = self._database
+        if database is None and self._thread is not None:
+            database = self._thread_databases.get(self._thread)
+        return (self._timestamp, database, query_time, lock_time, rows_sent, rows_examined, query)
+
+
+class QueryStats:
+    """Aggregates for one fingerprint or one database."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_time = 0.0
+        self.lock_time = 0.0
+        self.rows_sent = 0
+        self.rows_examined = 0
+        self.query_time = LatencyHistogram(sub_bits=QUERY_TIME_SUB_BITS)
+        self.databases: dict[str, int] = {}
+        self.first_seen: int | None = None
+        self.last_seen: int | None = None
+        self.sample: str | None = None
+        self.sample_time = -1.0
+
+    def add(self, timestamp: int | None, database: str | None, query_time: float,
+            lock_time: float, rows_sent: int, rows_examined: int, query: str | None) -> None:
+        """Fold one slow log entry into the aggregates."""
+        self.count += 1
+        self.total_time += query_time
+        self.lock_time += lock_time
+        self.rows_sent += rows_sent
+        self.rows_examined += rows_examined
+        self.query_time.record(query_time)
+        if database is not None:
+            self.databases[database] = self.databases.get(database, 0) + 1
+        if timestamp is not None:
+            if self.first_seen is None:
+                self.first_seen = timestamp
+            self.last_seen = timestamp
+        if query is not None and query_time > self.sample_time:
+            self.sample = query[:SAMPLE_QUERY_LENGTH]
+            self.sample_time = query_time
+
+
+class SlowQueryTracker:
+    """Follows the slow query log and keeps the digest current."""
+
+    def __init__(self, path: str = LOG_PATHS["mysql-slow"]) -> None:
+        self.path = path
+        self._parser = SlowLogParser()
+        self._fingerprints: dict[str, tuple[str, QueryStats]] = {}
+        self._databases: dict[str, QueryStats] = {}
+        self._entries = 0
+        self._since: int | None = None
+        self._follower: LogFollower | None = None
+        self._site_map: dict[str, str] = {}
+        self._site_map_time = 0.0
+
+    async def start(self) -> None:
+        """Parse the tail of the slow log and start following it."""
+        if self._follower is not None:
+            return
+        offset = await asyncio.to_thread(self._backfill)
+        self._follower = LogFollower(self.path, self.add_lines)
+        await self._follower.start(offset=offset)
+
+    async def stop(self) -> None:
+        """Stop following the slow log."""
+        if self._follower is not None:
+            await self._follower.stop()
+            self._follower = None
+
+    def _backfill(self) -> int:
+        """
+        Parse the last BACKFILL_BYTES of the slow log.
+
+        Returns:
+            Offset just past the last complete line read
+        """
+        # Lines before the first complete entry are skipped by the parser
+        lines, offset = read_recent_lines(self.path, BACKFILL_BYTES)
+        if lines:
+            self.add_lines(lines)
+        return offset
+
+    def add_lines(self, lines: list[str]) -> None:
+        """Parse new slow log lines and update the aggregates."""
+        for entry in self._parser.feed(lines):
+            timestamp, database, query_time, lock_time, rows_sent, rows_examined, query = entry
+            fingerprint = fingerprint_query(query)
+            key = _fingerprint_id(fingerprint)
+
+            tracked = self._fingerprints.get(key)
+            if tracked is None:
+                if len(self._fingerprints) >= MAX_FINGERPRINTS:
+                    smallest = min(self._fingerprints, key=lambda k: self._fingerprints[k][1].total_time)
+                    del self._fingerprints[smallest]
+                tracked = self._fingerprints[key] = (fingerprint, QueryStats())
+            tracked[1].add(timestamp, database, query_time, lock_time, rows_sent, rows_examined, query)
+
+            if database is not None:
+                stats = self._databases.get(database)
+                if stats is None:
+                    stats = self._databases[database] = QueryStats()
+                stats.add(timestamp, None, query_time, lock_time, rows_sent, rows_examined, None)
+
+            self._entries += 1
+            if self._since is None and timestamp is not None:
+                self._since = timestamp
+
+    async def digest(self, limit: int = 50, database: str | None = None) -> SlowQueryDigest:
+        """
+        Build the slow query digest.
+
+        Args:
+            limit: Maximum fingerprints returned
+            database: Only fingerprints seen in this database
+
+        Returns:
+            SlowQueryDigest with fingerprints and databases sorted by total
+            query time, highest first
+        """
+        if time.monotonic() - self._site_map_time > SITE_MAP_TTL:
+            self._site_map = await asyncio.to_thread(read_site_databases)
+            self._site_map_time = time.monotonic()
+        sites = self._site_map
+
+        fingerprints = [
+            (key, fingerprint, stats)
+            for key, (fingerprint, stats) in self._fingerprints.items()
+            if database is None or database in stats.databases
+        ]
+        fingerprints.sort(key=lambda item: item[2].total_time, reverse=True)
+
+        return SlowQueryDigest(
+            log_path=self.path,
+            available=os.path.exists(self.path),
+            since=self._since,
+            entries=self._entries,
+            fingerprints=[
+                SlowQueryFingerprint(
+                    id=key,
+                    fingerprint=fingerprint,
+                    sample=stats.sample,
+                    count=stats.count,
+                    total_time=round(stats.total_time, 6),
+                    mean_time=round(stats.total_time / stats.count, 6),
+                    p95_time=stats.query_time.percentile(95),
+                    max_time=stats.query_time.max / 1_000_000,
+                    lock_time=round(stats.lock_time, 6),
+                    rows_sent=stats.rows_sent,
+                    rows_examined=stats.rows_examined,
+                    databases=stats.databases,
+                    sites=sorted({sites[db] for db in stats.databases if db in sites}),
+                    first_seen=stats.first_seen,
+                    last_seen=stats.last_seen,
+                )
+                for key, fingerprint, stats in fingerprints[:limit]
+            ],
+            databases=[
+                SlowQueryDatabase(
+                    name=name,
+                    site=sites.get(name),
+                    count=stats.count,
+                    total_time=round(stats.total_time, 6),
+                    p95_time=stats.query_time.percentile(95),
+                    rows_examined=stats.rows_examined,
+                )
+                for name, stats in sorted(
+                    self._databases.items(), key=lambda item: item[1].total_time, reverse=True
+                )
+            ],
+        )
+
+
+# Singleton instance for use across routes
+slow_queries = SlowQueryTracker()
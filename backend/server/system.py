@@ -304,42 +304,18 @@ async def get_wordops_version() -> str | None:
 async def get_last_backup_date() -> str | None:
     """Get the last backup date.
 
-    Checks common WordOps backup directories for the latest backup.
+    Served from the backup catalogue index, which is built on first use.
 
     Returns:
         ISO date string of the last backup, or None if no backups found
     """
-    import os
     from datetime import datetime
 
-    backup_dirs = [
-        "/var/backups/wordops",
-        os.path.expanduser("~/backups"),
-        "/opt/wordops/backups",
-    ]
+    from backend.server.backups import backup_catalogue
 
-    latest_timestamp = 0
-
-    for backup_dir in backup_dirs:
-        if not os.path.isdir(backup_dir):
-            continue
-
-        try:
-            for entry in os.listdir(backup_dir):
-                entry_path = os.path.join(backup_dir, entry)
-                if os.path.isfile(entry_path):
-                    stat = os.stat(entry_path)
-                    if stat.st_mtime > latest_timestamp:
-                        latest_timestamp = stat.st_mtime
-                elif os.path.isdir(entry_path):
-                    # Check directory modification time
-                    stat = os.stat(entry_path)
-                    if stat.st_mtime > latest_timestamp:
-                        latest_timestamp = stat.st_mtime
-        except (OSError, PermissionError):
-            continue
-
-    if latest_timestamp > 0:
+    await backup_catalogue.ensure_indexed()
+    latest_timestamp = backup_catalogue.last_backup()
+    if latest_timestamp:
         return datetime.fromtimestamp(latest_timestamp).isoformat()
 
     return None
@@ -0,0 +1,688 @@
+"""Per-site traffic analytics maintained from nginx access logs.
+
+Each site's access log is followed as it grows, and every new line is
+parsed once and folded into incremental aggregates:
+
+- counters for requests, bytes, status codes and methods,
+- Space-Saving heavy-hitter sketches for URLs, client IPs and user
+  agents, bounded in memory however many distinct values appear,
+- a log-linear (HDR-style) histogram of response times,
+- a ring of per-second request, 4xx and 5xx counts for live rates,
+- counts of ``$upstream_cache_status`` values, a per-minute ring of
+  FastCGI cache hits for the hit ratio over time, and a sketch of the
+  URLs that bypass the cache.
+
+New lines are parsed in the follower's worker thread; only folding the
+parsed records into the aggregates runs on the event loop. Reading a
+site's traffic only formats these aggregates; no log is re-read per
+request. On startup the tail of each log is parsed so the numbers
+aren't empty until new traffic arrives.
+
+Lines in the WordOps ``rt_cache`` format are parsed by one compiled
+regular expression; lines in the standard ``combined`` format, as in
+logs written before a site moved to WordOps, are parsed by a second.
+"""
+
+import asyncio
+import heapq
+import logging
+import re
+import time
+from array import array
+from datetime import datetime
+
+from backend.server.follower import LogFollower
+from backend.server.logs import SITE_LOG_PATHS, SITES_ROOT, read_recent_lines
+from backend.wordops.models import (
+    CacheRatioSample,
+    SiteCacheStats,
+    SiteTraffic,
+    TrafficCount,
+    TrafficRate,
+    TrafficRateSample,
+    TrafficTiming,
+)
+from backend.wordops.sites import list_site_directories
+
+logger = logging.getLogger(__name__)
+
+# WordOps rt_cache format:
+# $remote_addr $upstream_response_time $upstream_cache_status [$time_local]
+# $http_host "$request" $status $body_bytes_sent "$http_referer"
+# "$http_user_agent" "$server_protocol"
+# $upstream_response_time lists one time per upstream tried ("0.010, 0.502"),
+# with " : " between internal redirects
+RT_CACHE_PATTERN = re.compile(
+    r'(\S+) ([\d.,: -]+?) (\S+) \[([^\]]+)\] (\S+) "([^"]*)" (\d{3}) (\d+|-) "([^"]*)" "([^"]*)"'
+)
+
+# nginx/Apache combined format:
+# $remote_addr - $remote_user [$time_local] "$request" $status
+# $body_bytes_sent "$http_referer" "$http_user_agent"
+COMBINED_PATTERN = re.compile(
+    r'(\S+) \S+ \S+ \[([^\]]+)\] "([^"]*)" (\d{3}) (\d+|-) "([^"]*)" "([^"]*)"'
+)
+
+# Entries kept per heavy-hitter sketch; counts are exact for values
+# seen more often than 1/capacity of all requests
+TOP_CAPACITY = 200
+
+# Bytes of existing log parsed per site on startup
+BACKFILL_BYTES = 16 * 1024 * 1024
+
+# Bytes of existing logs parsed across all sites found in one refresh;
+# hosts with many sites get less history per site rather than a long
+# startup parse
+BACKFILL_TOTAL_BYTES = 256 * 1024 * 1024
+
+# Lower bound on the per-site backfill however many sites there are
+BACKFILL_MIN_BYTES = 512 * 1024
+
+# Seconds between checks for added or removed sites
+SITE_REFRESH_INTERVAL = 60
+
+# Histogram precision: 2**(HISTOGRAM_SUB_BITS - 1) buckets per power of two
+# (under 2% relative error), over microseconds up to HISTOGRAM_MAX_VALUE
+HISTOGRAM_SUB_BITS = 7
+HISTOGRAM_MAX_VALUE = 3600 * 1_000_000
+
+# Seconds of per-second counts kept per site
+RATE_WINDOW_SECONDS = 60
+
+# Complete seconds averaged for the live rates
+RATE_AVERAGE_SECONDS = 10
+
+# Minutes of per-minute cache counts kept per site
+CACHE_WINDOW_MINUTES = 60
+
+# $upstream_cache_status values for responses served from the cache
+CACHE_HIT_STATUSES = frozenset({"HIT", "STALE", "UPDATING", "REVALIDATED"})
+
+# $time_local format
+TIME_LOCAL_FORMAT = "%d/%b/%Y:%H:%M:%S %z"
+
+# Request methods counted by name; the method token is client-controlled,
+# so anything else is counted as "OTHER" to keep the counts bounded
+HTTP_METHODS = frozenset({
+    "GET", "HEAD", "POST", "PUT", "DELETE", "PATCH", "OPTIONS", "CONNECT", "TRACE",
+    "PROPFIND", "PROPPATCH", "MKCOL", "COPY", "MOVE", "LOCK", "UNLOCK",
+})
+
+# Parsed line: (client IP, response time in seconds or None, cache status
+# or None, host or None, method, path, status, bytes sent, referer,
+# user agent, $time_local)
+AccessRecord = tuple[str, float | None, str | None, str | None, str, str, int, int, str, str, str]
+
+# Parsed lines of one batch: (record, Unix second or None) per parsed line,
+# and the number of non-empty lines that matched no format
+ParsedLines = tuple[list[tuple[AccessRecord, int | None]], int]
+
+
+def _parse_request(request: str) -> tuple[str, str]:
+    """Split '"GET /path?query HTTP/1.1"' into (method, path without query)."""
+    method, _, rest = request.partition(" ")
+    target = rest.rsplit(" ", 1)[0] if " " in rest else rest
+    return method or "-", target.split("?", 1)[0] or "-"
+
+
+def _parse_upstream_time(value: str) -> float | None:
+    """
+    Parse $upstream_response_time.
+
+    "-" means no upstream was contacted (static file or cache hit); several
+    values mean nginx tried several upstreams or redirected internally, and
+    are summed.
+    """
+    if value == "-":
+        return None
+    try:
+        return sum(
+            float(part) for part in value.replace(":", ",").split(",")
+            if part.strip() not in ("", "-")
+        )
+    except ValueError:
+        return None
+
+
+def parse_access_line(line: str) -> AccessRecord | None:
+    """
+    Parse an nginx access log line in rt_cache or combined format.
+
+    Args:
+        line: Log line without the newline
+
+    Returns:
+        AccessRecord tuple, or None if the line matches neither format
+    """
+    match = RT_CACHE_PATTERN.match(line)
+    if match is not None:
+        ip, upstream, cache, time_local, host, request, status_code, size, referer, agent = match.groups()
+        method, path = _parse_request(request)
+        return (
+            ip,
+            _parse_upstream_time(upstream),
+            None if cache == "-" else cache,
+            host,
+            method,
+            path,
+            int(status_code),
+            0 if size == "-" else int(size),
+            referer,
+            agent,
+            time_local,
+        )
+
+    match = COMBINED_PATTERN.match(line)
+    if match is not None:
+        ip, time_local, request, status_code, size, referer, agent = match.groups()
+        method, path = _parse_request(request)
+        return (
+            ip, None, None, None, method, path, int(status_code),
+            0 if size == "-" else int(size), referer, agent, time_local,
+        )
+    return None
+
+
+class SpaceSaving:
+    """Space-Saving heavy-hitter sketch (Metwally et al.).
+
+    Tracks at most capacity values. A new value evicts the one with the
+    smallest count and inherits that count as its possible overcount, so
+    every value occurring more than total/capacity times is kept, with a
+    count off by at most its error.
+    """
+
+    def __init__(self, capacity: int = TOP_CAPACITY) -> None:
+        self.capacity = capacity
+        self.counts: dict[str, int] = {}
+        self.errors: dict[str, int] = {}
+        # (count, value) per tracked value; counts may be stale-low and
+        # are refreshed when they reach the top of the heap
+        self._heap: list[tuple[int, str]] = []
+
+    def add(self, value: str, weight: int = 1) -> None:
+        """Count one occurrence of a value."""
+        counts = self.counts
+        if value in counts:
+            counts[value] += weight
+            return
+
+        if len(counts) < self.capacity:
+            counts[value] = weight
+            self.errors[value] = 0
+            heapq.heappush(self._heap, (weight, value))
+            return
+
+        # Find the value with the smallest current count
+        heap = self._heap
+        while True:
+            count, victim = heap[0]
+            current = counts[victim]
+            if current == count:
+                break
+            heapq.heapreplace(heap, (current, victim))
+
+        del counts[victim]
+        del self.errors[victim]
+        counts[value] = count + weight
+        self.errors[value] = count
+        heapq.heapreplace(heap, (count + weight, value))
+
+    def top(self, n: int) -> list[TrafficCount]:
+        """Return the n most frequent values, most frequent first."""
+        ranked = heapq.nlargest(n, self.counts.items(), key=lambda item: item[1])
+        return [
+            TrafficCount(value=value, count=count, error=self.errors[value])
+            for value, count in ranked
+        ]
+
+
+class LatencyHistogram:
+    """Log-linear histogram of durations, in the style of HdrHistogram.
+
+    Values below 2**sub_bits microseconds get one bucket each; above that,
+    each power of two is split into 2**(sub_bits - 1) equal buckets, so
+    the relative error stays below 2**-(sub_bits - 1) across the range.
+    """
+
+    def __init__(self, sub_bits: int = HISTOGRAM_SUB_BITS, max_value: int = HISTOGRAM_MAX_VALUE) -> None:
+        self.sub_bits = sub_bits
+        self.max_value = max_value
+        self.counts = [0] * (self._index(max_value) + 1)
+        self.total = 0
+        self.sum = 0
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        """Bucket index of a value in microseconds."""
+        sub_bits = self.sub_bits
+        if value < (1 << sub_bits):
+            return value
+        shift = value.bit_length() - sub_bits
+        half = 1 << (sub_bits - 1)
+        return (1 << sub_bits) + (shift - 1) * half + (value >> shift) - half
+
+    def _upper_bound(self, index: int) -> int:
+        """Largest value in microseconds that falls in a bucket."""
+        sub_bits = self.sub_bits
+        if index < (1 << sub_bits):
+            return index
+        half = 1 << (sub_bits - 1)
+        offset = index - (1 << sub_bits)
+        shift = offset // half + 1
+        mantissa = offset % half + half
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        """Record one duration."""
+        value = min(max(int(seconds * 1_000_000), 0), self.max_value)
+        self.counts[self._index(value)] += 1
+        self.total += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> float | None:
+        """
+        Return the q-th percentile (0-100) in seconds, or None if empty.
+
+        The result is the upper bound of the bucket holding the percentile.
+        """
+        if self.total == 0:
+            return None
+        target = max(1, int(self.total * q / 100 + 0.5))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self._upper_bound(index), self.max) / 1_000_000
+        return self.max / 1_000_000
+
+
+class RateWindow:
+    """Per-second request, 4xx and 5xx counts over the last few seconds.
+
+    Fixed arrays form a ring indexed by second modulo the window size.
+    Each slot records which second it counts, so slots left from an
+    earlier lap are recognised as stale without any cleanup pass.
+    """
+
+    def __init__(self, size: int = RATE_WINDOW_SECONDS) -> None:
+        self.size = size
+        self.seconds = array("q", [-1]) * size
+        self.requests = array("L", [0]) * size
+        self.client_errors = array("L", [0]) * size
+        self.server_errors = array("L", [0]) * size
+
+    def add(self, second: int, status_code: int) -> None:
+        """Count one response logged in a given Unix second."""
+        slot = second % self.size
+        stamp = self.seconds[slot]
+        if stamp != second:
+            if stamp > second:
+                # Older than everything the window holds
+                return
+            self.seconds[slot] = second
+            self.requests[slot] = 0
+            self.client_errors[slot] = 0
+            self.server_errors[slot] = 0
+
+        self.requests[slot] += 1
+        if status_code >= 500:
+            self.server_errors[slot] += 1
+        elif status_code >= 400:
+            self.client_errors[slot] += 1
+
+    def rate(self, now: int, span: int = RATE_AVERAGE_SECONDS) -> tuple[float, float, float]:
+        """
+        Average the counts of the last complete seconds before now.
+
+        Returns:
+            Tuple of (requests, 4xx, 5xx) per second
+        """
+        requests = client_errors = server_errors = 0
+        for second in range(now - span, now):
+            slot = second % self.size
+            if self.seconds[slot] == second:
+                requests += self.requests[slot]
+                client_errors += self.client_errors[slot]
+                server_errors += self.server_errors[slot]
+        return (
+            round(requests / span, 2),
+            round(client_errors / span, 2),
+            round(server_errors / span, 2),
+        )
+
+    def history(self, now: int) -> list[TrafficRateSample]:
+        """Return per-second counts for the complete seconds in the window, oldest first."""
+        samples = []
+        for second in range(now - self.size + 1, now):
+            slot = second % self.size
+            if self.seconds[slot] == second:
+                samples.append(TrafficRateSample(
+                    timestamp=second,
+                    requests=self.requests[slot],
+                    client_errors=self.client_errors[slot],
+                    server_errors=self.server_errors[slot],
+                ))
+            else:
+                samples.append(TrafficRateSample(timestamp=second))
+        return samples
+
+
+class CacheWindow:
+    """Per-minute cache hits and lookups over the last hour.
+
+    Laid out like RateWindow: fixed arrays indexed by minute modulo the
+    window size, each slot recording the minute it counts.
+    """
+
+    def __init__(self, size: int = CACHE_WINDOW_MINUTES) -> None:
+        self.size = size
+        self.minutes = array("q", [-1]) * size
+        self.hits = array("L", [0]) * size
+        self.lookups = array("L", [0]) * size
+
+    def add(self, second: int, hit: bool) -> None:
+        """Count one cache lookup logged in a given Unix second."""
+        minute = second // 60
+        slot = minute % self.size
+        stamp = self.minutes[slot]
+        if stamp != minute:
+            if stamp > minute:
+                return
+            self.minutes[slot] = minute
+            self.hits[slot] = 0
+            self.lookups[slot] = 0
+
+        self.lookups[slot] += 1
+        if hit:
+            self.hits[slot] += 1
+
+    def history(self, now: int) -> list[CacheRatioSample]:
+        """Return per-minute counts for the window, oldest first, ending with the current minute."""
+        current = now // 60
+        samples = []
+        for minute in range(current - self.size + 1, current + 1):
+            slot = minute % self.size
+            if self.minutes[slot] == minute and self.lookups[slot]:
+                hits, lookups = self.hits[slot], self.lookups[slot]
+                samples.append(CacheRatioSample(
+                    timestamp=minute * 60,
+                    hits=hits,
+                    lookups=lookups,
+                    hit_ratio=round(hits / lookups, 4),
+                ))
+            else:
+                samples.append(CacheRatioSample(timestamp=minute * 60))
+        return samples
+
+    def ratio(self, now: int) -> float | None:
+        """Return the hit ratio over the window, or None without lookups."""
+        current = now // 60
+        hits = lookups = 0
+        for minute in range(current - self.size + 1, current + 1):
+            slot = minute % self.size
+            if self.minutes[slot] == minute:
+                hits += self.hits[slot]
+                lookups += self.lookups[slot]
+        return round(hits / lookups, 4) if lookups else None
+
+
+class TrafficStats:
+    """Incremental traffic aggregates for one site."""
+
+    def __init__(self) -> None:
+        self.since: int | None = None  # Time of the first line counted
+        self.updated: int | None = None
+        self.requests = 0
+        self.bytes_sent = 0
+        self.unparsed_lines = 0
+        self.status_codes: dict[int, int] = {}
+        self.methods: dict[str, int] = {}
+        self.urls = SpaceSaving()
+        self.ips = SpaceSaving()
+        self.user_agents = SpaceSaving()
+        self.response_time = LatencyHistogram()
+        self.rates = RateWindow()
+        self.cache_statuses: dict[str, int] = {}
+        self.cache = CacheWindow()
+        self.bypassed_urls = SpaceSaving()
+        self._last_time_local: str | None = None
+        self._last_second: int | None = None
+
+    def _second(self, time_local: str) -> int | None:
+        """Unix second of a $time_local value; consecutive lines mostly share one."""
+        if time_local != self._last_time_local:
+            try:
+                self._last_second = int(datetime.strptime(time_local, TIME_LOCAL_FORMAT).timestamp())
+            except ValueError:
+                self._last_second = None
+            self._last_time_local = time_local
+        return self._last_second
+
+    def parse_lines(self, lines: list[str]) -> ParsedLines:
+        """
+        Parse log lines without touching the aggregates.
+
+        Safe to run in a worker thread while the aggregates are read on
+        the event loop, as long as batches of one site are parsed one at
+        a time (the timestamp cache is shared between them).
+
+        Args:
+            lines: Log lines without newlines
+
+        Returns:
+            ParsedLines to pass to add_parsed()
+        """
+        records = []
+        unparsed = 0
+        for line in lines:
+            record = parse_access_line(line)
+            if record is None:
+                if line:
+                    unparsed += 1
+                continue
+            records.append((record, self._second(record[10])))
+        return records, unparsed
+
+    def add_lines(self, lines: list[str]) -> None:
+        """Parse log lines and fold them into the aggregates."""
+        self.add_parsed(self.parse_lines(lines))
+
+    def add_parsed(self, parsed: ParsedLines) -> None:
+        """Fold lines parsed by parse_lines() into the aggregates."""
+        records, unparsed = parsed
+        self.unparsed_lines += unparsed
+        status_codes = self.status_codes
+        methods = self.methods
+        rates = self.rates
+        cache_statuses = self.cache_statuses
+        for record, second in records:
+            ip, response_time, cache_status, _, method, path, status_code, size, _, agent, _ = record
+            if second is not None:
+                rates.add(second, status_code)
+                if self.since is None:
+                    self.since = second
+            if cache_status is not None:
+                cache_statuses[cache_status] = cache_statuses.get(cache_status, 0) + 1
+                if second is not None:
+                    self.cache.add(second, cache_status in CACHE_HIT_STATUSES)
+                if cache_status == "BYPASS":
+                    self.bypassed_urls.add(path)
+            self.requests += 1
+            self.bytes_sent += size
+            status_codes[status_code] = status_codes.get(status_code, 0) + 1
+            if method not in HTTP_METHODS:
+                method = "OTHER"
+            methods[method] = methods.get(method, 0) + 1
+            self.urls.add(path)
+            self.ips.add(ip)
+            self.user_agents.add(agent)
+            if response_time is not None:
+                self.response_time.record(response_time)
+
+        self.updated = int(time.time())
+
+    def summary(self, domain: str, top: int) -> SiteTraffic:
+        """Format the aggregates as a SiteTraffic response."""
+        status_classes: dict[str, int] = {}
+        for code, count in self.status_codes.items():
+            key = f"{code // 100}xx"
+            status_classes[key] = status_classes.get(key, 0) + count
+
+        histogram = self.response_time
+        now = int(time.time())
+        requests, client_errors, server_errors = self.rates.rate(now)
+        return SiteTraffic(
+            domain=domain,
+            since=self.since,
+            updated=self.updated,
+            requests=self.requests,
+            bytes_sent=self.bytes_sent,
+            status_codes={str(code): count for code, count in sorted(self.status_codes.items())},
+            status_classes=dict(sorted(status_classes.items())),
+            methods=dict(sorted(self.methods.items(), key=lambda item: -item[1])),
+            top_urls=self.urls.top(top),
+            top_ips=self.ips.top(top),
+            top_user_agents=self.user_agents.top(top),
+            response_time=TrafficTiming(
+                count=histogram.total,
+                mean=round(histogram.sum / histogram.total / 1_000_000, 6) if histogram.total else None,
+                p50=histogram.percentile(50),
+                p90=histogram.percentile(90),
+                p95=histogram.percentile(95),
+                p99=histogram.percentile(99),
+                max=histogram.max / 1_000_000 if histogram.total else None,
+            ),
+            rate=TrafficRate(
+                requests=requests,
+                client_errors=client_errors,
+                server_errors=server_errors,
+            ),
+            rate_history=self.rates.history(now),
+            cache=SiteCacheStats(
+                statuses=dict(sorted(self.cache_statuses.items(), key=lambda item: -item[1])),
+                hit_ratio=self.cache.ratio(now),
+                history=self.cache.history(now),
+                top_bypassed=self.bypassed_urls.top(top),
+            ),
+            unparsed_lines=self.unparsed_lines,
+        )
+
+
+def _backfill(stats: TrafficStats, path: str, max_bytes: int = BACKFILL_BYTES) -> int:
+    """
+    Parse the last max_bytes of a log into stats.
+
+    Returns:
+        Offset just past the last complete line read, where following
+        should continue (0 if the file doesn't exist)
+    """
+    lines, offset = read_recent_lines(path, max_bytes)
+    if lines:
+        stats.add_lines(lines)
+    return offset
+
+
+class SiteTrafficTracker:
+    """Follows every site's access log and keeps its TrafficStats current."""
+
+    def __init__(self) -> None:
+        self._stats: dict[str, TrafficStats] = {}
+        self._followers: dict[str, LogFollower] = {}
+        self._task: asyncio.Task | None = None
+        self._rates: dict[str, tuple[float, float, float]] = {}
+        self._rates_second: int | None = None
+
+    def start(self) -> None:
+        """Start following site logs in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the refresh loop and every follower."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        for follower in self._followers.values():
+            await follower.stop()
+        self._followers.clear()
+
+    async def _run(self) -> None:
+        """Track sites as they are added and removed."""
+        while True:
+            try:
+                await self._sync_sites()
+            except Exception as e:
+                logger.error(f"Site traffic tracking failed: {e}")
+            await asyncio.sleep(SITE_REFRESH_INTERVAL)
+
+    async def _sync_sites(self) -> None:
+        """Start followers for new sites and stop those of removed sites."""
+        domains = await asyncio.to_thread(list_site_directories, SITES_ROOT)
+
+        for domain in set(self._followers) - domains:
+            await self._followers.pop(domain).stop()
+            self._stats.pop(domain, None)
+
+        added = domains - set(self._followers)
+        backfill_bytes = max(BACKFILL_MIN_BYTES, min(BACKFILL_BYTES, BACKFILL_TOTAL_BYTES // max(1, len(added))))
+        # One site at a time, so startup parsing never holds more than one log
+        for domain in sorted(added):
+            path = SITE_LOG_PATHS["access"].format(domain=domain)
+            stats = TrafficStats()
+            offset = await asyncio.to_thread(_backfill, stats, path, backfill_bytes)
+            follower = LogFollower(path, stats.add_parsed, parse=stats.parse_lines)
+            await follower.start(offset=offset)
+            self._stats[domain] = stats
+            self._followers[domain] = follower
+
+    def get(self, domain: str, top: int = 10) -> SiteTraffic | None:
+        """
+        Return a site's traffic aggregates.
+
+        Args:
+            domain: Site domain
+            top: Entries per top list
+
+        Returns:
+            SiteTraffic, or None if the site isn't tracked (yet)
+        """
+        stats = self._stats.get(domain)
+        if stats is None:
+            return None
+        return stats.summary(domain, top)
+
+    def cache_hit_ratio(self, domain: str) -> float | None:
+        """Return a site's FastCGI cache hit ratio over the last hour."""
+        stats = self._stats.get(domain)
+        if stats is None:
+            return None
+        return stats.cache.ratio(int(time.time()))
+
+    def rates(self) -> dict[str, tuple[float, float, float]]:
+        """
+        Return the live rates of every tracked site.
+
+        Computed at most once per second and shared by all callers, so
+        any number of clients polling or subscribed cost the same.
+
+        Returns:
+            Dict of domain to (requests, 4xx, 5xx) per second, averaged
+            over the last RATE_AVERAGE_SECONDS complete seconds
+        """
+        now = int(time.time())
+        if self._rates_second != now:
+            self._rates = {domain: stats.rates.rate(now) for domain, stats in self._stats.items()}
+            self._rates_second = now
+        return self._rates
+
+
+# Singleton instance for use across routes
+site_traffic = SiteTrafficTracker()
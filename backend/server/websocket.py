@@ -1,13 +1,110 @@
 """WebSocket connection manager for log streaming."""
 
+import asyncio
+from collections import deque
+
 from fastapi import WebSocket
 
+from backend.config import settings
+from backend.server.follower import LogFollower
+from backend.server.logs import get_log_paths, tail_log
+from backend.server.models import LogStreamClientStats, LogStreamStats
+
+# Close code sent when a client falls behind under the "disconnect" policy
+CLOSE_CLIENT_TOO_SLOW = 4002
+
+
+class LogSubscriber:
+    """Bounded outbound line buffer for one WebSocket client.
+
+    The follower pushes lines without waiting; the client's own sender
+    task drains the buffer, so a slow client only ever delays itself.
+    """
+
+    def __init__(self, max_lines: int, policy: str) -> None:
+        self.max_lines = max_lines
+        self.policy = policy
+        self.lines: deque[str] = deque()
+        self._sizes: deque[int] = deque()  # UTF-8 size of each buffered line plus newline
+        self.buffered_bytes = 0  # Sum of _sizes
+        self.overflowed = False
+        self.sent_lines = 0
+        self.sent_frames = 0
+        self.dropped_lines = 0
+        self._unsent_drops = 0  # Drops not yet reported to the client
+        self.ready = asyncio.Event()
+
+    def push(self, lines: list[str]) -> int:
+        """Buffer new lines, applying the overflow policy.
+
+        Args:
+            lines: Newly appended log lines
+
+        Returns:
+            Number of lines dropped by this push
+        """
+        if self.overflowed:
+            return 0
+
+        overflow = len(self.lines) + len(lines) - self.max_lines
+        if overflow > 0 and self.policy == "disconnect":
+            self.overflowed = True
+            self.ready.set()
+            return 0
+
+        sizes = [len(line.encode("utf-8", errors="replace")) + 1 for line in lines]
+        self.lines.extend(lines)
+        self._sizes.extend(sizes)
+        self.buffered_bytes += sum(sizes)
+        dropped = 0
+        if overflow > 0:
+            dropped = min(overflow, len(self.lines))
+            for _ in range(dropped):
+                self.lines.popleft()
+                self.buffered_bytes -= self._sizes.popleft()
+            self.dropped_lines += dropped
+            self._unsent_drops += dropped
+        self.ready.set()
+        return dropped
+
+    def next_frame(self, max_bytes: int) -> dict:
+        """Take buffered lines up to max_bytes as one message.
+
+        At least one line is taken, however long. The frame reports how
+        many lines were dropped since the previous frame, if any.
+        """
+        frame_lines = []
+        size = 0
+        while self.lines and (not frame_lines or size + self._sizes[0] <= max_bytes):
+            frame_lines.append(self.lines.popleft())
+            size += self._sizes.popleft()
+        self.buffered_bytes -= size
+        if not self.lines:
+            self.ready.clear()
+
+        frame = {"lines": frame_lines}
+        if self._unsent_drops:
+            frame["dropped"] = self._unsent_drops
+            self._unsent_drops = 0
+        self.sent_lines += len(frame_lines)
+        self.sent_frames += 1
+        return frame
+
 
 class LogConnectionManager:
-    """Manages WebSocket connections for log streaming."""
+    """Manages WebSocket connections for log streaming.
+
+    Each log type with at least one viewer has a single LogFollower; new
+    lines it reads are pushed to a bounded buffer per subscriber.
+    """
 
     def __init__(self) -> None:
         self.active_connections: dict[str, list[WebSocket]] = {}
+        self._subscribers: dict[WebSocket, LogSubscriber] = {}
+        self._followers: dict[str, LogFollower] = {}
+        self._dropped_lines: dict[str, int] = {}
+        self._overflow_disconnects: dict[str, int] = {}
+        self._stopping: set[asyncio.Task] = set()  # Follower stops still running
 
     async def connect(self, websocket: WebSocket, log_type: str) -> None:
         """Accept a WebSocket connection and track it by log type.
@@ -24,6 +121,8 @@ class LogConnectionManager:
     def disconnect(self, websocket: WebSocket, log_type: str) -> None:
         """Remove a WebSocket connection from tracking.
 
+        Stops the log type's follower once its last viewer is gone.
+
         Args:
             websocket: The WebSocket connection to remove
             log_type: The type of log that was being streamed
@@ -31,6 +130,16 @@ class LogConnectionManager:
         if log_type in self.active_connections:
             if websocket in self.active_connections[log_type]:
                 self.active_connections[log_type].remove(websocket)
+            if not self.active_connections[log_type]:
+                del self.active_connections[log_type]
+        self._subscribers.pop(websocket, None)
+
+        if log_type not in self.active_connections:
+            follower = self._followers.pop(log_type, None)
+            if follower is not None:
+                task = asyncio.create_task(follower.stop())
+                self._stopping.add(task)
+                task.add_done_callback(self._stopping.discard)
 
     async def send_lines(self, websocket: WebSocket, lines: list[str]) -> None:
         """Send log lines to a WebSocket connection.
@@ -41,6 +150,123 @@ class LogConnectionManager:
         """
         await websocket.send_json({"lines": lines})
 
+    def broadcast(self, log_type: str, lines: list[str]) -> None:
+        """Buffer new lines for every subscriber of a log type.
+
+        Never waits on a client; slow clients lose their oldest lines or
+        are disconnected, depending on the overflow policy.
+
+        Args:
+            log_type: The log type the lines were read from
+            lines: Newly appended log lines
+        """
+        for websocket in self.active_connections.get(log_type, []):
+            subscriber = self._subscribers.get(websocket)
+            if subscriber is not None:
+                dropped = subscriber.push(lines)
+                if dropped:
+                    self._dropped_lines[log_type] = self._dropped_lines.get(log_type, 0) + dropped
+
+    def stats(self) -> list[LogStreamStats]:
+        """Report buffer counters per streamed log type."""
+        log_types = set(self.active_connections) | set(self._dropped_lines) | set(self._overflow_disconnects)
+        result = []
+        for log_type in sorted(log_types):
+            clients = [
+                LogStreamClientStats(
+                    queue_depth=len(subscriber.lines),
+                    sent_lines=subscriber.sent_lines,
+                    sent_frames=subscriber.sent_frames,
+                    dropped_lines=subscriber.dropped_lines,
+                )
+                for websocket in self.active_connections.get(log_type, [])
+                if (subscriber := self._subscribers.get(websocket)) is not None
+            ]
+            result.append(LogStreamStats(
+                log_type=log_type,
+                overflow_policy=settings.LOG_STREAM_OVERFLOW_POLICY,
+                queue_limit=settings.LOG_STREAM_QUEUE_LINES,
+                clients=clients,
+                dropped_lines=self._dropped_lines.get(log_type, 0),
+                overflow_disconnects=self._overflow_disconnects.get(log_type, 0),
+            ))
+        return result
+
+    async def _subscribe(self, websocket: WebSocket, log_type: str) -> tuple[LogSubscriber, int]:
+        """Register a subscriber buffer, starting the follower if needed.
+
+        Returns:
+            Tuple of (subscriber buffer, end of the last complete line the
+            follower had emitted at the moment of subscribing)
+        """
+        follower = self._followers.get(log_type)
+        if follower is None:
+            follower = LogFollower(
+                get_log_paths()[log_type],
+                lambda lines: self.broadcast(log_type, lines),
+            )
+            self._followers[log_type] = follower
+            await follower.start()
+
+        subscriber = LogSubscriber(
+            settings.LOG_STREAM_QUEUE_LINES, settings.LOG_STREAM_OVERFLOW_POLICY
+        )
+        self._subscribers[websocket] = subscriber
+        # Not follower.offset: a held-back partial line is emitted to the
+        # subscriber once complete, so the tail must stop before it
+        return subscriber, follower.line_offset
+
+    async def stream(self, websocket: WebSocket, log_type: str, initial_lines: int = 50) -> None:
+        """Send the tail of a log, then push new lines until disconnect.
+
+        The tail is read up to the last complete line the follower had
+        emitted at subscription time, so no line is sent twice or skipped
+        between the two. New lines are held for up to
+        LOG_STREAM_FRAME_INTERVAL and sent in frames of at most
+        LOG_STREAM_FRAME_BYTES.
+
+        Args:
+            websocket: A connected WebSocket
+            log_type: The log type to stream
+            initial_lines: Number of lines sent before following
+        """
+        subscriber, offset = await self._subscribe(websocket, log_type)
+        await self.send_lines(websocket, await tail_log(log_type, initial_lines, end=offset))
+
+        # Followed logs may stay quiet for long; notice client disconnects anyway
+        disconnected = asyncio.create_task(_wait_for_disconnect(websocket))
+        try:
+            while True:
+                waiter = asyncio.create_task(subscriber.ready.wait())
+                done, _ = await asyncio.wait(
+                    {waiter, disconnected}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if disconnected in done:
+                    waiter.cancel()
+                    return
+
+                # Let a burst accumulate into one frame unless it is full already
+                if subscriber.buffered_bytes < settings.LOG_STREAM_FRAME_BYTES:
+                    await asyncio.sleep(settings.LOG_STREAM_FRAME_INTERVAL)
+
+                if subscriber.overflowed:
+                    self._overflow_disconnects[log_type] = self._overflow_disconnects.get(log_type, 0) + 1
+                    await websocket.close(code=CLOSE_CLIENT_TOO_SLOW)
+                    return
+
+                while subscriber.lines:
+                    await websocket.send_json(subscriber.next_frame(settings.LOG_STREAM_FRAME_BYTES))
+        finally:
+            disconnected.cancel()
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    """Consume client messages until the client disconnects."""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
 
 # Singleton instance for use across routes
 log_manager = LogConnectionManager()
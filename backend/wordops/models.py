@@ -36,6 +36,90 @@ class DatabaseInfo(BaseModel):
     host: str = "localhost"
 
 
+class SiteRedisFootprint(BaseModel):
+    """Redis keys and memory attributed to a site by the background scan."""
+
+    keys: int = 0
+    memory_bytes: int = 0
+    scanned_at: int  # Unix timestamp of the completed scan pass
+
+
+class TrafficCount(BaseModel):
+    """A value and its request count in a top-N list."""
+
+    value: str
+    count: int
+    error: int = 0  # Maximum overcount; non-zero only for values tracked after an eviction
+
+
+class TrafficTiming(BaseModel):
+    """Distribution of upstream response times, in seconds."""
+
+    count: int = 0  # Requests that reached PHP/upstream
+    mean: float | None = None
+    p50: float | None = None
+    p90: float | None = None
+    p95: float | None = None
+    p99: float | None = None
+    max: float | None = None
+
+
+class TrafficRate(BaseModel):
+    """Responses per second, averaged over the last complete seconds."""
+
+    requests: float = 0.0
+    client_errors: float = 0.0  # 4xx responses
+    server_errors: float = 0.0  # 5xx responses
+
+
+class TrafficRateSample(BaseModel):
+    """Responses logged during one second."""
+
+    timestamp: int  # Unix second
+    requests: int = 0
+    client_errors: int = 0
+    server_errors: int = 0
+
+
+class CacheRatioSample(BaseModel):
+    """FastCGI cache lookups logged during one minute."""
+
+    timestamp: int  # Unix timestamp of the start of the minute
+    hits: int = 0  # HIT, STALE, UPDATING and REVALIDATED responses
+    lookups: int = 0  # Responses with an $upstream_cache_status
+    hit_ratio: float | None = None
+
+
+class SiteCacheStats(BaseModel):
+    """FastCGI cache effectiveness from $upstream_cache_status."""
+
+    statuses: dict[str, int] = {}  # "HIT": count, since tracking started
+    hit_ratio: float | None = None  # Over the last hour
+    history: list[CacheRatioSample] = []  # Last hour, one sample per minute
+    top_bypassed: list[TrafficCount] = []  # URLs answered with BYPASS
+
+
+class SiteTraffic(BaseModel):
+    """Traffic aggregates maintained from a site's nginx access log."""
+
+    domain: str
+    since: int | None = None  # Unix timestamp of the oldest request counted
+    updated: int | None = None  # Unix timestamp of the last update
+    requests: int = 0
+    bytes_sent: int = 0
+    status_codes: dict[str, int] = {}  # "200": count
+    status_classes: dict[str, int] = {}  # "2xx": count
+    methods: dict[str, int] = {}
+    top_urls: list[TrafficCount] = []  # Paths without query strings
+    top_ips: list[TrafficCount] = []
+    top_user_agents: list[TrafficCount] = []
+    response_time: TrafficTiming = TrafficTiming()
+    rate: TrafficRate = TrafficRate()
+    rate_history: list[TrafficRateSample] = []  # Last minute, one sample per second
+    cache: SiteCacheStats = SiteCacheStats()
+    unparsed_lines: int = 0  # Lines in neither rt_cache nor combined format
+
+
 class Site(BaseModel):
     """Represents a WordOps managed site."""
 
@@ -54,6 +138,8 @@ class Site(BaseModel):
     proxy_destination: str | None = None  # For proxy sites: the destination URL
     hsts_enabled: bool = False  # Whether HSTS is enabled
     ngxblocker_enabled: bool = False  # Whether Ultimate Nginx Bad Blocker is enabled
+    redis_footprint: SiteRedisFootprint | None = None  # Redis usage from the last keyspace scan
+    cache_hit_ratio: float | None = None  # FastCGI cache hit ratio over the last hour, from the access log
 
     class Config:
         """Pydantic model configuration."""
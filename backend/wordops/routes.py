@@ -1,11 +1,24 @@
 """Sites API routes for WordOps Dashboard."""
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import asyncio
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
 
 from backend.auth.dependencies import get_current_user
 from backend.auth.models import User
+from backend.auth.utils import decode_token
+from backend.server.redis_footprint import redis_footprint
+from backend.server.traffic import site_traffic
 from backend.wordops.exceptions import WordOpsError
-from backend.wordops.models import CreateSiteRequest, Site, SiteType, UpdateSiteRequest
+from backend.wordops.models import (
+    CreateSiteRequest,
+    Site,
+    SiteTraffic,
+    SiteType,
+    TrafficRate,
+    UpdateSiteRequest,
+)
 from backend.wordops.sites import (
     create_site,
     delete_site,
@@ -21,6 +34,9 @@ from backend.wordops.sites import (
 
 router = APIRouter(prefix="/api/v1/sites", tags=["sites"])
 
+# Seconds between live traffic frames
+TRAFFIC_PUSH_INTERVAL = 1
+
 
 @router.get("/health-check")
 async def wordops_health_check(
@@ -40,6 +56,83 @@ async def wordops_health_check(
     }
 
 
+@router.get("/traffic/live", response_model=dict[str, TrafficRate])
+async def get_live_traffic(
+    current_user: User = Depends(get_current_user),
+) -> dict[str, TrafficRate]:
+    """Get live request and error rates for every site.
+
+    Args:
+        current_user: Authenticated user (injected via dependency)
+
+    Returns:
+        Dict of domain to TrafficRate
+    """
+    return {
+        domain: TrafficRate(requests=requests, client_errors=client_errors, server_errors=server_errors)
+        for domain, (requests, client_errors, server_errors) in site_traffic.rates().items()
+    }
+
+
+@router.websocket("/traffic/ws")
+async def live_traffic_stream(
+    websocket: WebSocket,
+    token: str = Query(...),
+) -> None:
+    """WebSocket endpoint pushing live request and error rates for all sites.
+
+    Sends a snapshot of every site on connect, then once a second a
+    "change" message with only the sites whose rates changed. Rates are
+    [requests, 4xx, 5xx] per second, kept as arrays so a frame for
+    hundreds of sites stays small.
+
+    Args:
+        websocket: The WebSocket connection
+        token: JWT authentication token (query parameter)
+
+    Closes with:
+        4001: Invalid or expired token
+    """
+    try:
+        token_data = decode_token(token)
+        if token_data is None:
+            await websocket.close(code=4001)
+            return
+    except Exception:
+        await websocket.close(code=4001)
+        return
+
+    await websocket.accept()
+    try:
+        known = site_traffic.rates()
+        await websocket.send_json({
+            "type": "snapshot",
+            "timestamp": int(time.time()),
+            "sites": known,
+        })
+
+        while True:
+            await asyncio.sleep(TRAFFIC_PUSH_INTERVAL)
+            current = site_traffic.rates()
+            changes = {
+                domain: rates for domain, rates in current.items()
+                if known.get(domain) != rates
+            }
+            removed = [domain for domain in known if domain not in current]
+            known = current
+            if changes or removed:
+                await websocket.send_json({
+                    "type": "change",
+                    "timestamp": int(time.time()),
+                    "sites": changes,
+                    "removed": removed,
+                })
+    except WebSocketDisconnect:
+        pass
+    except Exception:
+        pass
+
+
 @router.get("/", response_model=list[Site])
 async def get_sites(
     current_user: User = Depends(get_current_user),
@@ -127,6 +220,8 @@ async def get_site(
             detail=f"Site not found: {domain}",
         )
 
+    site.redis_footprint = redis_footprint.get(domain)
+    site.cache_hit_ratio = site_traffic.cache_hit_ratio(domain)
     return site
 
 
@@ -323,6 +418,44 @@ async def get_site_monitoring(
         )
 
 
+@router.get("/{domain}/traffic", response_model=SiteTraffic)
+async def get_site_traffic(
+    domain: str,
+    current_user: User = Depends(get_current_user),
+    top: int = Query(10, ge=1, le=100),
+) -> SiteTraffic:
+    """Get traffic analytics for a site from its nginx access log.
+
+    Aggregates are kept up to date as log lines arrive, starting from the
+    tail of the log when the dashboard started.
+
+    Args:
+        domain: The domain name of the site
+        current_user: Authenticated user (injected via dependency)
+        top: Entries per top list (1-100, default 10)
+
+    Returns:
+        SiteTraffic with counters, top lists and response times
+
+    Raises:
+        400: Invalid domain format
+        404: Site access log not tracked
+    """
+    if not validate_domain(domain):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid domain format: {domain}",
+        )
+
+    traffic = site_traffic.get(domain, top)
+    if traffic is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No traffic data for site: {domain}",
+        )
+    return traffic
+
+
 @router.get("/{domain}/nginx-config")
 async def get_nginx_configuration(
     domain: str,
@@ -47,6 +47,32 @@ def validate_domain(domain: str) -> bool:
     return True
 
 
+def list_site_directories(root: str = "/var/www") -> set[str]:
+    """
+    List site domains from the WordOps web root without calling `wo`.
+
+    Only directory names that pass validate_domain() are returned, so the
+    result is safe to use when building per-site paths.
+
+    Args:
+        root: WordOps web root containing one directory per site
+
+    Returns:
+        Set of site domains
+    """
+    import os
+
+    try:
+        with os.scandir(root) as it:
+            return {
+                entry.name for entry in it
+                if entry.is_dir(follow_symlinks=False) and "." in entry.name
+                and validate_domain(entry.name)
+            }
+    except OSError:
+        return set()
+
+
 def _parse_site_type(type_str: str) -> SiteType:
     """
     Parse site type string from WordOps output to SiteType enum.
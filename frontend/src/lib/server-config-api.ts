@@ -2,6 +2,7 @@ import { useQuery } from '@tanstack/react-query'
 import { apiClient } from './api-client'
 import type {
   ServerOverviewInfo,
+  PackageUpdateJob,
   PackageUpdateRequest,
   PackageUpdateResponse,
   StackServiceInfo,
@@ -25,7 +26,16 @@ export function useServerOverview() {
 }
 
 /**
- * Trigger system package updates
+ * Get the state of a package upgrade job
+ * @param jobId - ID returned when the upgrade was started
+ * @returns Promise with the job state
+ */
+export async function getPackageUpdateJob(jobId: string): Promise<PackageUpdateJob> {
+  return apiClient.get<PackageUpdateJob>(`/api/v1/server/packages/update/${jobId}`)
+}
+
+/**
+ * Trigger system package updates and wait for the background job to finish
  * @param updateType - Type of update: 'all' for all packages, 'security' for security updates only
  * @returns Promise with update response
  */
@@ -33,7 +43,27 @@ export async function updatePackages(
   updateType: 'all' | 'security'
 ): Promise<PackageUpdateResponse> {
   const request: PackageUpdateRequest = { update_type: updateType }
-  return apiClient.post<PackageUpdateResponse>('/api/v1/server/packages/update', request)
+  const started = await apiClient.post<PackageUpdateResponse>('/api/v1/server/packages/update', request)
+  if (!started.job_id) {
+    return started
+  }
+
+  // Poll the job until apt has finished
+  for (;;) {
+    await new Promise((resolve) => setTimeout(resolve, 2000))
+    const job = await getPackageUpdateJob(started.job_id)
+    if (job.status === 'failed') {
+      throw new Error(job.message || 'Package update failed')
+    }
+    if (job.status === 'completed') {
+      return {
+        status: job.status,
+        message: job.message,
+        updated_count: job.updated_count,
+        job_id: job.job_id,
+      }
+    }
+  }
 }
 
 // =============================================================================
@@ -122,4 +152,4 @@ export async function updateServiceConfig(
 // Type Exports
 // =============================================================================
 
-export type { ServerOverviewInfo, PackageUpdateRequest, PackageUpdateResponse, StackServiceInfo }
+export type { ServerOverviewInfo, PackageUpdateJob, PackageUpdateRequest, PackageUpdateResponse, StackServiceInfo }
@@ -1,5 +1,5 @@
 import { apiClient } from './api-client'
-import type { Site, SiteType } from '../types'
+import type { Site, SiteRedisFootprint, SiteTraffic, SiteType, TrafficRate } from '../types'
 
 // Backend site types (may differ from frontend types)
 type BackendSiteType = 'wordpress' | 'php' | 'phpmysql' | 'html' | 'proxy' | 'mysql' | 'alias'
@@ -25,6 +25,8 @@ interface BackendSite {
   proxy_destination?: string | null
   hsts_enabled?: boolean
   ngxblocker_enabled?: boolean
+  redis_footprint?: SiteRedisFootprint | null
+  cache_hit_ratio?: number | null
 }
 
 // Site creation input
@@ -162,6 +164,8 @@ function transformSite(backendSite: BackendSite): Site {
     // HSTS and ngxblocker
     hstsEnabled: backendSite.hsts_enabled || false,
     ngxblockerEnabled: backendSite.ngxblocker_enabled || false,
+    redisFootprint: backendSite.redis_footprint || undefined,
+    cacheHitRatio: backendSite.cache_hit_ratio ?? undefined,
   }
 }
 
@@ -317,6 +321,20 @@ export async function fetchSiteMonitoring(domain: string): Promise<{
   }
 }
 
+/**
+ * Fetch traffic analytics for a site from its nginx access log
+ */
+export async function fetchSiteTraffic(domain: string, top = 10): Promise<SiteTraffic> {
+  return apiClient.get<SiteTraffic>(`/api/v1/sites/${domain}/traffic?top=${top}`)
+}
+
+/**
+ * Fetch live request and error rates for every site, keyed by domain
+ */
+export async function fetchLiveTraffic(): Promise<Record<string, TrafficRate>> {
+  return apiClient.get<Record<string, TrafficRate>>('/api/v1/sites/traffic/live')
+}
+
 /**
  * Delete a site
  */
@@ -64,6 +64,74 @@ export interface DatabaseInfo {
   host: string
 }
 
+export interface SiteRedisFootprint {
+  keys: number
+  memory_bytes: number
+  scanned_at: number  // Unix timestamp of the completed scan pass
+}
+
+export interface TrafficCount {
+  value: string
+  count: number
+  error: number  // Maximum overcount from the heavy-hitter sketch
+}
+
+export interface TrafficTiming {
+  count: number  // Requests that reached PHP/upstream
+  mean: number | null  // Seconds
+  p50: number | null
+  p90: number | null
+  p95: number | null
+  p99: number | null
+  max: number | null
+}
+
+export interface TrafficRate {
+  requests: number  // Per second, averaged over the last 10 complete seconds
+  client_errors: number  // 4xx per second
+  server_errors: number  // 5xx per second
+}
+
+export interface TrafficRateSample {
+  timestamp: number
+  requests: number
+  client_errors: number
+  server_errors: number
+}
+
+export interface CacheRatioSample {
+  timestamp: number  // Start of the minute
+  hits: number
+  lookups: number
+  hit_ratio: number | null
+}
+
+export interface SiteCacheStats {
+  statuses: Record<string, number>  // $upstream_cache_status counts
+  hit_ratio: number | null  // Over the last hour
+  history: CacheRatioSample[]  // Last hour, one sample per minute
+  top_bypassed: TrafficCount[]
+}
+
+export interface SiteTraffic {
+  domain: string
+  since: number | null  // Unix timestamp of the oldest request counted
+  updated: number | null
+  requests: number
+  bytes_sent: number
+  status_codes: Record<string, number>
+  status_classes: Record<string, number>
+  methods: Record<string, number>
+  top_urls: TrafficCount[]
+  top_ips: TrafficCount[]
+  top_user_agents: TrafficCount[]
+  response_time: TrafficTiming
+  rate: TrafficRate
+  rate_history: TrafficRateSample[]  // Last minute, one sample per second
+  cache: SiteCacheStats
+  unparsed_lines: number
+}
+
 export interface Site {
   id: string
   domain: string
@@ -91,6 +159,8 @@ export interface Site {
   nginxConfig?: string | null  // Nginx configuration content
   hstsEnabled?: boolean  // Whether HSTS is enabled
   ngxblockerEnabled?: boolean  // Whether Ultimate Nginx Bad Blocker is enabled
+  redisFootprint?: SiteRedisFootprint  // Redis usage from the last keyspace scan
+  cacheHitRatio?: number  // FastCGI cache hit ratio over the last hour (0-1)
 }
 
 // Sites component props
@@ -269,12 +339,86 @@ export interface PackageUpdateResponse {
   status: 'running' | 'completed' | 'failed'
   message: string
   updated_count: number
+  job_id?: string | null
+}
+
+export interface PackageUpdateJob {
+  job_id: string
+  update_type: 'all' | 'security'
+  status: 'running' | 'completed' | 'failed'
+  phase: 'update' | 'upgrade' | 'done'
+  progress: number
+  message: string
+  started_at: number
+  finished_at: number | null
+  updated_count: number
+  upgraded_packages: string[]
 }
 
 // -----------------------------------------------------------------------------
 // Server Config - Stack Services
 // -----------------------------------------------------------------------------
 
+export interface PhpFpmPoolStatus {
+  pool: string
+  php_version: string
+  config_file: string
+  listen: string | null
+  status_path: string | null
+  max_children: number | null
+  active_processes: number | null
+  idle_processes: number | null
+  total_processes: number | null
+  listen_queue: number | null
+  max_listen_queue: number | null
+  max_children_reached: number | null
+  slow_requests: number | null
+  accepted_conn: number | null
+  error: string | null
+}
+
+export interface MySQLStats {
+  threads_connected: number | null
+  threads_running: number | null
+  questions: number | null
+  queries_per_second: number | null
+  slow_queries: number | null
+  slow_queries_per_second: number | null
+  aborted_connects: number | null
+  aborted_connects_per_second: number | null
+  aborted_clients: number | null
+  aborted_clients_per_second: number | null
+  buffer_pool_hit_rate: number | null
+  uptime_seconds: number | null
+}
+
+export interface RedisStats {
+  version: string | null
+  connected_clients: number | null
+  used_memory: number | null
+  used_memory_peak: number | null
+  maxmemory: number | null
+  mem_fragmentation_ratio: number | null
+  keyspace_hits: number | null
+  keyspace_misses: number | null
+  hit_ratio: number | null
+  evicted_keys: number | null
+  evicted_keys_per_second: number | null
+  ops_per_second: number | null
+  instantaneous_ops_per_sec: number | null
+  keyspace: Record<string, number>
+  uptime_seconds: number | null
+}
+
+export interface ServiceResourceSample {
+  timestamp: number
+  cpu_percent: number | null  // Percent of one CPU; exceeds 100 on multiple cores
+  memory_bytes: number | null
+  io_read_bytes_per_second: number | null
+  io_write_bytes_per_second: number | null
+  pids: number | null
+}
+
 export interface StackServiceInfo {
   name: string
   display_name: string
@@ -287,5 +431,12 @@ export interface StackServiceInfo {
   php_fpm_connections: number | null
   php_fpm_max_children: number | null
   mysql_connections: number | null
+  mysql_stats: MySQLStats | null
   redis_connected_clients: number | null
+  redis_stats: RedisStats | null
+  php_fpm_pools: PhpFpmPoolStatus[]
+  resources: ServiceResourceSample | null
+  resource_history: ServiceResourceSample[]
+  stale: boolean
+  stale_fields: string[]
 }
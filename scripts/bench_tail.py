@@ -0,0 +1,80 @@
+"""Benchmark reading the last lines of a large log.
+
+Compares reading the whole file and splitting every line (how tail_log
+worked before) with read_last_lines(), which seeks backwards in
+fixed-size blocks. Synthetic nginx access logs of each size are written
+to a temporary directory and removed afterwards.
+
+Usage (from the repository root):
+
+    python scripts/bench_tail.py
+    python scripts/bench_tail.py --sizes 1 10 100 --lines 500 --repeat 3
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.server.logs import read_last_lines  # noqa: E402
+
+SAMPLE_LINE = (
+    '203.0.113.{n} 0.012 - [19/Jan/2026:10:15:30 +0000] example.com '
+    '"GET /wp-content/themes/twentytwentyfour/style.css?ver={n} HTTP/2.0" 200 5120 '
+    '"https://example.com/" "Mozilla/5.0 (X11; Linux x86_64) Gecko/20100101 Firefox/121.0"\n'
+)
+
+
+def write_log(path: str, size_mb: int) -> None:
+    """Write a synthetic access log of about size_mb megabytes."""
+    target = size_mb * 1024 * 1024
+    chunk = "".join(SAMPLE_LINE.format(n=n % 250) for n in range(1000)).encode()
+    with open(path, "wb") as f:
+        written = 0
+        while written < target:
+            f.write(chunk)
+            written += len(chunk)
+
+
+def full_read_tail(path: str, count: int) -> list[str]:
+    """Previous implementation: read everything, keep the last lines."""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        all_lines = f.read().splitlines()
+    return all_lines[-count:] if all_lines else []
+
+
+def best_of(repeat: int, func, *args) -> float:
+    """Best wall time of repeat runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 500], help="Log sizes in MB")
+    parser.add_argument("--lines", type=int, default=500, help="Lines to tail")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    args = parser.parse_args()
+
+    print(f"Last {args.lines} lines of a synthetic nginx access log, best of {args.repeat}:\n")
+    with tempfile.TemporaryDirectory() as directory:
+        for size_mb in args.sizes:
+            path = os.path.join(directory, f"access-{size_mb}.log")
+            write_log(path, size_mb)
+            assert full_read_tail(path, args.lines) == read_last_lines(path, args.lines)
+
+            full = best_of(args.repeat, full_read_tail, path, args.lines)
+            reverse = best_of(args.repeat, read_last_lines, path, args.lines)
+            print(f"{size_mb:>6} MB  full read {full:>9.1f} ms   reverse tail {reverse:>6.2f} ms")
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
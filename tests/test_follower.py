@@ -0,0 +1,173 @@
+"""Tests for LogFollower across log rotation and truncation.
+
+A writer thread appends numbered lines while the log is rotated; every
+line must reach the callback exactly once.
+"""
+
+import asyncio
+import os
+import shutil
+import time
+from collections import Counter
+
+from backend.server.follower import LogFollower
+
+# Seconds allowed for the follower to catch up with the writer
+CATCH_UP_TIMEOUT = 10
+
+
+def numbered(start: int, stop: int) -> list[str]:
+    return [f"line {n:05d} " + "x" * (n % 40) for n in range(start, stop)]
+
+
+def append(path: str, lines: list[str], delay: float = 0.0005) -> None:
+    """Append lines one write at a time, like a logging process."""
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        write_lines(fd, lines, delay)
+    finally:
+        os.close(fd)
+
+
+def write_lines(fd: int, lines: list[str], delay: float = 0.0005) -> None:
+    for line in lines:
+        os.write(fd, (line + "\n").encode())
+        time.sleep(delay)
+
+
+async def wait_until(condition, follower: LogFollower) -> None:
+    """Wait for a condition, waking the follower so tests don't rely on timing."""
+    deadline = time.monotonic() + CATCH_UP_TIMEOUT
+    while not condition():
+        assert time.monotonic() < deadline, "follower did not catch up"
+        follower.wake()
+        await asyncio.sleep(0.02)
+
+
+async def settle(follower: LogFollower) -> None:
+    """Give the follower a few more reads, in which duplicates would show up."""
+    for _ in range(5):
+        follower.wake()
+        await asyncio.sleep(0.02)
+
+
+def assert_each_once(received: list[str], expected: list[str]) -> None:
+    counts = Counter(received)
+    assert sorted(set(expected) - set(counts)) == [], "lines lost"
+    assert [line for line, count in counts.items() if count > 1] == [], "lines duplicated"
+    assert len(received) == len(expected)
+
+
+async def test_create_rotation(tmp_path):
+    path = str(tmp_path / "access.log")
+    open(path, "w").close()
+    received: list[str] = []
+    follower = LogFollower(path, received.extend)
+    await follower.start()
+    expected = numbered(0, 900)
+
+    def writer() -> None:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND)
+        write_lines(fd, expected[:300])
+        # logrotate renames the log and creates an empty one; the writer
+        # keeps appending to the old file until it is told to reopen
+        os.rename(path, path + ".1")
+        open(path, "w").close()
+        write_lines(fd, expected[300:450])
+        # A quiet moment before the reopen signal arrives
+        time.sleep(0.2)
+        write_lines(fd, expected[450:600])
+        os.close(fd)
+        append(path, expected[600:])
+
+    try:
+        # Keep waking the follower while the writer runs, as the polling
+        # fallback and the watchdog would
+        writing = asyncio.ensure_future(asyncio.to_thread(writer))
+        await wait_until(lambda: writing.done() and len(received) >= len(expected), follower)
+        await writing
+        await settle(follower)
+    finally:
+        await follower.stop()
+
+    assert_each_once(received, expected)
+
+
+async def test_copytruncate_rotation(tmp_path):
+    path = str(tmp_path / "access.log")
+    open(path, "w").close()
+    received: list[str] = []
+    follower = LogFollower(path, received.extend)
+    await follower.start()
+    expected = numbered(0, 900)
+
+    def writer() -> None:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND)
+        write_lines(fd, expected[:450])
+        # Copy and truncate between two writes; lines written in between
+        # would be lost by logrotate itself, not by the follower
+        shutil.copyfile(path, path + ".1")
+        os.truncate(path, 0)
+        write_lines(fd, expected[450:])
+        os.close(fd)
+
+    try:
+        # Keep waking the follower while the writer runs, as the polling
+        # fallback and the watchdog would
+        writing = asyncio.ensure_future(asyncio.to_thread(writer))
+        await wait_until(lambda: writing.done() and len(received) >= len(expected), follower)
+        await writing
+        await settle(follower)
+    finally:
+        await follower.stop()
+
+    assert_each_once(received, expected)
+
+
+async def test_truncate_to_shorter_length(tmp_path):
+    path = str(tmp_path / "access.log")
+    open(path, "w").close()
+    received: list[str] = []
+    follower = LogFollower(path, received.extend)
+    await follower.start()
+    kept = numbered(0, 200)
+    removed = numbered(200, 400)
+    appended = numbered(400, 500)
+
+    try:
+        await asyncio.to_thread(append, path, kept + removed)
+        await wait_until(lambda: len(received) >= len(kept) + len(removed), follower)
+
+        # Cut the file back to the end of a line; what is left was read already
+        length = sum(len(line) + 1 for line in kept)
+        os.truncate(path, length)
+        await wait_until(lambda: follower.offset == length, follower)
+
+        await asyncio.to_thread(append, path, appended)
+        await wait_until(lambda: len(received) >= len(kept) + len(removed) + len(appended), follower)
+        await settle(follower)
+    finally:
+        await follower.stop()
+
+    assert_each_once(received, kept + removed + appended)
+
+
+async def test_partial_line_emitted_once_complete(tmp_path):
+    path = str(tmp_path / "access.log")
+    with open(path, "w") as f:
+        f.write("first\nsec")
+    received: list[str] = []
+    follower = LogFollower(path, received.extend)
+    await follower.start()
+
+    try:
+        assert follower.line_offset == len("first\n")
+        with open(path, "a") as f:
+            f.write("ond\nthi")
+        await wait_until(lambda: received, follower)
+        await settle(follower)
+    finally:
+        await follower.stop()
+
+    assert received == ["second"]
+    assert follower.line_offset == len("first\nsecond\n")
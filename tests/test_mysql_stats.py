@@ -0,0 +1,189 @@
+"""Tests for pooled MySQL status sampling and the mysql client fallback."""
+
+import asyncio
+import types
+
+import pytest
+
+from backend.server import mysql, services
+from backend.server.mysql import MySQLStatsSampler, _build_stats
+
+
+class FakeCursor:
+    """Cursor returning the next queued SHOW GLOBAL STATUS result."""
+
+    def __init__(self, pool: "FakePool") -> None:
+        self.pool = pool
+        self.rows: list[tuple[str, str]] = []
+
+    async def __aenter__(self) -> "FakeCursor":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+    async def execute(self, query: str) -> None:
+        assert query == mysql.STATUS_QUERY
+        self.rows = self.pool.results.pop(0)
+
+    async def fetchall(self) -> list[tuple[str, str]]:
+        return self.rows
+
+
+class FakeConnection:
+    def __init__(self, pool: "FakePool") -> None:
+        self.pool = pool
+
+    async def __aenter__(self) -> "FakeConnection":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+    def cursor(self) -> FakeCursor:
+        return FakeCursor(self.pool)
+
+
+class FakePool:
+    """Just enough of an aiomysql pool for MySQLStatsSampler.sample()."""
+
+    def __init__(self, results: list[list[tuple[str, str]]]) -> None:
+        self.results = results
+
+    def acquire(self) -> FakeConnection:
+        return FakeConnection(self)
+
+
+class FakeProcess:
+    def __init__(self, stdout: bytes, returncode: int = 0) -> None:
+        self.stdout = stdout
+        self.returncode = returncode
+
+    async def communicate(self) -> tuple[bytes, bytes]:
+        return self.stdout, b""
+
+
+def status_rows(questions: int, slow: int, threads: int = 4) -> list[tuple[str, str]]:
+    return [
+        ("Threads_connected", str(threads)),
+        ("Questions", str(questions)),
+        ("Slow_queries", str(slow)),
+        ("Innodb_buffer_pool_read_requests", "1000"),
+        ("Innodb_buffer_pool_reads", "10"),
+    ]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic() for the mysql module."""
+    now = [1000.0]
+    monkeypatch.setattr(mysql.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_first_sample_has_no_rates():
+    stats = _build_stats({"Questions": 100, "Threads_connected": 3}, None, 10.0)
+
+    assert stats.questions == 100
+    assert stats.threads_connected == 3
+    assert stats.queries_per_second is None
+
+
+def test_rates_derived_between_samples():
+    previous = (10.0, {"Questions": 100, "Slow_queries": 2})
+    stats = _build_stats({"Questions": 400, "Slow_queries": 5}, previous, 20.0)
+
+    assert stats.queries_per_second == 30.0
+    assert stats.slow_queries_per_second == 0.3
+
+
+def test_counter_reset_gives_no_rate():
+    previous = (10.0, {"Questions": 500})
+    stats = _build_stats({"Questions": 20}, previous, 20.0)
+
+    assert stats.queries_per_second is None
+
+
+async def test_sample_keeps_baseline_for_close_samples(clock):
+    sampler = MySQLStatsSampler()
+    sampler._pool = FakePool([
+        status_rows(questions=100, slow=1),
+        status_rows(questions=150, slow=1),
+        status_rows(questions=300, slow=3),
+    ])
+
+    first = await sampler.sample()
+    assert first.queries_per_second is None
+
+    # Too soon to replace the baseline, but a rate is still reported
+    clock[0] += 0.5
+    second = await sampler.sample()
+    assert second.queries_per_second == 100.0
+
+    clock[0] += 1.5
+    third = await sampler.sample()
+    assert third.queries_per_second == 100.0
+    assert third.slow_queries_per_second == 1.0
+
+
+async def test_pool_creation_backs_off(monkeypatch, clock):
+    attempts = []
+
+    async def create_pool(**kwargs):
+        attempts.append(kwargs)
+        raise OSError("Can't connect to local MySQL server")
+
+    monkeypatch.setattr(mysql, "aiomysql", types.SimpleNamespace(create_pool=create_pool))
+    monkeypatch.setattr(mysql, "read_client_options", lambda: {"user": "root", "password": "secret"})
+    sampler = MySQLStatsSampler()
+
+    assert await sampler.sample() is None
+    assert await sampler.sample() is None
+    assert len(attempts) == 1
+    assert not sampler.connected
+
+    clock[0] += mysql.POOL_RETRY_SECONDS
+    await sampler.sample()
+    assert len(attempts) == 2
+
+    # The delay doubles after each consecutive failure
+    clock[0] += mysql.POOL_RETRY_SECONDS
+    await sampler.sample()
+    assert len(attempts) == 2
+
+
+async def test_status_falls_back_to_client_without_pool(monkeypatch):
+    async def create_pool(**kwargs):
+        raise OSError("Access denied for user 'root'@'localhost'")
+
+    commands = []
+
+    async def create_subprocess_exec(*args, **kwargs):
+        commands.append(args)
+        return FakeProcess(b"Variable_name\tValue\nThreads_connected\t15\n")
+
+    sampler = MySQLStatsSampler()
+    monkeypatch.setattr(mysql, "aiomysql", types.SimpleNamespace(create_pool=create_pool))
+    monkeypatch.setattr(mysql, "read_client_options", lambda: {"user": "root"})
+    monkeypatch.setattr(services, "mysql_stats", sampler)
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", create_subprocess_exec)
+
+    assert await services.get_mysql_status() == {"connections": 15}
+    assert len(commands) == 1
+    assert "SHOW STATUS LIKE 'Threads_connected';" in commands[0]
+
+
+async def test_status_uses_pool_when_connected(monkeypatch):
+    async def create_subprocess_exec(*args, **kwargs):
+        raise AssertionError("mysql client should not run")
+
+    sampler = MySQLStatsSampler()
+    sampler._pool = FakePool([status_rows(questions=10, slow=0, threads=7)])
+    monkeypatch.setattr(mysql, "aiomysql", types.SimpleNamespace())
+    monkeypatch.setattr(services, "mysql_stats", sampler)
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", create_subprocess_exec)
+
+    status = await services.get_mysql_status()
+
+    assert status["connections"] == 7
+    assert status["stats"].questions == 10